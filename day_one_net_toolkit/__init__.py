@@ -0,0 +1,6 @@
+"""
+Shared helpers for the Day One Network Discovery Toolkit.
+
+The day-one-toolkit.py and collection-toolkit.py scripts import these modules so
+that behaviour such as host selection is consistent between both toolkits.
+"""
@@ -0,0 +1,363 @@
+"""
+A compressed archive of the configs collected by each run.
+
+Configs of the same platform are mostly the same template, so each config is compressed
+with a zstd dictionary trained on the fleet's configs. The dictionary holds the common
+template text once, rather than once per config.
+
+Each run is stored in the archive directory as:
+
+RUN-<time>.zst - The compressed configs, one independent zstd frame each.
+RUN-<time>.json - The index of {hostname: {config type: [offset, length, size]}}.
+dictionaries/<id>.zdict - The dictionary the run was compressed with.
+
+The index allows any (run, host, config type) to be read with a single seek, and runs
+are extracted one config at a time, so a run is never held in memory.
+
+python -m day_one_net_toolkit.archive --add configs --benchmark configs
+"""
+
+# Import Modules
+import argparse
+import datetime as dt
+import glob
+import gzip
+import json
+import os
+import pathlib
+import time
+
+# Default location of the archive
+ARCHIVE_DIR = "archive"
+# Default configs directory
+CONFIG_DIR = "configs"
+# Default size of the trained dictionary in bytes, the same as the zstd command line
+DICTIONARY_SIZE = 112640
+# zstd compression level. Higher levels compress the configs a little further, but much slower
+COMPRESSION_LEVEL = 9
+
+
+def read_configs(config_dir=CONFIG_DIR, configs=None):
+    """
+    This function yields the configs in a configs directory.
+    :param config_dir: The directory where the configs are stored.
+    :param configs: A set of (hostname, config type) tuples to read. Defaults to every
+    config in the directory.
+    :return: A generator of (hostname, config type, content as bytes) tuples.
+    """
+    if configs is None:
+        paths = sorted(glob.glob(os.path.join(config_dir, "*", "*.txt")))
+    else:
+        paths = [
+            os.path.join(config_dir, hostname, config_type + ".txt")
+            for hostname, config_type in sorted(configs)
+        ]
+    for path in paths:
+        hostname = os.path.basename(os.path.dirname(path))
+        with open(path, "rb") as f:
+            yield hostname, os.path.basename(path)[: -len(".txt")], f.read()
+
+
+def dictionary_files(archive_dir=ARCHIVE_DIR):
+    """
+    This function lists the trained dictionaries, oldest first.
+    :param archive_dir: The directory where the archive is stored.
+    :return: A list of dictionary paths.
+    """
+    return sorted(
+        glob.glob(os.path.join(archive_dir, "dictionaries", "*.zdict")),
+        key=os.path.getmtime,
+    )
+
+
+def load_dictionary(archive_dir, dict_id):
+    """
+    This function loads a trained dictionary.
+    :param archive_dir: The directory where the archive is stored.
+    :param dict_id: The id of the dictionary, or 0 for no dictionary.
+    :return: A ZstdCompressionDict object, or None for no dictionary.
+    """
+    import zstandard
+
+    if not dict_id:
+        return None
+    with open(
+        os.path.join(archive_dir, "dictionaries", str(dict_id) + ".zdict"), "rb"
+    ) as f:
+        return zstandard.ZstdCompressionDict(f.read())
+
+
+def train_dictionary(
+    archive_dir=ARCHIVE_DIR, config_dir=CONFIG_DIR, size=DICTIONARY_SIZE, configs=None
+):
+    """
+    This function trains a dictionary on the configs in a configs directory and saves it
+    to the archive, where it is used for the following runs.
+    :param archive_dir: The directory where the archive is stored.
+    :param config_dir: The directory where the configs are stored.
+    :param size: The maximum size of the dictionary in bytes.
+    :param configs: A set of (hostname, config type) tuples to train on. Defaults to
+    every config in the directory.
+    :return: The id of the dictionary, or 0 if there are too few configs to train on.
+    """
+    import zstandard
+
+    samples = [
+        content for _, _, content in read_configs(config_dir, configs) if content
+    ]
+    try:
+        dictionary = zstandard.train_dictionary(size, samples)
+    except zstandard.ZstdError:
+        return 0
+    path = pathlib.Path(
+        archive_dir, "dictionaries", str(dictionary.dict_id()) + ".zdict"
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(dictionary.as_bytes())
+    return dictionary.dict_id()
+
+
+def run_files(archive_dir=ARCHIVE_DIR):
+    """
+    This function lists the archived runs, oldest first.
+    :param archive_dir: The directory where the archive is stored.
+    :return: A list of run names, i.e. RUN-2019-07-01-13-04-59
+    """
+    return sorted(
+        os.path.basename(path)[: -len(".json")]
+        for path in glob.glob(os.path.join(archive_dir, "RUN-*.json"))
+    )
+
+
+def add_run(archive_dir=ARCHIVE_DIR, config_dir=CONFIG_DIR, run=None, configs=None):
+    """
+    This function adds the configs in a configs directory to the archive as a run. The
+    newest dictionary is used, and one is trained first if the archive doesn't have one.
+    :param archive_dir: The directory where the archive is stored.
+    :param config_dir: The directory where the configs are stored.
+    :param run: The name of the run. Defaults to RUN-<current time>.
+    :param configs: A set of (hostname, config type) tuples to archive, i.e. the configs
+    collected by the run. Defaults to every config in the directory.
+    :return: The name of the run.
+    """
+    import zstandard
+
+    run = run or "RUN-" + dt.datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+    pathlib.Path(archive_dir).mkdir(parents=True, exist_ok=True)
+    dictionaries = dictionary_files(archive_dir)
+    if dictionaries:
+        dict_id = int(os.path.basename(dictionaries[-1])[: -len(".zdict")])
+    else:
+        dict_id = train_dictionary(archive_dir, config_dir, configs=configs)
+    compressor = zstandard.ZstdCompressor(
+        level=COMPRESSION_LEVEL, dict_data=load_dictionary(archive_dir, dict_id)
+    )
+    index = {"dictionary": dict_id, "configs": {}}
+    offset = 0
+    with open(os.path.join(archive_dir, run + ".zst"), "wb") as f:
+        for hostname, config_type, content in read_configs(config_dir, configs):
+            frame = compressor.compress(content)
+            f.write(frame)
+            index["configs"].setdefault(hostname, {})[config_type] = [
+                offset,
+                len(frame),
+                len(content),
+            ]
+            offset += len(frame)
+    # The index is written last, so a run without one is incomplete and ignored
+    with open(os.path.join(archive_dir, run + ".json"), "w") as f:
+        json.dump(index, f)
+    return run
+
+
+class ArchivedRun:
+    """
+    A run in the archive, giving random access to its configs.
+    """
+
+    def __init__(self, archive_dir, run):
+        import zstandard
+
+        self.path = os.path.join(archive_dir, run + ".zst")
+        with open(os.path.join(archive_dir, run + ".json")) as f:
+            self.index = json.load(f)
+        dictionary = load_dictionary(archive_dir, self.index["dictionary"])
+        self.decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+
+    def entries(self):
+        """
+        This function lists the configs in the run.
+        :return: A sorted list of (hostname, config type) tuples.
+        """
+        return sorted(
+            (hostname, config_type)
+            for hostname, configs in self.index["configs"].items()
+            for config_type in configs
+        )
+
+    def read(self, hostname, config_type, f=None):
+        """
+        This function reads a single config from the run.
+        :param hostname: The name of the host in the inventory.
+        :param config_type: The config type, i.e. running
+        :param f: An open file of the run, to avoid re-opening it for each config.
+        :return: The config as bytes.
+        """
+        offset, length, size = self.index["configs"][hostname][config_type]
+        if f is None:
+            with open(self.path, "rb") as f:
+                return self.read(hostname, config_type, f)
+        f.seek(offset)
+        return self.decompressor.decompress(f.read(length), max_output_size=size)
+
+    def extract(self, output_dir, hostnames=None):
+        """
+        This function extracts the configs of the run into the configs directory layout,
+        i.e. <output_dir>/<hostname>/<type>.txt, one config at a time.
+        :param output_dir: The directory to extract to.
+        :param hostnames: A list of host names to extract. Defaults to every host.
+        :return: The number of configs extracted.
+        """
+        count = 0
+        with open(self.path, "rb") as f:
+            for hostname, config_type in self.entries():
+                if hostnames and hostname not in hostnames:
+                    continue
+                host_dir = pathlib.Path(output_dir, hostname)
+                host_dir.mkdir(parents=True, exist_ok=True)
+                (host_dir / (config_type + ".txt")).write_bytes(
+                    self.read(hostname, config_type, f)
+                )
+                count += 1
+        return count
+
+
+def benchmark(config_dir=CONFIG_DIR, archive_dir=ARCHIVE_DIR):
+    """
+    This function compares the compression ratio and throughput of gzip, zstd and zstd
+    with a trained dictionary on a configs directory. Each config is compressed on its
+    own, as it is in the archive.
+    :param config_dir: The directory where the configs are stored.
+    :param archive_dir: The directory where the archive is stored.
+    :return: A list of (method, ratio, compress MB/s, decompress MB/s) tuples.
+    """
+    import zstandard
+
+    configs = [content for _, _, content in read_configs(config_dir)]
+    size = sum(len(content) for content in configs) or 1
+    dictionaries = dictionary_files(archive_dir)
+    if dictionaries:
+        dict_id = int(os.path.basename(dictionaries[-1])[: -len(".zdict")])
+        dictionary = load_dictionary(archive_dir, dict_id)
+    else:
+        samples = [content for content in configs if content]
+        dictionary = zstandard.train_dictionary(DICTIONARY_SIZE, samples)
+    methods = [
+        ("gzip", gzip.compress, gzip.decompress),
+        (
+            "zstd",
+            zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress,
+            zstandard.ZstdDecompressor().decompress,
+        ),
+        (
+            "zstd+dictionary",
+            zstandard.ZstdCompressor(
+                level=COMPRESSION_LEVEL, dict_data=dictionary
+            ).compress,
+            zstandard.ZstdDecompressor(dict_data=dictionary).decompress,
+        ),
+    ]
+    results = []
+    for method, compress, decompress in methods:
+        start = time.perf_counter()
+        compressed = [compress(content) for content in configs]
+        compress_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for frame in compressed:
+            decompress(frame)
+        decompress_time = time.perf_counter() - start
+        results.append(
+            (
+                method,
+                size / max(sum(len(frame) for frame in compressed), 1),
+                size / 1e6 / max(compress_time, 1e-9),
+                size / 1e6 / max(decompress_time, 1e-9),
+            )
+        )
+    return results
+
+
+def main():
+    """
+    This function is the command line interface to the config archive.
+    :return:
+    """
+    parser = argparse.ArgumentParser(
+        description="Archive configs with a zstd dictionary trained on the fleet."
+    )
+    parser.add_argument(
+        "--archive-dir",
+        default=ARCHIVE_DIR,
+        help="The directory where the archive is stored (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--train",
+        metavar="CONFIG_DIR",
+        help="Train a new dictionary on a configs directory",
+    )
+    parser.add_argument(
+        "--add",
+        metavar="CONFIG_DIR",
+        help="Add a configs directory to the archive as a run",
+    )
+    parser.add_argument("--list", action="store_true", help="List the archived runs")
+    parser.add_argument(
+        "--show",
+        nargs=3,
+        metavar=("RUN", "HOST", "TYPE"),
+        help="Print a config from an archived run",
+    )
+    parser.add_argument(
+        "--extract",
+        nargs=2,
+        metavar=("RUN", "OUTPUT_DIR"),
+        help="Extract an archived run into a configs directory layout",
+    )
+    parser.add_argument(
+        "--benchmark",
+        metavar="CONFIG_DIR",
+        help="Compare gzip, zstd and zstd with a dictionary on a configs directory",
+    )
+    args = parser.parse_args()
+    if args.train:
+        dict_id = train_dictionary(args.archive_dir, args.train)
+        print(
+            "Dictionary trained: " + str(dict_id)
+            if dict_id
+            else "Too few configs to train"
+        )
+    if args.add:
+        print("Run archived: " + add_run(args.archive_dir, args.add))
+    if args.list:
+        for run in run_files(args.archive_dir):
+            archived_run = ArchivedRun(args.archive_dir, run)
+            print(f"{run} - {len(archived_run.entries())} configs")
+    if args.show:
+        run, hostname, config_type = args.show
+        print(ArchivedRun(args.archive_dir, run).read(hostname, config_type).decode())
+    if args.extract:
+        run, output_dir = args.extract
+        count = ArchivedRun(args.archive_dir, run).extract(output_dir)
+        print("Configs extracted: " + str(count))
+    if args.benchmark:
+        for method, ratio, compress_rate, decompress_rate in benchmark(
+            args.benchmark, args.archive_dir
+        ):
+            print(
+                f"{method} : ratio {ratio:.1f}x - compress {compress_rate:.1f} MB/s - "
+                f"decompress {decompress_rate:.1f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
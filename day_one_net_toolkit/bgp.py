@@ -0,0 +1,554 @@
+"""
+A fleet-wide map of the BGP sessions collected with the bgp_neighbors,
+bgp_neighbors_detail and bgp_config getters.
+
+Each host only reports its own end of a session, so both ends are paired up with hash
+joins on the local and remote addresses and AS numbers. Sessions which are down, only
+configured on one side, or whose AS numbers don't agree are flagged, and the prefix
+counts are added up per peering. Every step is a dictionary lookup per session, so the
+map stays linear with tens of thousands of sessions.
+
+It can also be run from the command line against a facts directory:
+
+python -m day_one_net_toolkit.bgp --problems --export bgp-sessions.csv
+"""
+
+# Import Modules
+import argparse
+import csv
+import ipaddress
+import json
+import os
+from day_one_net_toolkit.factstore import FACT_DIR, READ_WORKERS, load_fact_store
+
+# The getters the session map is built from, interfaces_ip is used to find peer hosts
+BGP_GETTERS = ["bgp_neighbors", "bgp_neighbors_detail", "bgp_config", "interfaces_ip"]
+# Session states reported by the map
+ESTABLISHED = "established"
+EXTERNAL = "external"
+DOWN = "down"
+ONE_SIDED = "one-sided"
+AS_MISMATCH = "as-mismatch"
+# The states which are reported as problems
+PROBLEM_STATES = {DOWN, ONE_SIDED, AS_MISMATCH}
+# The BGP datasets and their headers
+BGP_DATASETS = {
+    "BGP_Sessions": [
+        "Hostname",
+        "VRF",
+        "Local Address",
+        "Local AS",
+        "Remote Hostname",
+        "Remote Address",
+        "Remote AS",
+        "State",
+        "Up",
+        "Remote Up",
+        "Received Prefixes",
+        "Accepted Prefixes",
+        "Sent Prefixes",
+        "Remote Received Prefixes",
+        "Remote Accepted Prefixes",
+        "Remote Sent Prefixes",
+        "Description",
+    ],
+    "BGP_Peerings": [
+        "Hostname",
+        "Peer",
+        "Sessions",
+        "Established",
+        "Problems",
+        "Received Prefixes",
+        "Accepted Prefixes",
+        "Sent Prefixes",
+    ],
+}
+
+
+def normalise_address(address):
+    """
+    This function normalises an IP address, so both ends of a session use the same
+    form. i.e. "2001:DB8::0001" becomes "2001:db8::1". Anything else is left as it is.
+    :param address: The address to normalise.
+    :return: The normalised address, or "" when there is none.
+    """
+    address = str(address or "").strip().split("/")[0]
+    try:
+        return ipaddress.ip_address(address).compressed
+    except ValueError:
+        return address.lower()
+
+
+def as_number(value):
+    """
+    This function converts an AS number to an integer, 0 when it is unknown.
+    :param value: The AS number, as an integer or string i.e. "65001" or "1.10"
+    :return: The AS number as an integer.
+    """
+    value = str(value or "").strip()
+    # AS numbers in asdot notation, i.e. 1.10 is 65546
+    if "." in value:
+        high, _, low = value.partition(".")
+        value = str(int(high) * 65536 + int(low)) if high.isdigit() else value
+    return int(value) if value.isdigit() else 0
+
+
+def prefix_count(value):
+    """
+    This function returns a prefix count, 0 when it is unknown. NAPALM reports
+    counts it can't read as -1.
+    :param value: The prefix count.
+    :return: The prefix count as an integer.
+    """
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class Session:
+    """
+    One end of a BGP session, as reported by one host.
+    """
+
+    __slots__ = (
+        "hostname",
+        "vrf",
+        "local_address",
+        "local_as",
+        "remote_address",
+        "remote_as",
+        "up",
+        "received",
+        "accepted",
+        "sent",
+        "description",
+        "peer",
+        "state",
+    )
+
+    def __init__(self, hostname, vrf, remote_address):
+        self.hostname = hostname
+        self.vrf = vrf
+        self.local_address = ""
+        self.local_as = 0
+        self.remote_address = remote_address
+        self.remote_as = 0
+        self.up = False
+        self.received = 0
+        self.accepted = 0
+        self.sent = 0
+        self.description = ""
+        # The other end of the session, once it has been paired
+        self.peer = None
+        self.state = None
+
+    def key(self):
+        """
+        This function returns the key of the session as seen from this end.
+        """
+        return self.local_address, self.local_as, self.remote_address, self.remote_as
+
+    def reverse_key(self):
+        """
+        This function returns the key the other end of the session reports.
+        """
+        return self.remote_address, self.remote_as, self.local_address, self.local_as
+
+
+def host_sessions(  # noqa
+    hostname, bgp_neighbors, bgp_neighbors_detail=None, bgp_config=None
+):
+    """
+    This function merges the BGP getters of a host into one Session per neighbor.
+    Neighbors which are configured but not running are reported as down.
+    :param hostname: The name of the host in the inventory.
+    :param bgp_neighbors: The result of the bgp_neighbors getter for the host.
+    :param bgp_neighbors_detail: The result of the bgp_neighbors_detail getter, if any.
+    :param bgp_config: The result of the bgp_config getter, if any.
+    :return: A list of Session objects.
+    """
+    # Sessions of the host keyed by (VRF, remote address)
+    sessions = {}
+
+    def session(vrf, remote_address):
+        address = normalise_address(remote_address)
+        key = (vrf, address)
+        if key not in sessions:
+            sessions[key] = Session(hostname, vrf, address)
+        return sessions[key]
+
+    for vrf, vrf_neighbors in (bgp_neighbors or {}).items():
+        for remote_address, neighbor in (vrf_neighbors.get("peers") or {}).items():
+            entry = session(vrf, remote_address)
+            entry.local_as = as_number(neighbor.get("local_as"))
+            entry.remote_as = as_number(neighbor.get("remote_as"))
+            entry.up = neighbor.get("is_up") is True
+            entry.description = str(neighbor.get("description") or "")
+            # Add up the prefix counts of every address family
+            for family in (neighbor.get("address_family") or {}).values():
+                entry.received += prefix_count(family.get("received_prefixes"))
+                entry.accepted += prefix_count(family.get("accepted_prefixes"))
+                entry.sent += prefix_count(family.get("sent_prefixes"))
+    # The detail getter adds the local address of each session
+    for vrf, by_remote_as in (bgp_neighbors_detail or {}).items():
+        for details in by_remote_as.values():
+            for detail in details:
+                entry = session(vrf, detail.get("remote_address"))
+                entry.local_address = normalise_address(detail.get("local_address"))
+                entry.local_as = entry.local_as or as_number(detail.get("local_as"))
+                entry.remote_as = entry.remote_as or as_number(detail.get("remote_as"))
+                entry.up = entry.up or detail.get("up") is True
+                if not (entry.received or entry.accepted or entry.sent):
+                    entry.received = prefix_count(detail.get("received_prefix_count"))
+                    entry.accepted = prefix_count(detail.get("accepted_prefix_count"))
+                    entry.sent = prefix_count(detail.get("advertised_prefix_count"))
+    # The configuration adds the neighbors which aren't running, and fills in the gaps
+    by_address = {}
+    for (vrf, address), entry in sessions.items():
+        by_address.setdefault(address, entry)
+    for group in (bgp_config or {}).values():
+        for remote_address, neighbor in (group.get("neighbors") or {}).items():
+            address = normalise_address(remote_address)
+            entry = by_address.get(address) or session("global", address)
+            by_address[address] = entry
+            entry.local_address = entry.local_address or normalise_address(
+                neighbor.get("local_address") or group.get("local_address")
+            )
+            entry.local_as = entry.local_as or as_number(
+                neighbor.get("local_as") or group.get("local_as")
+            )
+            entry.remote_as = entry.remote_as or as_number(
+                neighbor.get("remote_as") or group.get("remote_as")
+            )
+            entry.description = entry.description or str(
+                neighbor.get("description") or group.get("description") or ""
+            )
+    return list(sessions.values())
+
+
+class SessionMap:
+    """
+    The BGP sessions of the fleet, with both ends of each session paired up.
+
+    Call add_host() for each host, then build() before querying the map.
+    """
+
+    def __init__(self):
+        # Every session end in the order they were added
+        self.sessions = []
+        # Address to the name of the host which owns it
+        self.owners = {}
+
+    def add_host(
+        self,
+        hostname,
+        bgp_neighbors,
+        bgp_neighbors_detail=None,
+        bgp_config=None,
+        interfaces_ip=None,
+    ):
+        """
+        This function adds the BGP sessions of a host to the map.
+        :param hostname: The name of the host in the inventory.
+        :param bgp_neighbors: The result of the bgp_neighbors getter for the host.
+        :param bgp_neighbors_detail: The result of the bgp_neighbors_detail getter, if any.
+        :param bgp_config: The result of the bgp_config getter, if any.
+        :param interfaces_ip: The result of the interfaces_ip getter, if any. It is used
+        to recognise sessions to hosts which haven't reported their end.
+        :return:
+        """
+        sessions = host_sessions(
+            hostname, bgp_neighbors, bgp_neighbors_detail, bgp_config
+        )
+        self.sessions.extend(sessions)
+        for entry in sessions:
+            if entry.local_address:
+                self.owners.setdefault(entry.local_address, hostname)
+        for interface in (interfaces_ip or {}).values():
+            for family in ("ipv4", "ipv6"):
+                for address in interface.get(family) or {}:
+                    self.owners.setdefault(normalise_address(address), hostname)
+
+    def build(self):  # noqa
+        """
+        This function pairs up both ends of each session and works out their state.
+
+        Sessions are joined on (local address, local AS, remote address, remote AS)
+        first. Sessions left over are joined on their addresses alone, which finds
+        the AS numbers which don't agree, and then ends without a local address are
+        joined on the remote end's address and AS numbers.
+        :return:
+        """
+        for entry in self.sessions:
+            entry.peer = None
+        by_key = {}
+        by_addresses = {}
+        by_remote_end = {}
+        for entry in self.sessions:
+            if entry.local_address:
+                by_key.setdefault(entry.key(), entry)
+                by_addresses.setdefault(
+                    (entry.local_address, entry.remote_address), entry
+                )
+                by_remote_end.setdefault(
+                    (entry.local_address, entry.local_as, entry.remote_as), []
+                ).append(entry)
+        for entry in self.sessions:
+            if entry.peer is None and entry.local_address:
+                self._pair(entry, by_key.get(entry.reverse_key()))
+        for entry in self.sessions:
+            if entry.peer is None and entry.local_address:
+                self._pair(
+                    entry,
+                    by_addresses.get((entry.remote_address, entry.local_address)),
+                )
+        for entry in self.sessions:
+            if entry.peer is None and not entry.local_address:
+                key = (entry.remote_address, entry.remote_as, entry.local_as)
+                candidates = [
+                    candidate
+                    for candidate in by_remote_end.get(key, [])
+                    if candidate.peer is None
+                ]
+                # The other end must be talking to an address of this host, or be the
+                # only candidate when the owner of its remote address isn't known
+                owned = [
+                    candidate
+                    for candidate in candidates
+                    if self.owners.get(candidate.remote_address) == entry.hostname
+                ]
+                if not owned and len(candidates) == 1:
+                    owned = [
+                        candidate
+                        for candidate in candidates
+                        if candidate.remote_address not in self.owners
+                    ]
+                if owned:
+                    self._pair(entry, owned[0])
+        for entry in self.sessions:
+            entry.state = self._state(entry)
+
+    def _pair(self, entry, peer):
+        """
+        This function pairs two ends of a session, when neither end is paired yet.
+        :return: True if they were paired, otherwise False.
+        """
+        if peer is None or peer is entry or peer.peer is not None:
+            return False
+        if peer.hostname == entry.hostname and peer.vrf == entry.vrf:
+            return False
+        entry.peer = peer
+        peer.peer = entry
+        # Learn the local address from the other end, when this end didn't report it
+        entry.local_address = entry.local_address or peer.remote_address
+        return True
+
+    def _state(self, entry):
+        """
+        This function works out the state of one end of a session.
+        """
+        peer = entry.peer
+        if peer is not None:
+            if (entry.local_as, entry.remote_as) != (peer.remote_as, peer.local_as):
+                return AS_MISMATCH
+            return ESTABLISHED if entry.up and peer.up else DOWN
+        # A collected host owns the remote address, but hasn't reported the session
+        owner = self.owners.get(entry.remote_address)
+        if owner is not None and owner != entry.hostname:
+            return ONE_SIDED
+        return EXTERNAL if entry.up else DOWN
+
+    def remote_hostname(self, entry):
+        """
+        This function returns the host at the other end of a session.
+        :return: The name of the host, or "" when it is outside of the fleet.
+        """
+        if entry.peer is not None:
+            return entry.peer.hostname
+        return self.owners.get(entry.remote_address, "")
+
+    def pairs(self):
+        """
+        This function yields each session once, with both ends paired up.
+        :return: A generator of (session, peer session or None) tuples.
+        """
+        for entry in self.sessions:
+            peer = entry.peer
+            # Only yield paired sessions from the end which sorts first
+            if peer is not None and (peer.hostname, peer.vrf, peer.remote_address) < (
+                entry.hostname,
+                entry.vrf,
+                entry.remote_address,
+            ):
+                continue
+            yield entry, peer
+
+    def problems(self):
+        """
+        This function returns the sessions which are down, one-sided or whose AS
+        numbers don't agree.
+        :return: A sorted list of (session, peer session or None) tuples.
+        """
+        return sorted(
+            (pair for pair in self.pairs() if pair[0].state in PROBLEM_STATES),
+            key=lambda pair: (pair[0].hostname, pair[0].vrf, pair[0].remote_address),
+        )
+
+    def session_rows(self):
+        """
+        This function returns the rows of the BGP_Sessions dataset.
+        :return: A list of rows, each a list of values in header order.
+        """
+        rows = []
+        for entry, peer in self.pairs():
+            remote = peer or Session("", "", "")
+            rows.append(
+                [
+                    entry.hostname,
+                    entry.vrf,
+                    entry.local_address,
+                    entry.local_as,
+                    self.remote_hostname(entry),
+                    entry.remote_address,
+                    entry.remote_as,
+                    entry.state,
+                    entry.up,
+                    peer.up if peer is not None else "",
+                    entry.received,
+                    entry.accepted,
+                    entry.sent,
+                    remote.received if peer is not None else "",
+                    remote.accepted if peer is not None else "",
+                    remote.sent if peer is not None else "",
+                    entry.description,
+                ]
+            )
+        rows.sort(key=lambda row: (row[0], row[1], row[5]))
+        return rows
+
+    def peering_rows(self):
+        """
+        This function adds up the sessions and prefix counts of each host per peer,
+        where the peer is the remote host, or its AS for peers outside of the fleet.
+        :return: A list of rows of the BGP_Peerings dataset.
+        """
+        peerings = {}
+        for entry in self.sessions:
+            peer = self.remote_hostname(entry) or "AS" + str(entry.remote_as)
+            totals = peerings.setdefault((entry.hostname, peer), [0, 0, 0, 0, 0, 0])
+            totals[0] += 1
+            totals[1] += entry.state in (ESTABLISHED, EXTERNAL)
+            totals[2] += entry.state in PROBLEM_STATES
+            totals[3] += entry.received
+            totals[4] += entry.accepted
+            totals[5] += entry.sent
+        return [list(key) + totals for key, totals in sorted(peerings.items())]
+
+    def export(self, path):
+        """
+        This function exports the session table, using CSV for .csv files
+        and JSON for anything else.
+        :param path: The file to write to.
+        :return:
+        """
+        headers = BGP_DATASETS["BGP_Sessions"]
+        rows = self.session_rows()
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                writer.writerows(rows)
+        else:
+            with open(path, "w") as f:
+                json.dump([dict(zip(headers, row)) for row in rows], f, indent=2)
+
+
+def build_session_map(store):
+    """
+    This function builds a session map from the BGP getters of the fleet.
+    :param store: The results as {getter: {hostname: result}}, i.e. from load_fact_store.
+    :return: A SessionMap object.
+    """
+    session_map = SessionMap()
+    hostnames = set()
+    for getter in BGP_GETTERS:
+        hostnames.update(store.get(getter, {}))
+    for hostname in sorted(hostnames):
+        session_map.add_host(
+            hostname,
+            *(store.get(getter, {}).get(hostname) for getter in BGP_GETTERS),
+        )
+    session_map.build()
+    return session_map
+
+
+def load_session_map(fact_dir=FACT_DIR, hostnames=None, workers=READ_WORKERS):
+    """
+    This function builds a session map from the BGP getters in a facts directory.
+    :param fact_dir: The directory where the getters are stored.
+    :param hostnames: A list of host names to load. Defaults to every host directory.
+    :param workers: The number of threads used to read the files.
+    :return: A SessionMap object.
+    """
+    if hostnames is None:
+        hostnames = sorted(
+            entry.name for entry in os.scandir(fact_dir) if entry.is_dir()
+        )
+    store, _ = load_fact_store(fact_dir, hostnames, BGP_GETTERS, workers=workers)
+    return build_session_map(store)
+
+
+def main():
+    """
+    This function is the command line interface to the BGP session map.
+    :return:
+    """
+    parser = argparse.ArgumentParser(
+        description="Build a map of the BGP sessions of the fleet from a facts directory."
+    )
+    parser.add_argument(
+        "--facts-dir",
+        default=FACT_DIR,
+        help="The facts directory saved by day-one-toolkit.py (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--problems",
+        action="store_true",
+        help="Show the sessions which are down, one-sided or whose AS numbers don't agree",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="FILE",
+        help="Export the session table to a .csv or .json file",
+    )
+    args = parser.parse_args()
+    session_map = load_session_map(args.facts_dir)
+    states = {}
+    for entry, _ in session_map.pairs():
+        states[entry.state] = states.get(entry.state, 0) + 1
+    print(
+        "Session ends: "
+        + str(len(session_map.sessions))
+        + " - Sessions: "
+        + str(sum(states.values()))
+        + " - "
+        + " - ".join(
+            state + ": " + str(count) for state, count in sorted(states.items())
+        )
+    )
+    if args.problems:
+        for entry, _ in session_map.problems():
+            print(
+                f"{entry.state.upper()} : {entry.hostname} {entry.vrf} "
+                f"{entry.local_address or '-'} AS{entry.local_as} -> "
+                f"{session_map.remote_hostname(entry) or '-'} "
+                f"{entry.remote_address} AS{entry.remote_as}"
+            )
+    if args.export:
+        session_map.export(args.export)
+        print("Sessions exported to: " + str(args.export))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Functions used to maintain a persisted cache of the NAPALM getters which are not
+supported, so they are not requested from every host on every run.
+
+The cache is keyed by platform, NAPALM driver version and OS version, so a driver
+or OS upgrade automatically re-tests the getters which were unsupported before.
+"""
+
+# Import Modules
+import functools
+import importlib
+import json
+import pathlib
+from day_one_net_toolkit.factstore import FACT_DIR, load_getter
+
+# Default location of the capability cache
+CAPABILITY_CACHE_FILE = "cache/capabilities.json"
+# The results collect_getters returns when a getter is not supported by the driver
+UNSUPPORTED_RESULTS = (
+    "Getter Not Implemented",
+    "AttributeError: Driver has no attribute",
+)
+# Version used when the driver or OS version cannot be determined
+UNKNOWN_VERSION = "unknown"
+
+
+@functools.lru_cache(maxsize=None)
+def driver_version(platform):
+    """
+    This function returns the version of the package providing the NAPALM driver
+    for a platform, i.e. the napalm package for ios or napalm-<platform> for
+    community drivers.
+    :param platform: The NAPALM platform name.
+    :return: The driver package version as a string.
+    """
+    try:
+        # Import the driver and then the top level package it belongs to
+        from napalm import get_network_driver
+
+        driver = get_network_driver(platform)
+        package = importlib.import_module(driver.__module__.split(".")[0])
+    except Exception:  # nosec - any import failure just means the version is unknown
+        return UNKNOWN_VERSION
+    return str(getattr(package, "__version__", UNKNOWN_VERSION))
+
+
+def read_os_version(hostname, fact_dir=FACT_DIR):
+    """
+    This function reads the OS version of a host from the facts.json file saved
+    by a previous collection of the facts getter.
+    :param hostname: The name of the host in the inventory.
+    :param fact_dir: The directory where the getters are stored.
+    :return: The OS version as a string.
+    """
+    facts = load_getter(fact_dir, hostname, "facts")
+    if not isinstance(facts, dict):
+        return UNKNOWN_VERSION
+    return str(facts.get("os_version") or UNKNOWN_VERSION)
+
+
+def load_capability_cache(cache_file=CAPABILITY_CACHE_FILE):
+    """
+    This function loads the capability cache from disk.
+
+    The cache is stored as {platform: {driver_version: {os_version: [getters]}}}
+    :param cache_file: The path to the capability cache file.
+    :return: The capability cache dictionary, which is empty if there is no cache.
+    """
+    try:
+        with open(cache_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_capability_cache(cache, cache_file=CAPABILITY_CACHE_FILE):
+    """
+    This function saves the capability cache to disk.
+    :param cache: The capability cache dictionary.
+    :param cache_file: The path to the capability cache file.
+    :return:
+    """
+    # Create the cache directory and/or check that it exists
+    pathlib.Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first, so an interrupted run can't corrupt the cache
+    tmp_file = cache_file + ".tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    pathlib.Path(tmp_file).replace(cache_file)
+
+
+def clear_capability_cache(cache_file=CAPABILITY_CACHE_FILE):
+    """
+    This function removes the capability cache, i.e. after the NAPALM drivers
+    have been upgraded.
+    :param cache_file: The path to the capability cache file.
+    :return: True if a cache file was removed, otherwise False.
+    """
+    try:
+        pathlib.Path(cache_file).unlink()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def unsupported_getters(cache, platform, os_version):
+    """
+    This function returns the getters known to be unsupported for a platform,
+    using the installed driver version and the OS version.
+    :param cache: The capability cache dictionary.
+    :param platform: The NAPALM platform name.
+    :param os_version: The OS version of the host.
+    :return: A set of getter names.
+    """
+    versions = cache.get(platform, {}).get(driver_version(platform), {})
+    return set(versions.get(os_version, []))
+
+
+def record_unsupported(cache, platform, os_version, getter):
+    """
+    This function records a getter as unsupported in the capability cache.
+    :param cache: The capability cache dictionary.
+    :param platform: The NAPALM platform name.
+    :param os_version: The OS version of the host.
+    :param getter: The name of the NAPALM getter.
+    :return:
+    """
+    platform_cache = cache.setdefault(platform, {})
+    getters = platform_cache.setdefault(driver_version(platform), {}).setdefault(
+        os_version, []
+    )
+    if getter not in getters:
+        getters.append(getter)
+        getters.sort()
+
+
+def getter_unsupported(multi_result):
+    """
+    This function determines whether a host's collect_getters result failed because
+    the getter is not supported by the driver. napalm_get raises NotImplementedError
+    or AttributeError in that case.
+    :param multi_result: The MultiResult of the collect_getters task for a host.
+    :return: True if the getter is unsupported, otherwise False.
+    """
+    for result in multi_result:
+        if isinstance(result.exception, (NotImplementedError, AttributeError)):
+            return True
+        if result.result in UNSUPPORTED_RESULTS:
+            return True
+    return False
+
+
+def prune_plan(plan, cache, fact_dir=FACT_DIR):
+    """
+    This function removes getters known to be unsupported from the collection plan.
+    The OS version of each host is read from the facts saved by the last run.
+
+    The removed getters are saved against each plan entry under "skipped", so they
+    can be reported.
+    :param plan: The collection plan, as returned by build_plan.
+    :param cache: The capability cache dictionary.
+    :param fact_dir: The directory where the getters are stored.
+    :return: The number of getters removed from the plan.
+    """
+    # Skip counter
+    skip_count = 0
+    for host_plan in plan:
+        unsupported = unsupported_getters(
+            cache, host_plan["platform"], read_os_version(host_plan["host"], fact_dir)
+        )
+        host_plan["skipped"] = [g for g in host_plan["getters"] if g in unsupported]
+        host_plan["getters"] = [g for g in host_plan["getters"] if g not in unsupported]
+        skip_count += len(host_plan["skipped"])
+    return skip_count
@@ -0,0 +1,519 @@
+"""
+Command line options shared by the day-one-toolkit.py and collection-toolkit.py scripts.
+"""
+
+# Import Modules
+import argparse
+import importlib.util
+import os
+from day_one_net_toolkit.archive import ARCHIVE_DIR
+from day_one_net_toolkit.capabilities import CAPABILITY_CACHE_FILE
+from day_one_net_toolkit.commands import COMMAND_DIR, COMMANDS_FILE
+from day_one_net_toolkit.concurrency import (
+    CONCURRENCY,
+    CONCURRENCY_FILE,
+    MAX_CONCURRENCY,
+)
+from day_one_net_toolkit.configindex import CONFIG_INDEX_FILE
+from day_one_net_toolkit.counters import HISTORY_DIR
+from day_one_net_toolkit.customers import CONNECTION_BUDGET, CUSTOMER_DIR
+from day_one_net_toolkit.endpoints import ENDPOINT_INDEX_FILE
+from day_one_net_toolkit.exporters import EXPORT_DIR, EXPORT_FORMATS
+from day_one_net_toolkit.factstore import FACT_DIR, READ_WORKERS
+from day_one_net_toolkit.health import HEALTH_FILE
+from day_one_net_toolkit.inventory import INVENTORY_CACHE_FILE, INVENTORY_FILES
+from day_one_net_toolkit.manifest import CONFIG_DIR, MANIFEST_DIR
+from day_one_net_toolkit.memory import SPILL_THRESHOLD
+from day_one_net_toolkit.plan import GETTERS_FILE
+from day_one_net_toolkit.profiling import PROFILE_DIR
+from day_one_net_toolkit.progress import PROGRESS_INTERVAL
+from day_one_net_toolkit.summary import STANDARD_USERS
+from day_one_net_toolkit.timeouts import BACKOFF_BASE, LATENCY_FILE, RETRIES
+
+# Default directory of the log files
+LOG_DIR = "logs"
+
+
+def comma_list(value):
+    """
+    This function converts a comma separated command line value into a list.
+    i.e. "facts,users" becomes ["facts", "users"]
+    :param value: The command line value.
+    :return: A list of the non-empty entries.
+    """
+    return [entry.strip() for entry in value.split(",") if entry.strip()]
+
+
+def export_formats(value):
+    """
+    This function converts a comma separated list of export formats into a list,
+    rejecting any unknown format, and parquet when pyarrow isn't installed.
+    :param value: The command line value.
+    :return: A list of the export formats.
+    """
+    formats = comma_list(value)
+    unknown = [entry for entry in formats if entry not in EXPORT_FORMATS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            "unknown export format "
+            + ", ".join(unknown)
+            + " (choose from "
+            + ", ".join(EXPORT_FORMATS)
+            + ")"
+        )
+    # Check for pyarrow now, rather than once the devices have been polled
+    if "parquet" in formats and importlib.util.find_spec("pyarrow") is None:
+        raise argparse.ArgumentTypeError(
+            "parquet export requires 'pip install day-one-net-toolkit[parquet]'"
+        )
+    return formats
+
+
+def customer_profile(value):
+    """
+    This function converts a customer profile into a (name, directory) tuple,
+    i.e. "acme" becomes ("acme", "customers/acme")
+    :param value: The command line value, as NAME or NAME=DIR.
+    :return: A tuple of the customer name and the directory of the profile.
+    """
+    name, _, directory = value.partition("=")
+    directory = directory or os.path.join(CUSTOMER_DIR, name)
+    if not name:
+        raise argparse.ArgumentTypeError("missing customer name in " + repr(value))
+    if not os.path.isdir(directory):
+        raise argparse.ArgumentTypeError("no customer directory " + directory)
+    return name, os.path.abspath(directory)
+
+
+class ExtendAction(argparse.Action):
+    """
+    An argparse action which lets options be given multiple times,
+    i.e. --hosts 'lab-*' --hosts 'dfjt-*' or --hosts 'lab-*,dfjt-*'
+    """
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        setattr(namespace, self.dest, (getattr(namespace, self.dest) or []) + values)
+
+
+def add_selection_arguments(parser, day_one=True):
+    """
+    This function adds the host and getter selection options to a parser.
+    :param parser: The argparse.ArgumentParser object.
+    :param day_one: Whether to add the getter matrix and config type options.
+    :return:
+    """
+    # Host selection options
+    selection = parser.add_argument_group("host selection")
+    selection.add_argument(
+        "--hosts",
+        type=comma_list,
+        action=ExtendAction,
+        metavar="GLOB",
+        help="Only process hosts whose name matches one of these globs, i.e. 'lab-*'",
+    )
+    selection.add_argument(
+        "--exclude-hosts",
+        type=comma_list,
+        action=ExtendAction,
+        metavar="GLOB",
+        help="Skip hosts whose name matches one of these globs",
+    )
+    selection.add_argument(
+        "--groups",
+        type=comma_list,
+        action=ExtendAction,
+        metavar="GROUP",
+        help="Only process hosts which are a member of one of these groups",
+    )
+    selection.add_argument(
+        "--platforms",
+        type=comma_list,
+        action=ExtendAction,
+        metavar="PLATFORM",
+        help="Only process hosts of these platforms, i.e. ios,eos",
+    )
+    # Getter selection options
+    getters = parser.add_argument_group("getter selection")
+    getters.add_argument(
+        "--getters",
+        type=comma_list,
+        action=ExtendAction,
+        metavar="GETTER",
+        help="Only collect these NAPALM getters, i.e. facts,lldp_neighbors",
+    )
+    getters.add_argument(
+        "--exclude-getters",
+        type=comma_list,
+        action=ExtendAction,
+        metavar="GETTER",
+        help="Do not collect these NAPALM getters",
+    )
+    if day_one:
+        getters.add_argument(
+            "--getters-file",
+            default=GETTERS_FILE,
+            help="The per-platform getter matrix file (default: %(default)s)",
+        )
+        getters.add_argument(
+            "--configs",
+            type=comma_list,
+            action=ExtendAction,
+            metavar="TYPE",
+            help="Only collect these config types, i.e. running",
+        )
+        getters.add_argument(
+            "--exclude-configs",
+            type=comma_list,
+            action=ExtendAction,
+            metavar="TYPE",
+            help="Do not collect these config types",
+        )
+
+
+def add_capability_arguments(parser, clear=True):
+    """
+    This function adds the getter capability cache options to a parser.
+    :param parser: The argparse.ArgumentParser object.
+    :param clear: Whether to add the --clear-capability-cache option.
+    :return:
+    """
+    # Getter capability cache options
+    capabilities = parser.add_argument_group("getter capability cache")
+    capabilities.add_argument(
+        "--capability-cache",
+        default=CAPABILITY_CACHE_FILE,
+        help="The cache of getters known to be unsupported (default: %(default)s)",
+    )
+    if clear:
+        capabilities.add_argument(
+            "--clear-capability-cache",
+            action="store_true",
+            help="Remove the capability cache and exit, i.e. after upgrading NAPALM drivers",
+        )
+
+
+def add_index_arguments(parser, run=True):
+    """
+    This function adds the options of the indexes updated as hosts are collected.
+    :param parser: The argparse.ArgumentParser object.
+    :param run: Whether to add the config index, manifest and config archive options,
+    which are only written by a collection run.
+    :return:
+    """
+    # Index options
+    indexes = parser.add_argument_group("indexes")
+    indexes.add_argument(
+        "--endpoint-index",
+        default=ENDPOINT_INDEX_FILE,
+        help="The MAC and ARP endpoint index updated as hosts are collected "
+        "(default: %(default)s)",
+    )
+    indexes.add_argument(
+        "--history-dir",
+        default=HISTORY_DIR,
+        help="The interface counter history appended to as hosts are collected "
+        "(default: %(default)s)",
+    )
+    if run:
+        indexes.add_argument(
+            "--config-index",
+            default=CONFIG_INDEX_FILE,
+            help="The config search index updated as configs are collected, or '' to "
+            "disable it (default: %(default)s)",
+        )
+        indexes.add_argument(
+            "--manifest-dir",
+            default=MANIFEST_DIR,
+            help="The directory the manifest of each run is written to (default: %(default)s)",
+        )
+        indexes.add_argument(
+            "--archive-dir",
+            default=ARCHIVE_DIR,
+            help="The compressed config archive each run is added to, or '' to disable it "
+            "(default: %(default)s)",
+        )
+
+
+def add_retry_arguments(parser):
+    """
+    This function adds the timeout and retry options to a parser.
+    :param parser: The argparse.ArgumentParser object.
+    :return:
+    """
+    # Timeout and retry options
+    retries = parser.add_argument_group("timeouts and retries")
+    retries.add_argument(
+        "--latency-file",
+        default=LATENCY_FILE,
+        help="The recorded times each timeout is worked out from "
+        "(default: %(default)s)",
+    )
+    retries.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Use this NAPALM timeout for every item, instead of working it out",
+    )
+    retries.add_argument(
+        "--retries",
+        type=int,
+        default=RETRIES,
+        help="The number of times an item failing with a transient error is retried "
+        "(default: %(default)s)",
+    )
+    retries.add_argument(
+        "--backoff",
+        type=float,
+        default=BACKOFF_BASE,
+        metavar="SECONDS",
+        help="The base delay of the exponential backoff between retries "
+        "(default: %(default)s)",
+    )
+
+
+def add_memory_arguments(parser):
+    """
+    This function adds the memory options to a parser.
+    :param parser: The argparse.ArgumentParser object.
+    :return:
+    """
+    # Memory options
+    memory = parser.add_argument_group("memory")
+    memory.add_argument(
+        "--bounded-memory",
+        action="store_true",
+        help="Write each result to disk as it arrives and release it, instead of holding "
+        "the results of the run in memory",
+    )
+    memory.add_argument(
+        "--spill-threshold",
+        type=float,
+        default=SPILL_THRESHOLD,
+        metavar="MB",
+        help="With --bounded-memory, results larger than this are dropped from memory "
+        "once saved, and read back from disk when needed (default: %(default)s)",
+    )
+    memory.add_argument(
+        "--memory-budget",
+        type=float,
+        metavar="MB",
+        help="Only start large getters, i.e. mac_address_table and configs, while the "
+        "resident memory of the process stays within this budget",
+    )
+
+
+def build_parser(description, day_one=True):
+    """
+    This function builds the argument parser used by both toolkits.
+    :param description: The description displayed in the --help output.
+    :param day_one: Whether to add the options which only apply to day-one-toolkit.py.
+    :return: An argparse.ArgumentParser object.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    # The paths without an option, which a multi-customer run keeps in the directory of
+    # each customer
+    parser.set_defaults(
+        log_dir=LOG_DIR,
+        inventory_files=INVENTORY_FILES,
+        inventory_cache=INVENTORY_CACHE_FILE,
+    )
+    if day_one:
+        parser.set_defaults(facts_dir=FACT_DIR, configs_dir=CONFIG_DIR)
+    else:
+        parser.set_defaults(workbook_dir=".")
+    add_selection_arguments(parser, day_one)
+    if day_one:
+        add_capability_arguments(parser)
+        add_index_arguments(parser)
+        add_retry_arguments(parser)
+        # Progress options
+        progress = parser.add_argument_group("progress")
+        progress.add_argument(
+            "--status-file",
+            metavar="FILE",
+            help="Write the progress of the run to this JSON file as it goes",
+        )
+        progress.add_argument(
+            "--progress-interval",
+            type=float,
+            default=PROGRESS_INTERVAL,
+            metavar="SECONDS",
+            help="How often the progress is printed and written (default: %(default)s)",
+        )
+        # Raw CLI command options
+        commands = parser.add_argument_group("raw commands")
+        commands.add_argument(
+            "--commands-file",
+            default=COMMANDS_FILE,
+            help="The per-platform CLI command lists (default: %(default)s)",
+        )
+        commands.add_argument(
+            "--command-dir",
+            default=COMMAND_DIR,
+            help="The directory the raw and parsed output is saved to "
+            "(default: %(default)s)",
+        )
+        commands.add_argument(
+            "--commands",
+            action="store_true",
+            help="Also run the raw CLI commands of the commands file",
+        )
+        commands.add_argument(
+            "--parse-workers",
+            type=int,
+            metavar="N",
+            help="The number of processes parsing the output (default: the CPU count)",
+        )
+    else:
+        # Collection source options
+        source = parser.add_argument_group("collection source")
+        source.add_argument(
+            "--source",
+            choices=["live", "facts"],
+            default="live",
+            help="Collect from the devices, or from a facts directory saved by "
+            "day-one-toolkit.py (default: %(default)s)",
+        )
+        source.add_argument(
+            "--facts-dir",
+            default=FACT_DIR,
+            help="The facts directory used with --source facts (default: %(default)s)",
+        )
+        source.add_argument(
+            "--max-age",
+            type=float,
+            metavar="HOURS",
+            help="Treat getter files older than this many hours as stale",
+        )
+        source.add_argument(
+            "--poll-missing",
+            action="store_true",
+            help="Poll hosts whose getter files are missing or stale from the devices",
+        )
+        source.add_argument(
+            "--read-workers",
+            type=int,
+            default=READ_WORKERS,
+            help="The number of threads used to read the facts directory "
+            "(default: %(default)s)",
+        )
+        # Output options
+        output = parser.add_argument_group("output")
+        output.add_argument(
+            "--topology",
+            metavar="FILE",
+            help="Export the LLDP topology to a .graphml or .json file",
+        )
+        output.add_argument(
+            "--bgp",
+            action="store_true",
+            help="Add the BGP_Sessions and BGP_Peerings datasets, built from the BGP "
+            "getters in the facts directory",
+        )
+        output.add_argument(
+            "--health",
+            action="store_true",
+            help="Add the Health_Ports and Health_Hosts datasets, built from the optics "
+            "and environment getters in the facts directory",
+        )
+        output.add_argument(
+            "--health-file",
+            default=HEALTH_FILE,
+            help="The health thresholds YAML file used with --health "
+            "(default: %(default)s)",
+        )
+        output.add_argument(
+            "--export",
+            type=export_formats,
+            default=["workbook"],
+            metavar="FORMATS",
+            help="The formats the datasets are written in, from "
+            + ",".join(EXPORT_FORMATS)
+            + " (default: workbook)",
+        )
+        output.add_argument(
+            "--export-dir",
+            default=EXPORT_DIR,
+            help="The directory the csv, jsonl and parquet files are written to "
+            "(default: %(default)s)",
+        )
+        output.add_argument(
+            "--no-summary",
+            dest="summary",
+            action="store_false",
+            help="Don't add the Summary datasets of models, down interfaces and users",
+        )
+        output.add_argument(
+            "--standard-users",
+            type=comma_list,
+            default=STANDARD_USERS,
+            metavar="USERNAME",
+            help="The local users expected on every host, the others are listed in "
+            "Summary_Users (default: " + ",".join(STANDARD_USERS) + ")",
+        )
+    # Profiling options
+    profiling = parser.add_argument_group("profiling")
+    profiling.add_argument(
+        "--profile",
+        nargs="?",
+        const=PROFILE_DIR,
+        metavar="DIR",
+        help="Profile each phase of the run and trace each host and getter, writing "
+        "the results under DIR (default: " + PROFILE_DIR + ")",
+    )
+    # Concurrency options
+    concurrency = parser.add_argument_group("concurrency")
+    concurrency.add_argument(
+        "--concurrency",
+        type=int,
+        metavar="SESSIONS",
+        help="The number of device sessions open at once (default: "
+        + str(CONCURRENCY)
+        + ", or the value tuned by the last adaptive run with --adaptive-concurrency)",
+    )
+    concurrency.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Raise the number of sessions while the devices respond normally, and halve "
+        "it when timeouts or authentication failures spike",
+    )
+    concurrency.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=MAX_CONCURRENCY,
+        metavar="SESSIONS",
+        help="The most sessions --adaptive-concurrency opens at once (default: %(default)s)",
+    )
+    concurrency.add_argument(
+        "--concurrency-file",
+        default=CONCURRENCY_FILE,
+        help="Where the tuned number of sessions is saved for the next run "
+        "(default: %(default)s)",
+    )
+    add_memory_arguments(parser)
+    # Customer options
+    customers = parser.add_argument_group("customers")
+    customers.add_argument(
+        "--customer",
+        dest="customers",
+        type=customer_profile,
+        action="append",
+        metavar="NAME[=DIR]",
+        help="Run for this customer profile, from its own directory (default: "
+        + CUSTOMER_DIR
+        + "/NAME). Can be given multiple times to run customers at the same time",
+    )
+    customers.add_argument(
+        "--connection-budget",
+        type=int,
+        default=CONNECTION_BUDGET,
+        metavar="N",
+        help="The number of device sessions open at once across every customer "
+        "(default: %(default)s)",
+    )
+    customers.add_argument(
+        "--customer-name",
+        default="Customer",
+        help="The customer name the workbook is named after (default: %(default)s)",
+    )
+    return parser
@@ -0,0 +1,861 @@
+"""
+Collects a summary of network devices into an Excel workbook, and/or CSV, JSON Lines
+and Parquet files. This is the collection-toolkit command, which can also be used as
+a library:
+
+from day_one_net_toolkit.collection import create_workbook, main
+main(["--source", "facts"])
+"""
+
+# Import Modules
+import pathlib
+import datetime as dt
+import itertools
+import sys
+from colorama import Fore, init
+from day_one_net_toolkit.cli import build_parser
+from day_one_net_toolkit.bgp import BGP_DATASETS, load_session_map
+from day_one_net_toolkit.concurrency import build_limiter, concurrency_slot, set_limiter
+from day_one_net_toolkit.credentials import read_credentials
+from day_one_net_toolkit.customers import connection_slot, run_customers
+from day_one_net_toolkit.plan import filter_inventory, select_items
+from day_one_net_toolkit.factstore import load_fact_store, save_getter
+from day_one_net_toolkit.health import (
+    HEALTH_DATASETS,
+    load_health,
+    load_thresholds,
+    scan,
+)
+from day_one_net_toolkit.exporters import DATASETS, build_exports
+from day_one_net_toolkit.summary import SUMMARY_DATASETS, SummaryCollector, summarise
+from day_one_net_toolkit.topology import TopologyIndex
+from day_one_net_toolkit.ipindex import IPIndex, format_record
+from day_one_net_toolkit.inventory import host_subset, platform_index
+from day_one_net_toolkit.memory import (
+    BOUNDED_BATCH,
+    memory_slot,
+    report_memory,
+    set_memory_budget,
+)
+from day_one_net_toolkit.profiling import Profiler, report_profile, span
+from day_one_net_toolkit.tasks import init_nornir
+from day_one_net_toolkit.timeouts import item_key
+
+"""
+The following five functions are used to retrieve NAPALM getters required
+for the summary spreadsheet.
+"""
+
+
+def get_facts(task):
+    from nornir_napalm.plugins.tasks import napalm_get
+
+    key = item_key(task.host.platform, "facts")
+    with concurrency_slot(key), connection_slot(), memory_slot("facts"):
+        with span(task.host.name, "getter", getter="facts"):
+            task.run(name="Get facts", task=napalm_get, getters=["facts"])
+    return "Complete"
+
+
+def get_interfaces(task):
+    from nornir_napalm.plugins.tasks import napalm_get
+
+    key = item_key(task.host.platform, "interfaces")
+    with concurrency_slot(key), connection_slot(), memory_slot("interfaces"):
+        with span(task.host.name, "getter", getter="interfaces"):
+            task.run(name="Get interfaces", task=napalm_get, getters=["interfaces"])
+    return "Complete"
+
+
+def get_interfaces_ip(task):
+    from nornir_napalm.plugins.tasks import napalm_get
+
+    key = item_key(task.host.platform, "interfaces_ip")
+    with concurrency_slot(key), connection_slot(), memory_slot("interfaces_ip"):
+        with span(task.host.name, "getter", getter="interfaces_ip"):
+            task.run(
+                name="Get interfaces IP", task=napalm_get, getters=["interfaces_ip"]
+            )
+    return "Complete"
+
+
+def get_lldp_neighbors(task):
+    from nornir_napalm.plugins.tasks import napalm_get
+
+    key = item_key(task.host.platform, "lldp_neighbors")
+    with concurrency_slot(key), connection_slot(), memory_slot("lldp_neighbors"):
+        with span(task.host.name, "getter", getter="lldp_neighbors"):
+            task.run(
+                name="Get LLDP neighbors", task=napalm_get, getters=["lldp_neighbors"]
+            )
+    return "Complete"
+
+
+def get_users(task):
+    from nornir_napalm.plugins.tasks import napalm_get
+
+    key = item_key(task.host.platform, "users")
+    with concurrency_slot(key), connection_slot(), memory_slot("users"):
+        with span(task.host.name, "getter", getter="users"):
+            task.run(name="Get users", task=napalm_get, getters=["users"])
+    return "Complete"
+
+
+# The getters which can be collected for the summary spreadsheet
+COLLECTION_GETTERS = ["facts", "interfaces", "interfaces_ip", "lldp_neighbors", "users"]
+# The platforms which are collected, in the order they appear in the spreadsheet
+COLLECTION_PLATFORMS = ["ios", "junos", "eos", "nxos", "iosxr"]
+# The task name and task used to collect each getter
+GETTER_TASKS = {
+    "facts": ("Processing facts", get_facts),
+    "interfaces": ("Processing interfaces", get_interfaces),
+    "interfaces_ip": ("Processing interface IP addresses", get_interfaces_ip),
+    "lldp_neighbors": ("Processing LLDP neighbors", get_lldp_neighbors),
+    "users": ("Processing users", get_users),
+}
+
+
+def collection_hosts(nr):
+    """
+    This function returns the names of the hosts which are collected, in the
+    order they appear in the spreadsheet.
+    :param nr: The Nornir object.
+    :return: A list of host names.
+    """
+    hostnames = []
+    index = platform_index(nr)
+    for platform in COLLECTION_PLATFORMS:
+        hostnames.extend(index.get(platform, []))
+    return hostnames
+
+
+def run_getter(nr, getter, log_file, batch=None):
+    """
+    This function runs the task of a getter against each platform and yields
+    the results of the hosts which succeeded, one batch of hosts at a time.
+    :param nr: The Nornir object of the hosts to run the task against.
+    :param getter: The name of the NAPALM getter.
+    :param log_file: The log file which will save the results as we process through the host.
+    :param batch: The number of hosts run at a time, or None to run each platform at once.
+    :return: A generator of (hostname, result) tuples, where result is {getter: <getter result>}.
+    """
+    task_name, task = GETTER_TASKS[getter]
+    index = platform_index(nr)
+    for platform in COLLECTION_PLATFORMS:
+        hostnames = index.get(platform, [])
+        size = batch or len(hostnames) or 1
+        for start in range(0, len(hostnames), size):
+            batch_nr = host_subset(nr, hostnames[start : start + size])
+            batch_results = batch_nr.run(name=task_name, task=task)
+            for host in list(batch_results):
+                # Release each host's result once it has been handed over
+                task_results = batch_results.pop(host)
+                # Skip hosts which failed, so they don't stop the rest of the workbook
+                if task_results.failed:
+                    print(f"{Fore.RED}FAILURE : " + str(host) + " - " + str(getter))
+                    log_file.write(
+                        "FAILURE : " + str(host) + " - " + str(getter) + "\n"
+                    )
+                    continue
+                yield host, task_results[1].result
+
+
+def gather_results(nr, getter, getters, fact_store, args, log_file, profiler=None):
+    """
+    This function gathers the results of a getter, either by running it against the
+    devices or from the results loaded from the facts directory.
+
+    When the results come from the facts directory, hosts with a missing or stale
+    file are only polled live when --poll-missing is set. Their results are then
+    saved to the facts directory as well.
+
+    With --bounded-memory the live results are returned as a generator, so each batch
+    of hosts is converted to rows and released before the next batch is collected. The
+    devices are then polled while the results are read, which the profiler times as
+    collection rather than parsing.
+    :param nr: The Nornir object.
+    :param getter: The name of the NAPALM getter.
+    :param getters: The list of selected getters.
+    :param fact_store: The results loaded from the facts directory, or None for a live run.
+    :param args: The parsed command line arguments.
+    :param log_file: The log file which will save the results as we process through the host.
+    :param profiler: The Profiler object which times the phases of the run, when profiling.
+    :return: A list of (hostname, result) tuples, where result is {getter: <getter result>}.
+    """
+    # Getters which weren't selected have no results
+    if getter not in getters:
+        return []
+    # Collect the getter from the devices on a live run
+    if fact_store is None:
+        if args.bounded_memory:
+            results = run_getter(nr, getter, log_file, BOUNDED_BATCH)
+            if profiler is not None:
+                return profiler.iterate(results, "collection", "parsing")
+            return results
+        return list(run_getter(nr, getter, log_file))
+    stored = fact_store[getter]
+    hostnames = collection_hosts(nr)
+    missing = set(hostnames) - set(stored)
+    if missing and args.poll_missing:
+        # Display printout
+        print(f"{Fore.YELLOW}Polling hosts missing {getter}: " + str(len(missing)))
+        # Add to log file
+        log_file.write(
+            "Polling hosts missing " + getter + ": " + str(len(missing)) + "\n"
+        )
+        # Only run the task against the missing hosts
+        missing_nr = host_subset(nr, [host for host in hostnames if host in missing])
+        for host, result in run_getter(missing_nr, getter, log_file):
+            save_getter(args.facts_dir, host, getter, result[getter])
+            stored[host] = result[getter]
+    # Return the results in spreadsheet order
+    return [(host, {getter: stored[host]}) for host in hostnames if host in stored]
+
+
+def main_collector(  # noqa
+    exports, log_file, args, username="", password="", profiler=None
+):
+    """
+    This is the main function of the application. In this function, we run tasks against all hosts
+    in the inventory and parse the results and place them into various datasets, which are
+    written to the workbook tabs and any other selected export formats as each host is done.
+
+    There are five datasets and getter that we are collecting
+
+    Facts - The facts about the hosts
+    Interfaces - A list of interfaces on each host
+    Interfaces_IP - A list of interfaces with IP addressed on each host
+    LLDP - A list of LLDP neighbors on each host
+    Users - A list of local usernames on each host
+
+    Only the selected getters are collected, the datasets of the other
+    getters are left with just their headers.
+
+    With --source facts the results are read from the facts directory saved by
+    day-one-toolkit.py instead of connecting to the devices. With --bgp the BGP sessions
+    of the fleet are mapped from the facts directory as well, and with --health the optics
+    and environment are checked against the health thresholds.
+    :param exports: The Exports object the datasets are written to.
+    :param log_file: The log file which will save the results as we process through the host.
+    :param args: The parsed command line arguments.
+    :param username: The default username for the inventory.
+    :param password: The default password for the inventory.
+    :param profiler: The Profiler object which times the phases of the run, when profiling.
+    :return:
+    """
+    profiler = profiler or Profiler()
+    # Limit the large getters running at once, when there is a memory budget
+    set_memory_budget(args.memory_budget)
+    # Work out which of the getters have been selected on the command line
+    getters = select_items(COLLECTION_GETTERS, args.getters, args.exclude_getters)
+    # Create the datasets on every exporter, with their headers on the top line
+    exports.open(DATASETS)
+    # Time each phase of the run separately, when profiling
+    profiler.begin("inventory")
+    # Initialize Nornir, with the default username and password
+    nr = init_nornir(
+        username, password, cache_file=args.inventory_cache, files=args.inventory_files
+    )
+    # Narrow the inventory down to the selected hosts, before any connection is opened
+    nr = filter_inventory(
+        nr,
+        hosts=args.hosts,
+        exclude_hosts=args.exclude_hosts,
+        groups=args.groups,
+        platforms=args.platforms,
+    )
+    # Limit the sessions open at once, and tune the limit as the getters complete,
+    # when requested. Otherwise Nornir's own number of workers is used
+    limiter = None
+    if args.concurrency or args.adaptive_concurrency:
+        from nornir.plugins.runners import ThreadedRunner
+
+        limiter = build_limiter(args, log_file)
+        set_limiter(limiter)
+        # Run enough workers for the highest limit, the limit holds the others back
+        nr = nr.with_runner(ThreadedRunner(num_workers=limiter.maximum))
+    """
+    The following block of code loads the results saved by day-one-toolkit.py from
+    the facts directory in parallel, when it is the source of the workbook.
+    Otherwise the getters are collected live from the devices.
+    """
+    profiler.begin("collection")
+    if args.source == "facts":
+        # Convert the maximum age from hours to seconds
+        max_age = args.max_age * 3600 if args.max_age is not None else None
+        fact_store, missing = load_fact_store(
+            args.facts_dir,
+            collection_hosts(nr),
+            getters,
+            max_age=max_age,
+            workers=args.read_workers,
+        )
+        # Display printout
+        print(
+            f"{Fore.CYAN}Loaded results from "
+            + str(args.facts_dir)
+            + " - Missing or stale: "
+            + str(len(missing))
+        )
+        # Add to log file
+        log_file.write(
+            "Loaded results from "
+            + str(args.facts_dir)
+            + " - Missing or stale: "
+            + str(len(missing))
+            + "\n"
+        )
+    else:
+        fact_store = None
+    """
+    Gathering the interfaces results for each platform, either from the devices
+    or the facts directory, so the results can be parsed and saved to a spreadsheet
+    """
+    interfaces_results = gather_results(
+        nr, "interfaces", getters, fact_store, args, log_file, profiler
+    )
+    profiler.begin("parsing")
+    # For loop to process individual results
+    for host, get_interfaces_result in interfaces_results:
+        # Display printout
+        print(f"{Fore.MAGENTA}Start Processing Host - Interfaces: " + str(host) + "\n")
+        # Add to log file
+        log_file.write("Start Processing Host - Interfaces: " + str(host) + "\n")
+        # Rows of the host, written once the host is processed
+        rows = []
+        interface_name_result = get_interfaces_result["interfaces"]
+        # Empty list which will be appended to in for loop
+        int_list = []
+        # For loop to retrieve the list of interfaces
+        for entry in interface_name_result:
+            # Append entries to the int_list list
+            int_list.append(entry)
+        # For loop to loop through list of interfaces and extract interface values
+        for int in int_list:
+            # Assign individual interface entry to a variable
+            int_result = interface_name_result[int]
+            # Extract the interface description and assign to a variable
+            int_desc_result = int_result["description"]
+            # Extract the interface state and assign to a variable
+            int_up_result = int_result["is_up"]
+            # Extract the whether the interface is enabled and assign to a variable
+            int_enable_result = int_result["is_enabled"]
+            # Display printout
+            print("Interface Name: " + str(int))
+            # Add to log file
+            log_file.write("Interface Name: " + str(int) + "\n")
+            # Display printout
+            print("Interface Description: " + str(int_desc_result))
+            # Add to log file
+            log_file.write("Interface Description: " + str(int_desc_result) + "\n")
+            # Display printout
+            print("Interface Up: " + str(int_up_result))
+            # Add to log file
+            log_file.write("Interface Up: " + str(int_up_result) + "\n")
+            # Display printout
+            print("Interface Enabled: " + str(int_enable_result))
+            # Add to log file
+            log_file.write("Interface Enabled: " + str(int_enable_result) + "\n")
+            line = [host, int, int_desc_result, int_up_result, int_enable_result]
+            # Debug print
+            # print(line)
+            # Add values to the rows of the host
+            rows.append(line)
+        # Write the rows of the host to every exporter
+        exports.write_rows("Interfaces", rows)
+        # Display printout
+        print(f"{Fore.MAGENTA}End Processing Host - Interfaces: " + str(host) + "\n")
+        # Add to log file
+        log_file.write("End Processing Host - Interfaces: " + str(host) + "\n\n")
+    """
+    Gathering the facts results for each platform, either from the devices
+    or the facts directory, so the results can be parsed and saved to a spreadsheet
+    """
+    profiler.begin("collection")
+    facts_results = gather_results(
+        nr, "facts", getters, fact_store, args, log_file, profiler
+    )
+    profiler.begin("parsing")
+    # For loop to process individual results
+    for host, get_facts_result in facts_results:
+        # Display printout
+        print(f"{Fore.MAGENTA}Start Processing Host - Facts: " + str(host) + "\n")
+        # Add to log file
+        log_file.write("Start Processing Host - Facts: " + str(host) + "\n")
+        # Rows of the host, written once the host is processed
+        rows = []
+        # Extract the Vendor and assign to a variable
+        vendor_result = get_facts_result["facts"]["vendor"]
+        # Extract the Model and assign to a variable
+        model_result = get_facts_result["facts"]["model"]
+        # Extract the OS Version and assign to a variable
+        version_result = get_facts_result["facts"]["os_version"]
+        # Extract the Serial Number and assign to a variable
+        ser_num_result = get_facts_result["facts"]["serial_number"]
+        # Extract the Uptime and assign to a variable
+        uptime_result = get_facts_result["facts"]["uptime"]
+        # Display printout
+        print("Vendor: " + str(vendor_result))
+        # Add to log file
+        log_file.write("Vendor: " + str(vendor_result) + "\n")
+        # Display printout
+        print("Model: " + str(model_result))
+        # Add to log file
+        log_file.write("Model: " + str(model_result) + "\n")
+        # Display printout
+        print("OS Version: " + str(version_result))
+        # Add to log file
+        log_file.write("OS Version: " + str(version_result) + "\n")
+        # Display printout
+        print("Serial Number: " + str(ser_num_result))
+        # Add to log file
+        log_file.write("Serial Number: " + str(ser_num_result) + "\n")
+        # Display printout
+        print("Uptime: " + str(uptime_result))
+        # Add to log file
+        log_file.write("Uptime: " + str(uptime_result) + "\n")
+        line = [
+            host,
+            vendor_result,
+            model_result,
+            version_result,
+            ser_num_result,
+            uptime_result,
+        ]
+        # Debug print
+        # print(line)
+        # Add values to the rows of the host
+        rows.append(line)
+        # Write the rows of the host to every exporter
+        exports.write_rows("Facts", rows)
+        # Display printout
+        print(f"{Fore.MAGENTA}End Processing Host - Facts: " + str(host) + "\n")
+        # Add to log file
+        log_file.write("End Processing Host - Facts: " + str(host) + "\n\n")
+    """
+    Gathering the interfaces IP results for each platform, either from the devices
+    or the facts directory, so the results can be parsed and saved to a spreadsheet
+    """
+    profiler.begin("collection")
+    interfaces_ip_results = gather_results(
+        nr, "interfaces_ip", getters, fact_store, args, log_file, profiler
+    )
+    profiler.begin("parsing")
+    # For loop to process individual results
+    # Index every address, so duplicate addresses and overlapping subnets can be reported
+    ip_index = IPIndex()
+    for host, get_interfaces_ip_result in interfaces_ip_results:
+        ip_index.add_host(host, get_interfaces_ip_result["interfaces_ip"])
+        # Display printout
+        print(
+            f"{Fore.MAGENTA}Start Processing Host - Interfaces IP: " + str(host) + "\n"
+        )
+        # Add to log file
+        log_file.write("Start Processing Host - Interfaces IP: " + str(host) + "\n")
+        # Rows of the host, written once the host is processed
+        rows = []
+        # Filter the results
+        interface_ip_name_result = get_interfaces_ip_result["interfaces_ip"]
+        # Empty list which will be appended to in for loop
+        int_ip_list = []
+        # For loop to retrieve the list of interfaces
+        for entry in interface_ip_name_result:
+            # Append entries to the int_ip_list list
+            int_ip_list.append(entry)
+            # Debug print
+            # print(int_ip_list)
+        # For loop to loop through list of IPv4 interfaces and extract interface_ip values
+        for int_ip in int_ip_list:
+            # Assign individual interface entry to a variable
+            final_int_ip = interface_ip_name_result[int_ip]
+            # Build lists of every IPv4 and IPv6 address, so none are lost when
+            # an interface has more than one address
+            ipv4_list = [
+                (address, details["prefix_length"])
+                for address, details in (final_int_ip.get("ipv4") or {}).items()
+            ]
+            ipv6_list = [
+                (address, details["prefix_length"])
+                for address, details in (final_int_ip.get("ipv6") or {}).items()
+            ]
+            # When the IPv6 address is not there, record that it is not configured
+            if not ipv6_list:
+                # Display printout
+                print(f"{Fore.YELLOW}IPv6 Address not configured")
+                # Add to log file
+                log_file.write("IPv6 Address not configured" + "\n")
+            # For loop to write one row per address, pairing the IPv4 and IPv6 addresses up.
+            # Missing entries are set so there is a result which is clear that it is not configured.
+            for ipv4_entry, ipv6_entry in itertools.zip_longest(
+                ipv4_list, ipv6_list, fillvalue=("NOT CONFIGURED", "NOT CONFIGURED")
+            ):
+                # Assign the IPv4 address and prefix length to variables
+                ipv4_address, prefix_length_v4 = ipv4_entry
+                # Assign the IPv6 address and prefix length to variables
+                ipv6_address, prefix_length_v6 = ipv6_entry
+                # Display printout
+                print("Interface Name: " + str(int_ip))
+                # Add to log file
+                log_file.write("Interface Name: " + str(int_ip) + "\n")
+                # Display printout
+                print("IPv4 Address: " + str(ipv4_address))
+                # Add to log file
+                log_file.write("IPv4 Address: " + str(ipv4_address) + "\n")
+                # Display printout
+                print("IPv4 Prefix Length: " + str(prefix_length_v4))
+                # Add to log file
+                log_file.write("IPv4 Prefix Length: " + str(prefix_length_v4) + "\n")
+                # Display printout
+                print("IPv6 Address: " + str(ipv6_address))
+                # Add to log file
+                log_file.write("IPv6 Address: " + str(ipv6_address) + "\n")
+                # Display printout
+                print("IPv6 Prefix Length: " + str(prefix_length_v6))
+                # Add to log file
+                log_file.write("IPv6 Prefix Length: " + str(prefix_length_v6) + "\n")
+                # Append results to a line to be saved to the workbook
+                line = [
+                    host,
+                    int_ip,
+                    str(ipv4_address),
+                    str(prefix_length_v4),
+                    str(ipv6_address),
+                    str(prefix_length_v6),
+                ]
+                # Debug print
+                # print(line)
+                # Add values to the rows of the host
+                rows.append(line)
+        # Write the rows of the host to every exporter
+        exports.write_rows("Interfaces_IP", rows)
+        # Display printout
+        print(f"{Fore.MAGENTA}End Processing Host - Interfaces IP: " + str(host) + "\n")
+        # Add to log file
+        log_file.write("End Processing Host - Interfaces IP: " + str(host) + "\n\n")
+    ip_index.build()
+    for address, records in ip_index.duplicates():
+        owners = ", ".join(format_record(record) for record in records)
+        # Display printout
+        print(f"{Fore.YELLOW}DUPLICATE IP : " + address + " - " + owners)
+        # Add to log file
+        log_file.write("DUPLICATE IP : " + address + " - " + owners + "\n")
+    for outer, inner in ip_index.overlaps():
+        # Display printout
+        print(f"{Fore.YELLOW}OVERLAPPING SUBNET : " + inner + " inside " + outer)
+        # Add to log file
+        log_file.write("OVERLAPPING SUBNET : " + inner + " inside " + outer + "\n")
+    """
+    Gathering the LLDP neighbors results for each platform, either from the devices
+    or the facts directory, so the results can be parsed and saved to a spreadsheet
+    """
+    profiler.begin("collection")
+    lldp_neighbors_results = gather_results(
+        nr, "lldp_neighbors", getters, fact_store, args, log_file, profiler
+    )
+    profiler.begin("parsing")
+    # For loop to process individual results
+    # Build the LLDP topology as each host is processed, when requested
+    topology = TopologyIndex()
+    for host, lldp_nei_result in lldp_neighbors_results:
+        if args.topology:
+            topology.add_host(host, lldp_nei_result["lldp_neighbors"])
+        # Display printout
+        print(f"{Fore.MAGENTA}Start Processing Host - LLDP: " + str(host) + "\n")
+        # Add to log file
+        log_file.write("Start Processing Host - LLDP: " + str(host) + "\n")
+        # Rows of the host, written once the host is processed
+        rows = []
+        lldp_nei_name_result = lldp_nei_result["lldp_neighbors"]
+        # Empty list which will be appended to in for loop
+        neighbor_list = []
+        # For loop to retrieve the list of interfaces
+        for entry in lldp_nei_name_result:
+            # Append entries to the neighbor_list list
+            neighbor_list.append(entry)
+            # Debug print
+            # print(neighbor_list)
+        for local_port in neighbor_list:
+            # For loop to process every neighbor on the port, not only the first one
+            for neighbor in lldp_nei_name_result[local_port]:
+                # Extract the remote port and assign to a variable
+                remote_port = neighbor["port"]
+                # Extract the remote username and assign to a variable
+                remote_hostname = neighbor["hostname"]
+                # Display printout
+                print("Local Port: " + str(local_port))
+                # Add to log file
+                log_file.write("Local Port: " + str(local_port) + "\n")
+                # Display printout
+                print("Remote Port: " + str(remote_port))
+                # Add to log file
+                log_file.write("Remote Port: " + str(remote_port) + "\n")
+                # Display printout
+                print("Remote Hostname: " + str(remote_hostname))
+                # Add to log file
+                log_file.write("Remote Hostname: " + str(remote_hostname) + "\n")
+                # Append results to a line to be saved to the workbook
+                line = [host, local_port, remote_hostname, remote_port]
+                # Debug print
+                # print(line)
+                # Add values to the rows of the host
+                rows.append(line)
+        # Write the rows of the host to every exporter
+        exports.write_rows("LLDP", rows)
+        # Display printout
+        print(f"{Fore.MAGENTA}End Processing Host - LLDP: " + str(host) + "\n")
+        # Add to log file
+        log_file.write("End Processing Host - LLDP: " + str(host) + "\n\n")
+    # Export the LLDP topology of the fleet, when requested
+    if args.topology:
+        topology.export(args.topology)
+        # Display printout
+        print(f"{Fore.CYAN}LLDP topology exported to: " + str(args.topology))
+        # Add to log file
+        log_file.write("LLDP topology exported to: " + str(args.topology) + "\n")
+        # Report the links which have not been seen from both ends
+        for node, port, remote_node, remote_port, state in topology.problem_links():
+            link = f"{state.upper()} : {node} {port} -> {remote_node} {remote_port}"
+            print(f"{Fore.YELLOW}" + link)
+            log_file.write(link + "\n")
+    """
+    Gathering the users results for each platform, either from the devices
+    or the facts directory, so the results can be parsed and saved to a spreadsheet
+    """
+    profiler.begin("collection")
+    users_results = gather_results(
+        nr, "users", getters, fact_store, args, log_file, profiler
+    )
+    profiler.begin("parsing")
+    # For loop to process individual results
+    for host, get_users_result in users_results:
+        # Display printout
+        print(f"{Fore.MAGENTA}Start Processing Host - Users: " + str(host) + "\n")
+        # Add to log file
+        log_file.write("Start Processing Host - Users: " + str(host) + "\n")
+        # Rows of the host, written once the host is processed
+        rows = []
+        users_name_result = get_users_result["users"]
+        # print(users_name_result)
+        # Empty list which will be appended to in for loop
+        user_list = []
+        for entry in users_name_result:
+            # Append entries to the user_list list
+            user_list.append(entry)
+        for user in user_list:
+            # Extract the User privilege level and assign to a variable
+            user_level = users_name_result[user]["level"]
+            # Extract the User password and assign to a variable
+            user_pw = users_name_result[user]["password"]
+            # Extract the SSH keys and assign to a variable
+            user_ssh = users_name_result[user]["sshkeys"]
+            # Display printout
+            print("Username: " + str(user))
+            # Add to log file
+            log_file.write("Username: " + str(user) + "\n")
+            # Display printout
+            print("Level: " + str(user_level))
+            # Add to log file
+            log_file.write("Level: " + str(user_level) + "\n")
+            # Display printout
+            print("Password: " + str(user_pw))
+            # Add to log file
+            log_file.write("Password: " + str(user_pw) + "\n")
+            # Display printout
+            print("SSH Keys: " + str(user_ssh))
+            # Add to log file
+            log_file.write("SSH Keys: " + str(user_ssh) + "\n")
+            # Append results to a line to be saved to the workbook
+            line = [host, user, user_level, user_pw, str(user_ssh)]
+            # Add values to the rows of the host
+            rows.append(line)
+        # Write the rows of the host to every exporter
+        exports.write_rows("Users", rows)
+        # Display printout
+        print(f"{Fore.MAGENTA}End Processing Host - Users: " + str(host) + "\n")
+        # Add to log file
+        log_file.write("End Processing Host - Users: " + str(host) + "\n")
+    # Map the BGP sessions of the fleet from the facts directory, when requested
+    if args.bgp:
+        profiler.begin("parsing")
+        session_map = load_session_map(
+            args.facts_dir, collection_hosts(nr), workers=args.read_workers
+        )
+        exports.open(BGP_DATASETS)
+        exports.write_rows("BGP_Sessions", session_map.session_rows())
+        exports.write_rows("BGP_Peerings", session_map.peering_rows())
+        # Display printout
+        print(
+            f"{Fore.CYAN}BGP sessions mapped from "
+            + str(args.facts_dir)
+            + ": "
+            + str(len(session_map.sessions))
+        )
+        # Add to log file
+        log_file.write(
+            "BGP sessions mapped from "
+            + str(args.facts_dir)
+            + ": "
+            + str(len(session_map.sessions))
+            + "\n"
+        )
+        # Report the sessions which are down, one-sided or whose AS numbers don't agree
+        for entry, _ in session_map.problems():
+            session = (
+                f"BGP {entry.state.upper()} : {entry.hostname} {entry.vrf} "
+                f"AS{entry.local_as} -> {session_map.remote_hostname(entry) or '-'} "
+                f"{entry.remote_address} AS{entry.remote_as}"
+            )
+            print(f"{Fore.YELLOW}" + session)
+            log_file.write(session + "\n")
+    # Scan the optics and environment of the fleet from the facts directory, when requested
+    if args.health:
+        profiler.begin("parsing")
+        thresholds = load_thresholds(args.health_file)
+        columns = load_health(
+            args.facts_dir,
+            collection_hosts(nr),
+            thresholds=thresholds,
+            workers=args.read_workers,
+        )
+        port_rows, host_rows = scan(columns, thresholds["checks"])
+        exports.open(HEALTH_DATASETS)
+        exports.write_rows("Health_Ports", port_rows)
+        exports.write_rows("Health_Hosts", host_rows)
+        # Display printout
+        print(
+            f"{Fore.CYAN}Health exceptions - Ports: "
+            + str(len(port_rows))
+            + " - Hosts: "
+            + str(len(host_rows))
+        )
+        # Add to log file
+        log_file.write(
+            "Health exceptions - Ports: "
+            + str(len(port_rows))
+            + " - Hosts: "
+            + str(len(host_rows))
+            + "\n"
+        )
+    # Report the concurrency of the run, and save the tuned value for the next run
+    if limiter is not None:
+        limiter.report(log_file, args.concurrency_file)
+        set_limiter(None)
+
+
+def create_workbook(args, username="", password=""):
+    """
+    This function creates an Excel workbook and the other selected exporters, which are
+    then passed to the main function 'main_collector' to retrieve and store results into
+    an Excel workbook and/or CSV, JSON Lines and Parquet files.
+
+    It also sets up a log file
+    :param args: The parsed command line arguments.
+    :param username: The default username for the inventory.
+    :param password: The default password for the inventory.
+    :return:
+    """
+    # Capture time
+    cur_time = dt.datetime.now()
+    # Cleanup time, so that the format is clean for the output file 2019-07-01-13-04-59
+    fmt_time = cur_time.strftime("%Y-%m-%d-%H-%M-%S")
+    # Set log directory variable
+    log_dir = args.log_dir
+    # Create log directory if it doesn't exist.
+    pathlib.Path(log_dir).mkdir(parents=True, exist_ok=True)
+    # Create log file name, with timestamp in the name
+    filename = str("COLLECTION-LOG") + "-" + fmt_time + ".txt"
+    # Join the log file name and log directory together into a variable
+    log_file_path = log_dir + "/" + filename
+    # Create the log file
+    log_file = open(log_file_path, "w")
+    # Assign customer name to Excel file
+    customer_name = args.customer_name
+    # String together workbook name i.e. customer-2019-01-01-13-00-00.xlsx
+    wb_name = "Collection-" + customer_name + "-" + fmt_time + ".xlsx"
+    # Setup workbook parameters, when the workbook is one of the export formats
+    wb = None
+    if "workbook" in args.export:
+        import openpyxl
+
+        # Write-only workbooks stream rows to disk instead of keeping every cell in memory
+        wb = openpyxl.Workbook(write_only=True)
+    # The other formats are written to a directory named after the workbook
+    exports = build_exports(
+        args.export, wb, pathlib.Path(args.export_dir, wb_name[: -len(".xlsx")])
+    )
+    # Profile the run, when requested
+    profiler = Profiler(
+        args.profile and pathlib.Path(args.profile, "COLLECTION-" + fmt_time)
+    )
+    profiler.start()
+    # Keep the columns used by the summary, as the rows are written
+    if args.summary:
+        collector = SummaryCollector()
+        exports.exporters.append(collector)
+    # Execute program
+    main_collector(exports, log_file, args, username, password, profiler)
+    profiler.begin("export")
+    # Write the summary datasets after the collected datasets
+    if args.summary:
+        summary = summarise(collector, args.standard_users)
+        exports.open(SUMMARY_DATASETS)
+        for dataset, rows in summary.items():
+            exports.write_rows(dataset, rows)
+        # Display printout
+        print(
+            f"{Fore.CYAN}Hosts with non-standard local users: "
+            + str(len(summary["Summary_Users"]))
+        )
+        # Add to log file
+        log_file.write(
+            "Hosts with non-standard local users: "
+            + str(len(summary["Summary_Users"]))
+            + "\n"
+        )
+    # Close the exporters, which writes any rows they still hold
+    exported = exports.close()
+    # Print output locations
+    print(f"{Fore.CYAN}COLLECTION COMPLETE")
+    log_file.write("\n" + "COLLECTION COMPLETE \n")
+    if wb is not None:
+        # Save workbook
+        wb_path = pathlib.Path(args.workbook_dir, wb_name)
+        wb.save(str(wb_path))
+        print(f"{Fore.CYAN}Results located in Excel workbook: " + str(wb_path))
+        log_file.write("Results located in Excel workbook: " + str(wb_path) + "\n")
+    for path in exported:
+        print(f"{Fore.CYAN}Results exported to: " + str(path))
+        log_file.write("Results exported to: " + str(path) + "\n")
+    # Report the peak memory of the run, in bounded-memory mode
+    if args.bounded_memory or args.memory_budget:
+        report_memory(log_file)
+    # Report the time and peak memory of each phase, when profiling
+    report_profile(profiler, log_file)
+    # Close log file
+    log_file.close()
+
+
+def main(argv=None):
+    """
+    This function is the command line interface of collection-toolkit.
+    :param argv: A list of command line arguments. Defaults to sys.argv.
+    :return:
+    """
+    # Parse command line arguments
+    args = build_parser(
+        "Collect a summary of network devices into an Excel workbook.", day_one=False
+    ).parse_args(argv)
+    # Auto-reset colorama colours back after each print statement
+    init(autoreset=True)
+    username, password = read_credentials()
+    # Execute main function, for each customer at the same time when there are several
+    if args.customers:
+        # Exit with an error when any customer's run failed
+        if not run_customers(create_workbook, args, username, password):
+            sys.exit(1)
+    else:
+        create_workbook(args, username, password)
+
+
+if __name__ == "__main__":
+    main()
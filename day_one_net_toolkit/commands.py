@@ -0,0 +1,239 @@
+"""
+Raw CLI command collection, for the information which isn't available as a NAPALM
+getter, i.e. show inventory or show ip route summary.
+
+The commands of each platform are listed in inventory/commands.yaml. With --commands,
+day-one-toolkit.py runs them with nornir_netmiko, and the raw output is saved to commands/<hostname>/<command>.txt along
+with an index.json of the commands and their parsers. The output is then parsed with
+the ntc-templates TextFSM templates, or a ttp template, into <command>.json.
+
+Parsing is CPU-bound, so it is done in a process pool while the devices are being
+collected, rather than in the Nornir worker threads where it would hold the GIL away
+from the I/O.
+
+python -m day_one_net_toolkit.commands --benchmark commands
+"""
+
+# Import Modules
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import pathlib
+import time
+from ruamel.yaml import YAML
+
+# Default location of the per-platform command lists
+COMMANDS_FILE = "inventory/commands.yaml"
+# Default location of the raw and parsed output
+COMMAND_DIR = "commands"
+# The ntc-templates platform of each NAPALM platform, the same as nornir_netmiko uses
+TEXTFSM_PLATFORMS = {
+    "ios": "cisco_ios",
+    "eos": "arista_eos",
+    "nxos": "cisco_nxos",
+    "nxos_ssh": "cisco_nxos",
+    "iosxr": "cisco_xr",
+    "junos": "juniper_junos",
+}
+
+
+def load_command_matrix(commands_file=COMMANDS_FILE):
+    """
+    This function loads the per-platform command lists from a YAML file.
+    :param commands_file: The path to the commands YAML file.
+    :return: A dictionary of platform to a list of {"command", "parser", "template"}.
+    """
+    try:
+        with open(commands_file) as f:
+            matrix = YAML(typ="safe").load(f) or {}
+    except FileNotFoundError:
+        return {}
+    return {
+        platform: [
+            {
+                "command": entry["command"],
+                "parser": entry.get("parser", "textfsm"),
+                "template": entry.get("template"),
+            }
+            for entry in entries or []
+        ]
+        for platform, entries in matrix.items()
+    }
+
+
+def command_slug(command):
+    """
+    This function converts a command into a file name, i.e. show_ip_route_summary
+    """
+    return "_".join(command.split()).replace("/", "-").replace("|", "-")
+
+
+def collect_commands(task, commands, command_dir=COMMAND_DIR):
+    """
+    This function runs the CLI commands of a host and saves the raw output under the
+    commands/<hostname>/ directory.
+    :param task: The name of the task to be run.
+    :param commands: A list of {"command", "parser", "template"} dictionaries.
+    :param command_dir: The directory where the output is stored.
+    :return: A dictionary of the parse jobs, one for each command to be parsed, and the
+    commands which failed, i.e. {"jobs": [...], "failed": ["show inventory"]}
+    """
+    from nornir.core.exceptions import NornirSubTaskError
+    from nornir_netmiko.tasks import netmiko_send_command
+
+    host_dir = pathlib.Path(command_dir, task.host.name)
+    host_dir.mkdir(parents=True, exist_ok=True)
+    platform = TEXTFSM_PLATFORMS.get(task.host.platform, task.host.platform)
+    index = {"platform": platform, "commands": {}}
+    jobs = []
+    failed = []
+    for entry in commands:
+        slug = command_slug(entry["command"])
+        # A failed command only fails itself, the output of the others is still parsed
+        try:
+            output = task.run(
+                task=netmiko_send_command,
+                command_string=entry["command"],
+                name=entry["command"],
+            ).result
+        except NornirSubTaskError:
+            failed.append(entry["command"])
+            continue
+        (host_dir / (slug + ".txt")).write_text(output)
+        index["commands"][slug] = entry
+        if entry["parser"] != "none":
+            jobs.append(dict(entry, platform=platform, path=str(host_dir / slug)))
+    (host_dir / "index.json").write_text(json.dumps(index, indent=2))
+    return {"jobs": jobs, "failed": failed}
+
+
+def parse_output(job):
+    """
+    This function parses the raw output of a command and saves it as JSON. It runs in
+    a worker process.
+    :param job: A parse job, as returned by collect_commands under "jobs".
+    :return: A tuple of the job path, the number of records and an error or None.
+    """
+    try:
+        with open(job["path"] + ".txt") as f:
+            data = f.read()
+        if job["parser"] == "ttp":
+            from ttp import ttp
+
+            parser = ttp(data=data, template=job["template"])
+            parser.parse()
+            records = parser.result(structure="flat_list")
+        else:
+            from ntc_templates.parse import parse_output as textfsm_parse
+
+            records = textfsm_parse(
+                platform=job["platform"], command=job["command"], data=data
+            )
+    except Exception as e:  # nosec - a bad template or output only fails that command
+        return job["path"], 0, type(e).__name__ + ": " + str(e)
+    with open(job["path"] + ".json", "w") as f:
+        json.dump(records, f, indent=2)
+    return job["path"], len(records), None
+
+
+def saved_jobs(command_dir=COMMAND_DIR):
+    """
+    This function builds the parse jobs of the raw output already saved, from the
+    index of each host.
+    :param command_dir: The directory where the output is stored.
+    :return: A list of parse jobs.
+    """
+    jobs = []
+    for index_file in sorted(glob.glob(os.path.join(command_dir, "*", "index.json"))):
+        with open(index_file) as f:
+            index = json.load(f)
+        for slug, entry in index["commands"].items():
+            if entry["parser"] != "none":
+                path = os.path.join(os.path.dirname(index_file), slug)
+                jobs.append(dict(entry, platform=index["platform"], path=path))
+    return jobs
+
+
+def parse_all(jobs, workers=None, processes=True):
+    """
+    This function parses a list of jobs in a process pool, or a thread pool.
+    :param jobs: A list of parse jobs.
+    :param workers: The number of workers. Defaults to the number of CPUs.
+    :param processes: Whether to use processes rather than threads.
+    :return: A list of (path, records, error) tuples.
+    """
+    pool = (
+        concurrent.futures.ProcessPoolExecutor
+        if processes
+        else concurrent.futures.ThreadPoolExecutor
+    )
+    with pool(max_workers=workers) as executor:
+        return list(executor.map(parse_output, jobs, chunksize=8 if processes else 1))
+
+
+def benchmark(command_dir=COMMAND_DIR, workers=None, rounds=1):
+    """
+    This function compares the parse throughput of a process pool with parsing in
+    threads, as the Nornir workers would.
+    :param command_dir: The directory where the output is stored.
+    :param workers: The number of workers. Defaults to the number of CPUs.
+    :param rounds: The number of times each job is parsed.
+    :return: A list of (method, jobs per second, MB per second) tuples.
+    """
+    jobs = saved_jobs(command_dir) * rounds
+    size = sum(os.path.getsize(job["path"] + ".txt") for job in jobs)
+    results = []
+    for method, processes in [("threads", False), ("processes", True)]:
+        start = time.perf_counter()
+        parse_all(jobs, workers, processes)
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        results.append((method, len(jobs) / elapsed, size / 1e6 / elapsed))
+    return results
+
+
+def main():
+    """
+    This function is the command line interface to the raw command output.
+    :return:
+    """
+    parser = argparse.ArgumentParser(
+        description="Parse the raw CLI command output saved by day-one-toolkit.py."
+    )
+    parser.add_argument(
+        "--command-dir",
+        default=COMMAND_DIR,
+        help="The directory where the output is stored (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--parse", action="store_true", help="Parse the saved output again"
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Compare parsing in a process pool with parsing in threads",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=1,
+        help="The number of times the output is parsed in the benchmark",
+    )
+    parser.add_argument("--workers", type=int, help="The number of workers")
+    args = parser.parse_args()
+    if args.parse:
+        results = parse_all(saved_jobs(args.command_dir), args.workers)
+        for path, _, error in results:
+            if error:
+                print("PARSE FAILURE : " + path + " - " + error)
+        print("PARSED COMMANDS : " + str(len(results)))
+    if args.benchmark:
+        for method, jobs_rate, mb_rate in benchmark(
+            args.command_dir, args.workers, args.rounds
+        ):
+            print(f"{method} : {jobs_rate:.1f} commands/s - {mb_rate:.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
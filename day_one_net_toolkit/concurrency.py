@@ -0,0 +1,348 @@
+"""
+The number of device sessions open at once, set with --concurrency or tuned as the run
+goes with --adaptive-concurrency.
+
+The adaptive limit works like TCP congestion control (AIMD). The items completed are
+counted in windows of at least one item per session. At the end of a window in which
+the limit was reached, the limit goes up by one while the items are healthy. It is halved
+when too many items failed with a congestion error, i.e. a timeout, a reset or an
+authentication failure when the vty lines of a device or the AAA servers are exhausted,
+or when the items took much longer than usual.
+
+Every change of the limit is printed and logged. The final limit is saved to
+cache/concurrency.json, and is the starting limit of the next adaptive run.
+
+python day-one-toolkit.py --adaptive-concurrency --max-concurrency 50
+"""
+
+# Import Modules
+import contextlib
+import datetime as dt
+import json
+import os
+import pathlib
+import threading
+import time
+from colorama import Fore
+from day_one_net_toolkit.progress import failure_class
+from day_one_net_toolkit.timeouts import TRANSIENT_ERRORS
+
+# Default location of the tuned concurrency of the last adaptive run
+CONCURRENCY_FILE = "cache/concurrency.json"
+# Default number of sessions open at once, when the limit isn't tuned
+CONCURRENCY = 1
+# Default bounds of the adaptive limit
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 50
+# The limit is multiplied by this when the sessions are unhealthy
+DECREASE_FACTOR = 0.5
+# The share of items failing with a congestion error above which the limit is decreased
+ERROR_RATE = 0.1
+# The number of times their usual latency items may take before the limit is decreased
+LATENCY_FACTOR = 2.0
+# The minimum number of items in a window
+MIN_WINDOW = 4
+# Number of seconds between checks of the limit while hosts are waiting to start
+LIMIT_POLL_INTERVAL = 1.0
+# Exception classes raised when a device or the AAA servers refuse a login
+AUTH_ERRORS = {
+    "AuthenticationException",
+    "ConnectAuthError",
+    "NetmikoAuthenticationException",
+}
+# Exception classes which point to too many sessions being open at once
+CONGESTION_ERRORS = TRANSIENT_ERRORS | AUTH_ERRORS
+
+# The concurrency limiter of the run, or None when the sessions aren't limited
+_limiter = None
+
+
+def load_concurrency(concurrency_file=CONCURRENCY_FILE):
+    """
+    This function loads the concurrency tuned by the last adaptive run.
+    :param concurrency_file: The path of the saved concurrency.
+    :return: The tuned concurrency, or None if there is none.
+    """
+    try:
+        with open(concurrency_file) as f:
+            return int(json.load(f)["concurrency"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_concurrency(concurrency, concurrency_file=CONCURRENCY_FILE):
+    """
+    This function saves the tuned concurrency, replacing the file atomically.
+    :param concurrency: The tuned concurrency.
+    :param concurrency_file: The path of the saved concurrency.
+    :return:
+    """
+    pathlib.Path(concurrency_file).parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = concurrency_file + "." + str(os.getpid()) + ".tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(
+            {
+                "concurrency": concurrency,
+                "updated": dt.datetime.now().isoformat(timespec="seconds"),
+            },
+            f,
+            indent=2,
+        )
+    os.replace(tmp_file, concurrency_file)
+
+
+class ConcurrencyLimiter:
+    """
+    Limits the device sessions open at once. When adaptive, the limit is tuned from
+    the items recorded with record().
+    """
+
+    def __init__(
+        self,
+        limit=CONCURRENCY,
+        minimum=MIN_CONCURRENCY,
+        maximum=MAX_CONCURRENCY,
+        adaptive=False,
+        baselines=None,
+        log_file=None,
+    ):
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.limit = min(max(limit, self.minimum), self.maximum)
+        self.adaptive = adaptive
+        # The usual latency of each item, learnt from its first success when not given
+        self.baselines = dict(baselines or {})
+        self.log_file = log_file
+        self.in_flight = 0
+        self.peak = 0
+        self.decisions = []
+        # Whether sessions opened before a decrease are still over the new limit
+        self.draining = False
+        self.condition = threading.Condition()
+        self._new_window()
+
+    def _new_window(self):
+        self.items = 0
+        self.errors = 0
+        self.ratios = []
+        # Whether the limit was reached during the window, so raising it can help
+        self.saturated = self.in_flight >= self.limit
+
+    def _opened(self):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        if self.in_flight >= self.limit:
+            self.saturated = True
+
+    def try_acquire(self):
+        """
+        This function opens a session when the limit allows it, without waiting.
+        :return: True if the session was opened, otherwise False.
+        """
+        with self.condition:
+            if self.in_flight >= self.limit:
+                return False
+            self._opened()
+            return True
+
+    def acquire(self):
+        """
+        This function waits until a session can be opened within the limit.
+        :return:
+        """
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self._opened()
+
+    def release(self):
+        """
+        This function closes a session, so another can be opened.
+        :return:
+        """
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def record(self, key, seconds, error=None):
+        """
+        This function records a completed item, and tunes the limit at the end of
+        each window when adaptive.
+        :param key: The key of the item's usual latency, i.e. "junos/config"
+        :param seconds: The time the item took.
+        :param error: The exception class name when the item failed, otherwise None.
+        :return:
+        """
+        if not self.adaptive:
+            return
+        with self.condition:
+            # Items of the sessions opened before a decrease would decrease it again
+            if self.draining:
+                if self.in_flight > self.limit:
+                    return
+                self.draining = False
+                self._new_window()
+            self.items += 1
+            if error is not None:
+                self.errors += error in CONGESTION_ERRORS
+            else:
+                baseline = self.baselines.setdefault(key, seconds)
+                self.ratios.append(seconds / baseline if baseline > 0 else 1.0)
+            if self.items >= max(self.limit, MIN_WINDOW):
+                self._decide()
+
+    def _decide(self):
+        """
+        This function works out the limit at the end of a window.
+        """
+        error_rate = self.errors / self.items
+        ratios = sorted(self.ratios)
+        latency = ratios[len(ratios) // 2] if ratios else 1.0
+        old = self.limit
+        if error_rate > ERROR_RATE:
+            reason = "errors"
+            self.limit = max(self.minimum, int(self.limit * DECREASE_FACTOR))
+        elif latency > LATENCY_FACTOR:
+            reason = "latency"
+            self.limit = max(self.minimum, int(self.limit * DECREASE_FACTOR))
+        elif self.saturated:
+            reason = "healthy"
+            self.limit = min(self.maximum, self.limit + 1)
+        else:
+            reason = "not saturated"
+        line = (
+            f"CONCURRENCY : {old} -> {self.limit} - {reason} - {self.items} items"
+            f" - {self.errors} congestion errors - latency x{latency:.2f}"
+        )
+        self.decisions.append(
+            {
+                "time": round(time.time(), 3),
+                "old": old,
+                "new": self.limit,
+                "reason": reason,
+                "items": self.items,
+                "errors": self.errors,
+                "latency": round(latency, 2),
+            }
+        )
+        self._new_window()
+        self.draining = self.limit < old
+        self.condition.notify_all()
+        if self.limit == old:
+            return
+        # Display printout
+        colour = Fore.GREEN if self.limit > old else Fore.YELLOW
+        print(colour + line)
+        # Add to log file
+        if self.log_file is not None:
+            self.log_file.write(line + "\n")
+
+    def tuned(self):
+        """
+        This function works out the tuned concurrency of the run. Once the limit has
+        been decreased it goes up and down around what the devices can take, so the
+        average limit since the first decrease is used.
+        :return: The tuned concurrency.
+        """
+        with self.condition:
+            for i, decision in enumerate(self.decisions):
+                if decision["new"] < decision["old"]:
+                    steady = [later["new"] for later in self.decisions[i:]]
+                    return max(self.minimum, int(round(sum(steady) / len(steady))))
+            return self.limit
+
+    def report(self, log_file, concurrency_file=None):
+        """
+        This function prints the final limit of the run, and saves it when adaptive.
+        :param log_file: The log file of the run.
+        :param concurrency_file: The path the tuned concurrency is saved to.
+        :return:
+        """
+        changes = sum(decision["new"] != decision["old"] for decision in self.decisions)
+        if not self.adaptive:
+            line = (
+                "CONCURRENCY : "
+                + str(self.limit)
+                + " - peak in flight "
+                + str(self.peak)
+            )
+        else:
+            tuned = self.tuned()
+            line = (
+                "CONCURRENCY TUNED : "
+                + str(tuned)
+                + " - final limit "
+                + str(self.limit)
+                + " - peak in flight "
+                + str(self.peak)
+                + " - changes "
+                + str(changes)
+            )
+            if concurrency_file:
+                save_concurrency(tuned, concurrency_file)
+                line += " - saved to " + str(concurrency_file)
+        # Display printout
+        print(f"{Fore.CYAN}" + line)
+        # Add to log file
+        log_file.write(line + "\n")
+
+
+def build_limiter(args, log_file=None, baselines=None):
+    """
+    This function creates the concurrency limiter of a run from the command line
+    options. The adaptive limit starts from --concurrency when it is given, otherwise
+    from the concurrency tuned by the last adaptive run.
+    :param args: The parsed command line arguments.
+    :param log_file: The log file the decisions are written to.
+    :param baselines: The usual latency of each item, when they are known.
+    :return: A ConcurrencyLimiter object.
+    """
+    limit = args.concurrency
+    if limit is None and args.adaptive_concurrency:
+        limit = load_concurrency(args.concurrency_file)
+    limit = limit or CONCURRENCY
+    return ConcurrencyLimiter(
+        limit,
+        maximum=args.max_concurrency if args.adaptive_concurrency else limit,
+        adaptive=args.adaptive_concurrency,
+        baselines=baselines,
+        log_file=log_file,
+    )
+
+
+def set_limiter(limiter):
+    """
+    This function sets the concurrency limiter used by concurrency_slot.
+    :param limiter: The ConcurrencyLimiter object, or None for no limit.
+    :return:
+    """
+    global _limiter
+    _limiter = limiter
+
+
+@contextlib.contextmanager
+def concurrency_slot(key):
+    """
+    This function holds a session of the concurrency limit around a task, and records
+    how long it took and whether it failed. It can be used from the Nornir worker threads.
+    :param key: The key of the item's usual latency, i.e. "ios/facts"
+    :return:
+    """
+    limiter = _limiter
+    if limiter is None:
+        yield
+        return
+    limiter.acquire()
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as exc:
+        # Name the innermost exception, rather than the NornirSubTaskError
+        error = (
+            failure_class(exc.result) if hasattr(exc, "result") else type(exc).__name__
+        )
+        raise
+    finally:
+        limiter.release()
+        limiter.record(key, time.perf_counter() - start, error)
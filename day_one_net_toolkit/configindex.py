@@ -0,0 +1,487 @@
+"""
+An on-disk SQLite inverted index of the lines of every config collected, so questions
+like "which devices still have ip http server" are answered without reading every
+configs/<hostname>/<type>.txt of every run.
+
+Each distinct line is stored once, with a posting list of the tokens it contains. A
+config is stored once per distinct content, so a config unchanged since the last run
+only adds a row. day-one-toolkit.py adds each config to the index as it is collected,
+under the name of the run it is archived as, and archived runs can be added later.
+
+A literal search looks up the posting lists of its tokens and only checks the lines
+which contain all of them. The first and last tokens of a literal can be partial, so
+they are matched as a suffix and a prefix of the indexed tokens. A regex search does the
+same with the literal fragments the regex requires, then checks the regex against the
+remaining lines.
+
+python -m day_one_net_toolkit.configindex "ip http server"
+python -m day_one_net_toolkit.configindex --regex "access-group \\S+ in"
+"""
+
+# Import Modules
+import argparse
+import hashlib
+import os
+import pathlib
+import re
+import sqlite3
+import time
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse  # Python 3.10 and earlier
+
+# Default location of the config index
+CONFIG_INDEX_FILE = "indexes/configs.db"
+# Default configs directory
+CONFIG_DIR = "configs"
+# The characters of a token, so addresses and interface names are a single token
+TOKEN_RE = re.compile(r"[\w.:/-]+")
+# The number of values in each IN (...) list, below the SQLite variable limit
+CHUNK_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS texts (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS vocab (
+    id INTEGER PRIMARY KEY,
+    token TEXT NOT NULL UNIQUE,
+    rev TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS vocab_rev ON vocab (rev);
+CREATE TABLE IF NOT EXISTS postings (
+    token INTEGER NOT NULL,
+    text INTEGER NOT NULL,
+    PRIMARY KEY (token, text)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS contents (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS content_lines (
+    content INTEGER NOT NULL,
+    lineno INTEGER NOT NULL,
+    text INTEGER NOT NULL,
+    PRIMARY KEY (content, lineno)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS content_lines_text ON content_lines (text);
+CREATE TABLE IF NOT EXISTS configs (
+    run TEXT NOT NULL,
+    host TEXT NOT NULL,
+    config TEXT NOT NULL,
+    content INTEGER NOT NULL,
+    PRIMARY KEY (run, host, config)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS configs_content ON configs (content);
+CREATE TABLE IF NOT EXISTS latest (
+    host TEXT NOT NULL,
+    config TEXT NOT NULL,
+    run TEXT NOT NULL,
+    PRIMARY KEY (host, config)
+) WITHOUT ROWID;
+"""
+
+
+def tokenize(text):
+    """
+    This function splits a line into its lower case tokens.
+    i.e. " ip address 10.0.0.1 255.255.255.0" becomes ["ip", "address", "10.0.0.1", ...]
+    :param text: The line.
+    :return: A set of the tokens.
+    """
+    return set(TOKEN_RE.findall(text.lower()))
+
+
+def chunks(values, size=CHUNK_SIZE):
+    """
+    This function splits a list into chunks, for IN (...) lists.
+    """
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def regex_literals(pattern, flags=0):
+    """
+    This function returns the literal fragments every match of a regex contains, so
+    the lines without them can be skipped. Only the top level of the regex is used,
+    and a regex with a top level alternation has no fragments.
+    :param pattern: The regex.
+    :param flags: The re flags of the regex.
+    :return: A list of the literal fragments.
+    """
+    fragments = []
+    current = ""
+    for op, value in sre_parse.parse(pattern, flags):
+        if op == sre_parse.LITERAL:
+            current += chr(value)
+            continue
+        if op == sre_parse.BRANCH:
+            return []
+        if current:
+            fragments.append(current)
+        current = ""
+    if current:
+        fragments.append(current)
+    return fragments
+
+
+def token_conditions(literal):
+    """
+    This function works out how each token of a literal is matched against the indexed
+    tokens. A literal starting or ending inside a token only contains part of it.
+    :param literal: The lower case literal.
+    :return: A list of (mode, token) tuples, where mode is exact, prefix, suffix or infix.
+    """
+    matches = list(TOKEN_RE.finditer(literal))
+    conditions = []
+    for match in matches:
+        starts_inside = match.start() == 0
+        ends_inside = match.end() == len(literal)
+        if starts_inside and ends_inside:
+            mode = "infix"
+        elif starts_inside:
+            mode = "suffix"
+        elif ends_inside:
+            mode = "prefix"
+        else:
+            mode = "exact"
+        conditions.append((mode, match.group()))
+    return conditions
+
+
+class ConfigIndex:
+    """
+    A SQLite inverted index of config lines. Each config is added in a single
+    transaction, so the index is always consistent between configs.
+    """
+
+    def __init__(self, path=CONFIG_INDEX_FILE):
+        # Create the index directory and/or check that it exists
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        # WAL lets searches run while a collection run is updating the index
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def ids(self, table, column, values):
+        """
+        This function returns the ids of the values already in the texts or vocab table.
+        :return: A dictionary of value to id.
+        """
+        found = {}
+        for chunk in chunks(values):
+            found.update(
+                self.conn.execute(
+                    f"SELECT {column}, id FROM {table} WHERE {column} IN "  # nosec
+                    f"({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        return found
+
+    def add_texts(self, lines):
+        """
+        This function adds the lines which aren't indexed yet, with their postings.
+        :param lines: A set of lines.
+        :return: A dictionary of line to text id.
+        """
+        text_ids = self.ids("texts", "text", lines)
+        new = [line for line in lines if line not in text_ids]
+        if not new:
+            return text_ids
+        self.conn.executemany(
+            "INSERT INTO texts (text) VALUES (?)", [(line,) for line in new]
+        )
+        new_ids = self.ids("texts", "text", new)
+        text_ids.update(new_ids)
+        tokens = {line: tokenize(line) for line in new}
+        vocabulary = set().union(*tokens.values())
+        token_ids = self.ids("vocab", "token", vocabulary)
+        self.conn.executemany(
+            "INSERT INTO vocab (token, rev) VALUES (?, ?)",
+            [(token, token[::-1]) for token in vocabulary if token not in token_ids],
+        )
+        token_ids = self.ids("vocab", "token", vocabulary)
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO postings VALUES (?, ?)",
+            [
+                (token_ids[token], new_ids[line])
+                for line, line_tokens in tokens.items()
+                for token in line_tokens
+            ],
+        )
+        return text_ids
+
+    def add_config(self, run, hostname, config_type, content):
+        """
+        This function adds a config to the index, as part of a run.
+        :param run: The name of the run, i.e. RUN-2019-07-01-13-04-59
+        :param hostname: The name of the host in the inventory.
+        :param config_type: The config type, i.e. running
+        :param content: The config text.
+        :return: The number of lines added, or 0 if the content was already indexed.
+        """
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        added = 0
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT id FROM contents WHERE hash = ?", (digest,)
+            ).fetchone()
+            if row is None:
+                content_id = self.conn.execute(
+                    "INSERT INTO contents (hash) VALUES (?)", (digest,)
+                ).lastrowid
+                # Blank lines are left out, the line numbers are those of the file
+                lines = [
+                    (lineno, line.rstrip())
+                    for lineno, line in enumerate(content.splitlines(), 1)
+                    if line.strip()
+                ]
+                text_ids = self.add_texts({line for _, line in lines})
+                self.conn.executemany(
+                    "INSERT INTO content_lines VALUES (?, ?, ?)",
+                    [(content_id, lineno, text_ids[line]) for lineno, line in lines],
+                )
+                added = len(lines)
+            else:
+                content_id = row[0]
+            self.conn.execute(
+                "INSERT OR REPLACE INTO configs VALUES (?, ?, ?, ?)",
+                (run, hostname, config_type, content_id),
+            )
+            # Run names sort by time, so the latest run is the greatest
+            self.conn.execute(
+                """
+                INSERT INTO latest VALUES (?, ?, ?)
+                ON CONFLICT (host, config) DO UPDATE SET run = excluded.run
+                WHERE excluded.run >= latest.run
+                """,
+                (hostname, config_type, run),
+            )
+        return added
+
+    def add_directory(self, run, config_dir=CONFIG_DIR):
+        """
+        This function adds the configs of a configs directory to the index, as a run.
+        :param run: The name of the run.
+        :param config_dir: The directory where the configs are stored.
+        :return: The number of configs added.
+        """
+        count = 0
+        for host_entry in sorted(os.scandir(config_dir), key=lambda entry: entry.name):
+            if not host_entry.is_dir():
+                continue
+            for entry in sorted(os.scandir(host_entry.path), key=lambda e: e.name):
+                if entry.name.endswith(".txt"):
+                    with open(entry.path, errors="replace") as f:
+                        content = f.read()
+                    self.add_config(run, host_entry.name, entry.name[:-4], content)
+                    count += 1
+        return count
+
+    def add_archive(self, archive_dir):
+        """
+        This function adds the archived runs which aren't indexed yet.
+        :param archive_dir: The directory where the archive is stored.
+        :return: A list of the runs added.
+        """
+        from day_one_net_toolkit.archive import ArchivedRun, run_files
+
+        indexed = {
+            row[0] for row in self.conn.execute("SELECT DISTINCT run FROM configs")
+        }
+        added = []
+        for run in run_files(archive_dir):
+            if run in indexed:
+                continue
+            archived = ArchivedRun(archive_dir, run)
+            with open(archived.path, "rb") as f:
+                for hostname, config_type in archived.entries():
+                    content = archived.read(hostname, config_type, f)
+                    self.add_config(
+                        run, hostname, config_type, content.decode(errors="replace")
+                    )
+            added.append(run)
+        return added
+
+    def token_texts(self, mode, token):
+        """
+        This function returns the SQL selecting the lines which contain a token.
+        :return: A tuple of the SQL and its parameters.
+        """
+        if mode == "exact":
+            where, params = "token = ?", [token]
+        elif mode == "prefix":
+            where, params = "token >= ? AND token < ?", [token, token + "\uffff"]
+        elif mode == "suffix":
+            rev = token[::-1]
+            where, params = "rev >= ? AND rev < ?", [rev, rev + "\uffff"]
+        else:
+            where, params = "instr(token, ?) > 0", [token]
+        sql = (
+            "SELECT text FROM postings WHERE token IN "  # nosec - no values in the SQL
+            "(SELECT id FROM vocab WHERE " + where + ")"
+        )
+        return sql, params
+
+    def candidates(self, literals):
+        """
+        This function returns the lines which contain every token of the literals.
+        :param literals: A list of lower case literals.
+        :return: A list of (text id, line) tuples, or every line when there are no tokens.
+        """
+        selects = []
+        params = []
+        for literal in literals:
+            for mode, token in token_conditions(literal):
+                sql, token_params = self.token_texts(mode, token)
+                selects.append(sql)
+                params += token_params
+        if not selects:
+            return self.conn.execute("SELECT id, text FROM texts").fetchall()
+        return self.conn.execute(
+            "SELECT id, text FROM texts WHERE id IN ("  # nosec - no values in the SQL
+            + " INTERSECT ".join(selects)
+            + ")",
+            params,
+        ).fetchall()
+
+    def search(
+        self,
+        query,
+        regex=False,
+        ignore_case=False,
+        run=None,
+        all_runs=False,
+        limit=None,
+    ):
+        """
+        This function searches the indexed configs.
+        :param query: The literal, or regex, to search for.
+        :param regex: Whether the query is a regex.
+        :param ignore_case: Whether to ignore case.
+        :param run: Only search this run. Defaults to the latest run of each config.
+        :param all_runs: Whether to search every run.
+        :param limit: The maximum number of hits to return.
+        :return: A list of (host, config type, run, line number, line) tuples.
+        """
+        if regex:
+            flags = re.IGNORECASE if ignore_case else 0
+            compiled = re.compile(query, flags)
+            literals = [literal.lower() for literal in regex_literals(query, flags)]
+
+            def matches(line):
+                return compiled.search(line) is not None
+
+        else:
+            literals = [query.lower()]
+            needle = query.lower() if ignore_case else query
+
+            def matches(line):
+                return needle in (line.lower() if ignore_case else line)
+
+        matched = [
+            (text_id,) for text_id, line in self.candidates(literals) if matches(line)
+        ]
+        self.conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS matched (id INTEGER PRIMARY KEY)"
+        )
+        self.conn.execute("DELETE FROM matched")
+        self.conn.executemany("INSERT INTO matched VALUES (?)", matched)
+        sql = """
+            SELECT c.host, c.config, c.run, l.lineno, t.text
+            FROM matched m
+            JOIN content_lines l ON l.text = m.id
+            JOIN configs c ON c.content = l.content
+            JOIN texts t ON t.id = m.id
+        """
+        params = []
+        if run:
+            sql += " WHERE c.run = ?"
+            params.append(run)
+        elif not all_runs:
+            sql += (
+                " JOIN latest ON latest.host = c.host AND latest.config = c.config"
+                " AND latest.run = c.run"
+            )
+        sql += " ORDER BY c.host, c.config, c.run, l.lineno"
+        if limit:
+            sql += " LIMIT " + str(int(limit))
+        return self.conn.execute(sql, params).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    """
+    This function is the command line interface to the config index.
+    :return:
+    """
+    parser = argparse.ArgumentParser(
+        description="Search the configs collected by day-one-toolkit.py."
+    )
+    parser.add_argument("query", nargs="*", help="The text, or regex, to search for")
+    parser.add_argument(
+        "--index",
+        default=CONFIG_INDEX_FILE,
+        help="The config index file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--regex", action="store_true", help="The query is a regular expression"
+    )
+    parser.add_argument(
+        "-i", "--ignore-case", action="store_true", help="Ignore case when matching"
+    )
+    parser.add_argument(
+        "--run", help="Only search this run, i.e. RUN-2019-07-01-13-04-59"
+    )
+    parser.add_argument(
+        "--all-runs",
+        action="store_true",
+        help="Search every run, instead of the latest config of each host",
+    )
+    parser.add_argument("--limit", type=int, help="The maximum number of hits to show")
+    parser.add_argument(
+        "--add-configs",
+        metavar="RUN",
+        help="Add the configs directory to the index as this run",
+    )
+    parser.add_argument(
+        "--configs-dir",
+        default=CONFIG_DIR,
+        help="The configs directory added by --add-configs (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--add-archive",
+        metavar="DIR",
+        help="Add the runs of a config archive which aren't indexed yet",
+    )
+    args = parser.parse_args()
+    index = ConfigIndex(args.index)
+    if args.add_configs:
+        count = index.add_directory(args.add_configs, args.configs_dir)
+        print("Configs indexed: " + str(count))
+    if args.add_archive:
+        for run in index.add_archive(args.add_archive):
+            print("Run indexed: " + run)
+    for query in args.query:
+        start = time.perf_counter()
+        hits = index.search(
+            query, args.regex, args.ignore_case, args.run, args.all_runs, args.limit
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        for host, config_type, run, lineno, line in hits:
+            print(f"{host} {config_type} {run}:{lineno}: {line}")
+        hosts = len({hit[0] for hit in hits})
+        print(f"Hits: {len(hits)} - hosts: {hosts} - {elapsed:.1f} ms")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
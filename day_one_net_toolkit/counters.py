@@ -0,0 +1,350 @@
+"""
+A compact history of the interfaces_counters getter, so utilisation and error rates
+can be worked out across collection runs.
+
+Each host has a directory under history/ holding:
+
+interfaces.json - The interface names, in column order.
+timestamps.bin - One float64 timestamp per sample.
+counters.bin - One uint64 row per sample of (interfaces x COUNTER_FIELDS).
+
+Samples are appended to the binary files, which are memory mapped as numpy arrays
+when read, so deltas and rates are computed for every interface and sample at once.
+numpy is only imported when the history is used, as it is slow to import.
+
+It can also be run from the command line:
+
+python -m day_one_net_toolkit.counters --import facts --top 10
+"""
+
+# Import Modules
+import argparse
+import json
+import os
+import pathlib
+import time
+from day_one_net_toolkit.factstore import FACT_DIR, fact_file, load_getter
+
+# Default location of the counter history
+HISTORY_DIR = "history"
+# The interfaces_counters fields stored, in column order
+COUNTER_FIELDS = (
+    "tx_errors",
+    "rx_errors",
+    "tx_discards",
+    "rx_discards",
+    "tx_octets",
+    "rx_octets",
+    "tx_unicast_packets",
+    "rx_unicast_packets",
+    "tx_multicast_packets",
+    "rx_multicast_packets",
+    "tx_broadcast_packets",
+    "rx_broadcast_packets",
+)
+# Stored for counters which are missing, or which the platform reports as -1
+MISSING = (1 << 64) - 1
+# The range of 32-bit counters, which wrap far more often than 64-bit counters
+WRAP_32 = 1 << 32
+
+
+class CounterHistory:
+    """
+    The counter history of a single host. Interfaces seen for the first time are
+    added as new columns, with earlier samples marked as missing.
+    """
+
+    def __init__(self, history_dir, hostname):
+        self.path = pathlib.Path(history_dir) / hostname
+        self.interfaces = []
+        interfaces_file = self.path / "interfaces.json"
+        if interfaces_file.exists():
+            with open(interfaces_file) as f:
+                self.interfaces = json.load(f)
+
+    def _file(self, name):
+        return str(self.path / name)
+
+    def _save_interfaces(self):
+        tmp_file = self._file("interfaces.json.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(self.interfaces, f)
+        os.replace(tmp_file, self._file("interfaces.json"))
+
+    def _add_interfaces(self, names):
+        """
+        This function adds new interface columns, rewriting the counter file with the
+        new columns marked as missing in the earlier samples. This only happens when
+        an interface is seen for the first time.
+        :param names: A list of the new interface names.
+        :return:
+        """
+        import numpy as np
+
+        counters = self.counters()
+        old_width = len(self.interfaces)
+        width = old_width + len(names)
+        grown = np.full(
+            (counters.shape[0], width, len(COUNTER_FIELDS)), MISSING, dtype=np.uint64
+        )
+        grown[:, :old_width] = counters
+        # The interface list is saved between writing the grown counters and moving
+        # them into place, so an interrupted update is finished or undone by _recover()
+        tmp_file = self._file("counters.bin.tmp")
+        grown.tofile(tmp_file)
+        del counters
+        self.interfaces.extend(names)
+        self._save_interfaces()
+        os.replace(tmp_file, self._file("counters.bin"))
+
+    def _recover(self):
+        """
+        This function finishes or undoes an interrupted _add_interfaces, so the counter
+        columns always match the interface list. The grown counters are moved into place
+        when the interface list was saved with the new interfaces, otherwise removed.
+        :return:
+        """
+        tmp_file = self._file("counters.bin.tmp")
+        if not os.path.exists(tmp_file):
+            return
+        row_size = len(self.interfaces) * len(COUNTER_FIELDS) * 8
+        if os.path.getsize(tmp_file) == self._sample_count() * row_size:
+            os.replace(tmp_file, self._file("counters.bin"))
+        else:
+            os.remove(tmp_file)
+
+    def append(self, interfaces_counters, timestamp=None):
+        """
+        This function appends a sample of the interfaces_counters getter.
+        :param interfaces_counters: The result of the interfaces_counters getter.
+        :param timestamp: The time the sample was taken. Defaults to now.
+        :return: The number of samples stored.
+        """
+        import numpy as np
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._recover()
+        self._truncate()
+        interfaces_counters = interfaces_counters or {}
+        known = set(self.interfaces)
+        new = [name for name in interfaces_counters if name not in known]
+        if new:
+            self._add_interfaces(new)
+        columns = {name: column for column, name in enumerate(self.interfaces)}
+        row = np.full(
+            (len(self.interfaces), len(COUNTER_FIELDS)), MISSING, dtype=np.uint64
+        )
+        for name, counters in interfaces_counters.items():
+            row[columns[name]] = [
+                counters.get(field, -1) if counters.get(field, -1) >= 0 else MISSING
+                for field in COUNTER_FIELDS
+            ]
+        # The counters are written before the timestamp, so a partial write is ignored
+        with open(self._file("counters.bin"), "ab") as f:
+            row.tofile(f)
+        with open(self._file("timestamps.bin"), "ab") as f:
+            np.array([timestamp or time.time()], dtype="float64").tofile(f)
+        return len(self.timestamps())
+
+    def _truncate(self):
+        """
+        This function removes any partially written sample, i.e. from an interrupted run,
+        so the counter rows and timestamps stay aligned.
+        :return:
+        """
+        samples = len(self.timestamps())
+        row_size = len(self.interfaces) * len(COUNTER_FIELDS) * 8
+        for name, size in [("timestamps.bin", 8), ("counters.bin", row_size)]:
+            path = self._file(name)
+            if os.path.exists(path) and os.path.getsize(path) > samples * size:
+                os.truncate(path, samples * size)
+
+    def _read(self, name, dtype):
+        import numpy as np
+
+        path = self._file(name)
+        # Only map whole values, as the end of the file may be partially written
+        count = (
+            os.path.getsize(path) // np.dtype(dtype).itemsize
+            if os.path.exists(path)
+            else 0
+        )
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+    def timestamps(self):
+        """
+        This function returns the timestamps of the complete samples.
+        :return: A float64 array of shape (samples,).
+        """
+        width = len(self.interfaces) * len(COUNTER_FIELDS)
+        timestamps = self._read("timestamps.bin", "float64")
+        if width == 0:
+            return timestamps[:0]
+        samples = len(self._read("counters.bin", "uint64")) // width
+        return timestamps[: min(len(timestamps), samples)]
+
+    def counters(self):
+        """
+        This function returns the complete samples as a memory mapped array.
+        :return: A uint64 array of shape (samples, interfaces, fields).
+        """
+        shape = (len(self.interfaces), len(COUNTER_FIELDS))
+        counters = self._read("counters.bin", "uint64")
+        if shape[0] == 0:
+            return counters[:0].reshape((0,) + shape)
+        samples = min(len(counters) // (shape[0] * shape[1]), self._sample_count())
+        return counters[: samples * shape[0] * shape[1]].reshape((samples,) + shape)
+
+    def _sample_count(self):
+        return len(self._read("timestamps.bin", "float64"))
+
+    def rates(self, last=None):
+        """
+        This function returns the per second rate of every counter between samples.
+        :param last: Only use the last number of samples. Defaults to every sample.
+        :return: A tuple of the interval end timestamps, shape (samples - 1,), and the
+        rates as a float64 array of shape (samples - 1, interfaces, fields).
+        """
+        import numpy as np
+
+        timestamps = self.timestamps()
+        counters = self.counters()
+        if last:
+            timestamps, counters = timestamps[-last:], counters[-last:]
+        interval = np.diff(timestamps)
+        deltas = counter_deltas(counters)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = deltas / interval[:, None, None]
+        rates[~np.isfinite(rates)] = np.nan
+        return timestamps[1:], rates
+
+
+def counter_deltas(counters):
+    """
+    This function returns the increase of every counter between consecutive samples.
+
+    A counter which goes backwards has either wrapped or been reset. A value which was
+    below 2^32 and would only need to wrap by less than 2^31 is treated as a 32-bit
+    wrap. Anything else is treated as a reset, i.e. a reload or "clear counters", and
+    the increase is the new value. Missing counters give NaN.
+    :param counters: A uint64 array of shape (samples, interfaces, fields).
+    :return: A float64 array of shape (samples - 1, interfaces, fields).
+    """
+    import numpy as np
+
+    previous, current = counters[:-1], counters[1:]
+    missing = (previous == MISSING) | (current == MISSING)
+    backwards = current < previous
+    # uint64 subtraction is modular, so forward deltas and 64-bit wraps are exact
+    deltas = current - previous
+    wrapped = current + (np.uint64(WRAP_32) - previous)
+    wrap_32 = backwards & (previous < WRAP_32) & (wrapped < WRAP_32 // 2)
+    deltas = np.where(wrap_32, wrapped, np.where(backwards, current, deltas))
+    deltas = deltas.astype("float64")
+    deltas[missing] = np.nan
+    return deltas
+
+
+def host_histories(history_dir=HISTORY_DIR):
+    """
+    This function yields the counter history of every host in the history directory.
+    :param history_dir: The directory where the counter history is stored.
+    :return: A generator of (hostname, CounterHistory) tuples.
+    """
+    if not os.path.isdir(history_dir):
+        return
+    for entry in sorted(os.scandir(history_dir), key=lambda entry: entry.name):
+        if entry.is_dir():
+            yield entry.name, CounterHistory(history_dir, entry.name)
+
+
+def import_facts(history_dir=HISTORY_DIR, fact_dir=FACT_DIR):
+    """
+    This function appends the interfaces_counters.json file of every host in a facts
+    directory to the history, using the file modification time as the timestamp.
+    Files which are not newer than the last sample are skipped.
+    :param history_dir: The directory where the counter history is stored.
+    :param fact_dir: The directory where the getters are stored.
+    :return: The number of samples appended.
+    """
+    count = 0
+    for entry in sorted(os.scandir(fact_dir), key=lambda entry: entry.name):
+        if not entry.is_dir():
+            continue
+        path = fact_file(fact_dir, entry.name, "interfaces_counters")
+        result = load_getter(fact_dir, entry.name, "interfaces_counters")
+        if result is None:
+            continue
+        timestamp = os.stat(path).st_mtime
+        history = CounterHistory(history_dir, entry.name)
+        timestamps = history.timestamps()
+        if len(timestamps) and timestamps[-1] >= timestamp:
+            continue
+        history.append(result, timestamp)
+        count += 1
+    return count
+
+
+def top_rates(history_dir=HISTORY_DIR, fields=("rx_octets", "tx_octets"), top=10):
+    """
+    This function returns the interfaces with the highest rate in the latest interval.
+    :param history_dir: The directory where the counter history is stored.
+    :param fields: The counter fields which are added together to rank interfaces.
+    :param top: The number of interfaces to return.
+    :return: A list of (rate per second, hostname, interface) tuples, highest first.
+    """
+    import numpy as np
+
+    columns = [COUNTER_FIELDS.index(field) for field in fields]
+    ranked = []
+    for hostname, history in host_histories(history_dir):
+        _, rates = history.rates(last=2)
+        if not len(rates):
+            continue
+        latest = np.nansum(rates[-1][:, columns], axis=1)
+        for column in np.argsort(latest)[::-1][:top]:
+            ranked.append((float(latest[column]), hostname, history.interfaces[column]))
+    return sorted(ranked, reverse=True)[:top]
+
+
+def main():
+    """
+    This function is the command line interface to the counter history.
+    :return:
+    """
+    parser = argparse.ArgumentParser(
+        description="Store interface counters over time and show interface rates."
+    )
+    parser.add_argument(
+        "--history-dir",
+        default=HISTORY_DIR,
+        help="The counter history directory (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--import",
+        dest="import_dir",
+        metavar="FACTS_DIR",
+        help="Append the interfaces_counters of every host in a facts directory",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="The number of busiest and most errored interfaces to show",
+    )
+    args = parser.parse_args()
+    if args.import_dir:
+        count = import_facts(args.history_dir, args.import_dir)
+        print("Samples appended: " + str(count))
+    for rate, hostname, interface in top_rates(args.history_dir, top=args.top):
+        print(f"BUSIEST : {hostname} {interface} - {rate * 8 / 1e6:.3f} Mbps")
+    errors = ("rx_errors", "tx_errors", "rx_discards", "tx_discards")
+    for rate, hostname, interface in top_rates(args.history_dir, errors, args.top):
+        if rate > 0:
+            print(f"ERRORS : {hostname} {interface} - {rate:.3f} per second")
+
+
+if __name__ == "__main__":
+    main()
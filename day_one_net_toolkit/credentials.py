@@ -0,0 +1,49 @@
+"""
+Functions used to read the default device credentials from environmental variables.
+"""
+
+# Import Modules
+import os
+from colorama import Fore
+
+
+def read_credential(variable):
+    """
+    This function reads a credential from an environmental variable and prints whether
+    it has been set. It is not mandatory, but recommended, to set the variable.
+    :param variable: The name of the environmental variable, i.e. NORNIR_DEFAULT_USERNAME
+    :return: The value of the variable, or an empty string if it hasn't been set.
+    """
+    if os.environ.get(variable) is not None:
+        print(f"{Fore.CYAN}Environmental variable {variable} is set")
+        return os.environ[variable]
+    # Print warning
+    print(
+        Fore.YELLOW
+        + "*" * 15
+        + f" WARNING: Environmental variable `{variable}` not set. "
+        + "*" * 15
+    )
+    # Print supplementary warning
+    print(
+        Fore.MAGENTA
+        + "*" * 15
+        + f" NOTIFICATION: Environmental variable `{variable}` now set to ''."
+        + "This may cause all authentication to fail. "
+        + "*" * 15
+    )
+    # Return an empty string, so that the code does not error out.
+    # NOTE: It's valid form to use the groups.yaml and hosts.yaml file(s) to
+    # store credentials so this will not raise an exception
+    return ""
+
+
+def read_credentials():
+    """
+    This function reads the default username and password used for the Nornir inventory.
+    :return: A tuple of the username and password.
+    """
+    return (
+        read_credential("NORNIR_DEFAULT_USERNAME"),
+        read_credential("NORNIR_DEFAULT_PASSWORD"),
+    )
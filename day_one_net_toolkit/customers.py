@@ -0,0 +1,264 @@
+"""
+Runs of several customers in one invocation, sharing one connection budget.
+
+Each customer profile is a directory laid out like the toolkit's working directory, with
+its own inventory/hosts.yaml, groups.yaml and defaults.yaml. Each customer is run in its
+own process, with the paths of the run resolved against its directory, so the logs,
+configs, facts, caches and workbooks of each customer are kept apart, i.e.
+customers/acme/logs/ and customers/acme/Collection-acme-<time>.xlsx. The data files,
+i.e. inventory/getters.yaml, are shared by every customer unless a customer has its own
+copy in its directory.
+
+The number of device sessions open at once across every customer is limited by the
+connection budget. When sessions are waiting, a free session is given to the customer
+with the fewest sessions open, so a customer with a large inventory can't starve the
+others. Sessions are taken for each host by day-one-toolkit.py, and for each getter of a
+host by collection-toolkit.py.
+
+python day-one-toolkit.py --customer acme --customer globex=/srv/globex --connection-budget 20
+"""
+
+# Import Modules
+import argparse
+import collections
+import contextlib
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from multiprocessing.managers import BaseManager
+from colorama import Fore
+
+# Default directory of the customer profiles, as customers/<name>/
+CUSTOMER_DIR = "customers"
+# Default number of device sessions open at once across every customer
+CONNECTION_BUDGET = 20
+# The options with the files and directories each customer keeps in its own directory
+CUSTOMER_PATHS = [
+    "archive_dir",
+    "capability_cache",
+    "command_dir",
+    "concurrency_file",
+    "config_index",
+    "configs_dir",
+    "endpoint_index",
+    "export_dir",
+    "facts_dir",
+    "history_dir",
+    "inventory_cache",
+    "latency_file",
+    "log_dir",
+    "manifest_dir",
+    "profile",
+    "status_file",
+    "workbook_dir",
+]
+# The options with the data files every customer shares, unless it has its own copy
+SHARED_FILES = ["getters_file", "commands_file", "health_file", "schedule"]
+
+# The budget and customer name of the run, or None when not a multi-customer run
+_budget = None
+_customer = None
+
+
+class FairShareBudget:
+    """
+    A budget of sessions shared between customers. Waiting sessions are granted to the
+    customer with the fewest open sessions, and in the order they asked otherwise.
+    """
+
+    def __init__(self, limit=CONNECTION_BUDGET):
+        self.limit = limit
+        self.open = collections.Counter()
+        self.granted = collections.Counter()
+        self.waited = collections.Counter()
+        self.waiting = []
+        self.tickets = itertools.count()
+        self.condition = threading.Condition()
+
+    def _next(self):
+        """
+        This function returns the ticket of the waiting session which is granted next.
+        """
+        return min(
+            self.waiting, key=lambda waiting: (self.open[waiting[0]], waiting[1])
+        )[1]
+
+    def acquire(self, customer):
+        """
+        This function waits until a session can be opened for a customer.
+        :param customer: The name of the customer.
+        :return:
+        """
+        start = time.monotonic()
+        with self.condition:
+            entry = (customer, next(self.tickets))
+            self.waiting.append(entry)
+            while sum(self.open.values()) >= self.limit or self._next() != entry[1]:
+                self.condition.wait()
+            self.waiting.remove(entry)
+            self.open[customer] += 1
+            self.granted[customer] += 1
+            self.waited[customer] += time.monotonic() - start
+            # Let the next waiting session check whether it can go too
+            self.condition.notify_all()
+
+    def release(self, customer):
+        """
+        This function closes a session of a customer, so it can be granted to another.
+        :param customer: The name of the customer.
+        :return:
+        """
+        with self.condition:
+            self.open[customer] -= 1
+            self.condition.notify_all()
+
+    def stats(self):
+        """
+        This function returns the sessions granted to each customer.
+        :return: A dictionary of customer to {"sessions", "waited"} in seconds.
+        """
+        with self.condition:
+            return {
+                customer: {
+                    "sessions": self.granted[customer],
+                    "waited": round(self.waited[customer], 1),
+                }
+                for customer in self.granted
+            }
+
+
+class BudgetManager(BaseManager):
+    """
+    Serves the shared FairShareBudget to the customer processes.
+    """
+
+
+BudgetManager.register("FairShareBudget", FairShareBudget)
+
+
+def acquire_slot():
+    """
+    This function takes a session from the shared budget, when this is a customer
+    process of a multi-customer run. Otherwise it does nothing.
+    """
+    if _budget is not None:
+        _budget.acquire(_customer)
+
+
+def release_slot():
+    """
+    This function gives a session taken by acquire_slot back to the shared budget.
+    """
+    if _budget is not None:
+        _budget.release(_customer)
+
+
+@contextlib.contextmanager
+def connection_slot():
+    """
+    This function holds a session from the shared budget around a block. It can be
+    used from the Nornir worker threads.
+    """
+    acquire_slot()
+    try:
+        yield
+    finally:
+        release_slot()
+
+
+def customer_args(args, name, directory):
+    """
+    This function returns the arguments of a customer's run, with its paths resolved
+    against the directory of the customer profile. Absolute paths are left as they are.
+    :param args: The parsed command line arguments.
+    :param name: The name of the customer.
+    :param directory: The directory of the customer profile.
+    :return: A copy of the arguments for the customer.
+    """
+    args = argparse.Namespace(**vars(args))
+    args.customers = None
+    args.customer_name = name
+    # The inventory and the outputs of the run are always the customer's own
+    if getattr(args, "inventory_files", None):
+        args.inventory_files = {
+            key: os.path.join(directory, path)
+            for key, path in args.inventory_files.items()
+        }
+    for option in CUSTOMER_PATHS:
+        path = getattr(args, option, None)
+        # Paths which aren't set, or are '' to disable an output, are left as they are
+        if path:
+            setattr(args, option, os.path.join(directory, path))
+    # The data files fall back to the shared copy
+    for option in SHARED_FILES:
+        path = getattr(args, option, None)
+        if path and os.path.exists(os.path.join(directory, path)):
+            setattr(args, option, os.path.join(directory, path))
+    return args
+
+
+def run_customer(entry, name, directory, args, username, password, budget):
+    """
+    This function runs a toolkit for one customer. It runs in the customer's process.
+    :param entry: The toolkit function, i.e. getter_collector or create_workbook.
+    :param name: The name of the customer.
+    :param directory: The directory of the customer profile.
+    :param args: The parsed command line arguments.
+    :param username: The default username for the inventory.
+    :param password: The default password for the inventory.
+    :param budget: The proxy of the shared FairShareBudget.
+    :return:
+    """
+    global _budget, _customer
+    _budget = budget
+    _customer = name
+    entry(customer_args(args, name, directory), username, password)
+
+
+def run_customers(entry, args, username="", password=""):
+    """
+    This function runs a toolkit for each customer profile at the same time, sharing
+    the connection budget between them.
+    :param entry: The toolkit function, i.e. getter_collector or create_workbook.
+    :param args: The parsed command line arguments, with args.customers a list of
+                 (name, directory) tuples.
+    :param username: The default username for the inventory.
+    :param password: The default password for the inventory.
+    :return: True if every customer's run completed, otherwise False.
+    """
+    with BudgetManager() as manager:
+        budget = manager.FairShareBudget(args.connection_budget)
+        processes = {}
+        for name, directory in args.customers:
+            process = multiprocessing.Process(
+                target=run_customer,
+                args=(entry, name, directory, args, username, password, budget),
+                name="customer-" + name,
+            )
+            process.start()
+            processes[name] = process
+        for process in processes.values():
+            process.join()
+        stats = budget.stats()
+    for name, process in processes.items():
+        customer_stats = stats.get(name, {"sessions": 0, "waited": 0.0})
+        line = (
+            name
+            + " - sessions "
+            + str(customer_stats["sessions"])
+            + " - waited "
+            + str(customer_stats["waited"])
+            + "s"
+        )
+        if process.exitcode == 0:
+            print(f"{Fore.GREEN}CUSTOMER COMPLETE : " + line)
+        else:
+            print(
+                f"{Fore.RED}CUSTOMER FAILED : "
+                + line
+                + " - exit code "
+                + str(process.exitcode)
+            )
+    return all(process.exitcode == 0 for process in processes.values())
@@ -0,0 +1,414 @@
+"""
+A long-running polling daemon, which collects each getter and the configs of every
+host on its own interval, i.e. facts hourly and arp_table every 5 minutes.
+
+The inventory is read and the device connections are opened once, then re-used from
+one cycle to the next. Connections which have been idle for longer than the idle
+timeout are closed, and re-opened by the next cycle of that host. The items which fall
+due together are collected in a single cycle, and a host never has more than one cycle
+running at a time. Items failing with a transient error are put back on the queue, due
+after an exponential backoff, instead of waiting for their next interval.
+
+python -m day_one_net_toolkit.daemon --schedule inventory/schedule.yaml
+"""
+
+# Import Modules
+import argparse
+import concurrent.futures
+import datetime as dt
+import heapq
+import pathlib
+import random
+import signal
+import time
+from colorama import Fore, init
+from ruamel.yaml import YAML
+from day_one_net_toolkit.capabilities import (
+    getter_unsupported,
+    load_capability_cache,
+    prune_plan,
+    read_os_version,
+    record_unsupported,
+    save_capability_cache,
+)
+from day_one_net_toolkit.cli import (
+    add_capability_arguments,
+    add_index_arguments,
+    add_memory_arguments,
+    add_retry_arguments,
+    add_selection_arguments,
+)
+from day_one_net_toolkit.credentials import read_credentials
+from day_one_net_toolkit.endpoints import EndpointIndex
+from day_one_net_toolkit.inventory import host_subset
+from day_one_net_toolkit.memory import set_memory_budget
+from day_one_net_toolkit.plan import build_plan, filter_inventory, load_getter_matrix
+from day_one_net_toolkit.progress import failure_class
+from day_one_net_toolkit.timeouts import LatencyStore, backoff_delay, is_transient
+from day_one_net_toolkit.tasks import (
+    collect_config,
+    collect_getters,
+    init_nornir,
+    update_indexes,
+)
+
+# Default location of the polling schedule
+SCHEDULE_FILE = "inventory/schedule.yaml"
+# Default number of hosts polled at the same time
+DAEMON_WORKERS = 20
+# Default number of seconds before an unused connection is closed
+IDLE_TIMEOUT = 600
+# Number of seconds between saves of the recorded latencies
+LATENCY_SAVE_INTERVAL = 300
+# Kinds of item which can be scheduled
+CONFIG = "config"
+GETTER = "getter"
+
+
+def load_schedule(schedule_file=SCHEDULE_FILE):
+    """
+    This function loads the polling schedule from a YAML file.
+    :param schedule_file: The path to the schedule YAML file.
+    :return: A dictionary with the "default", "jitter", "configs" and "getters" keys.
+    """
+    with open(schedule_file) as f:
+        schedule = YAML(typ="safe").load(f) or {}
+    return {
+        "default": float(schedule.get("default", 3600)),
+        "jitter": float(schedule.get("jitter", 0.1)),
+        "configs": float(schedule.get("configs", schedule.get("default", 3600))),
+        "getters": {
+            getter: float(interval)
+            for getter, interval in (schedule.get("getters") or {}).items()
+        },
+    }
+
+
+def item_interval(schedule, kind, name):
+    """
+    This function returns the polling interval of a config type or getter.
+    :param schedule: The schedule, as returned by load_schedule.
+    :param kind: CONFIG or GETTER.
+    :param name: The config type or getter name.
+    :return: The interval in seconds.
+    """
+    if kind == CONFIG:
+        return schedule["configs"]
+    return schedule["getters"].get(name, schedule["default"])
+
+
+def jittered(interval, jitter):
+    """
+    This function randomly varies an interval, so hosts drift apart instead of all
+    being polled at the same moment.
+    :param interval: The interval in seconds.
+    :param jitter: The fraction the interval is varied by, i.e. 0.1 is +/- 10%.
+    :return: The varied interval in seconds.
+    """
+    return interval * random.uniform(1 - jitter, 1 + jitter)  # nosec
+
+
+def run_cycle(nr, hostname, items, spill_threshold=None):
+    """
+    This function collects the due items of a host, using the host's open connection.
+    It runs in a worker thread. The connections of a host are closed when anything fails,
+    so the next cycle starts with a fresh connection.
+    :param nr: The Nornir object.
+    :param hostname: The name of the host in the inventory.
+    :param items: A list of (kind, name, timeout) tuples to collect.
+    :param spill_threshold: The size in bytes above which results are dropped from
+                            memory once saved, or None to keep every result.
+    :return: A list of (kind, name, MultiResult, seconds taken) tuples.
+    """
+    host_nr = host_subset(nr, [hostname])
+    results = []
+    for kind, name, timeout in items:
+        task = collect_config if kind == CONFIG else collect_getters
+        start = time.perf_counter()
+        result = host_nr.run(
+            task=task,
+            getter=name,
+            timeout=timeout,
+            spill_threshold=spill_threshold,
+            on_failed=True,
+        )
+        results.append((kind, name, result[hostname], time.perf_counter() - start))
+    if any(result.failed for _, _, result, _ in results):
+        nr.inventory.hosts[hostname].close_connections()
+    return results
+
+
+class PollingDaemon:
+    """
+    The polling scheduler. Due items are kept in a heap ordered by the time they are
+    due, and the results of each cycle are handled in the main thread, so the endpoint
+    index, counter history and capability cache are only ever written from one thread.
+    """
+
+    def __init__(self, nr, plan, schedule, args, log_file):
+        self.nr = nr
+        self.schedule = schedule
+        self.args = args
+        self.log_file = log_file
+        self.platforms = {
+            host_plan["host"]: host_plan["platform"] for host_plan in plan
+        }
+        # Heap of (due time, hostname, kind, name)
+        self.queue = []
+        # Items which are due, per host, waiting for the host to be free
+        self.pending = {}
+        # Future of the cycle running on each host
+        self.running = {}
+        # The time each host's connection was last used
+        self.last_used = {}
+        self.stopping = False
+        self.capabilities = load_capability_cache(args.capability_cache)
+        # The recorded times the timeouts are worked out from, and when they were saved
+        self.latency = LatencyStore(args.latency_file)
+        self.latency_saved = time.monotonic()
+        # The number of retries of each (hostname, kind, name) failing transiently
+        self.attempts = {}
+        self.endpoint_index = EndpointIndex(args.endpoint_index)
+        # Drop large results from memory once saved, and limit large getters, when requested
+        self.spill_threshold = (
+            args.spill_threshold * 1e6 if args.bounded_memory else None
+        )
+        set_memory_budget(args.memory_budget)
+        now = time.monotonic()
+        for host_plan in plan:
+            items = [(CONFIG, name) for name in host_plan["configs"]]
+            items += [(GETTER, name) for name in host_plan["getters"]]
+            for kind, name in items:
+                # Spread the first cycle over the jitter window of the item
+                interval = item_interval(schedule, kind, name)
+                delay = random.uniform(0, interval * schedule["jitter"])  # nosec
+                heapq.heappush(self.queue, (now + delay, host_plan["host"], kind, name))
+
+    def log(self, message, colour=""):
+        print(colour + message)
+        self.log_file.write(message + "\n")
+        self.log_file.flush()
+
+    def stop(self, *_):
+        """
+        This function asks the daemon to stop once the running cycles have finished.
+        :return:
+        """
+        self.stopping = True
+
+    def item_timeout(self, hostname, kind, name):
+        """
+        This function returns the NAPALM timeout of an item of a host.
+        """
+        if self.args.timeout:
+            return self.args.timeout
+        return self.latency.timeout(
+            self.platforms[hostname], "config" if kind == CONFIG else name
+        )
+
+    def handle_results(self, hostname, results):
+        """
+        This function records the results of a cycle and schedules the next one.
+        :param hostname: The name of the host in the inventory.
+        :param results: A list of (kind, name, MultiResult, seconds) tuples from run_cycle.
+        :return:
+        """
+        now = time.monotonic()
+        self.last_used[hostname] = now
+        for kind, name, result, seconds in results:
+            label = name + " config" if kind == CONFIG else name
+            attempt = self.attempts.pop((hostname, kind, name), 0)
+            if result[0].failed:
+                error = failure_class(result)
+                # Retry transient failures after a backoff, rather than a whole interval
+                if is_transient(error) and attempt < self.args.retries:
+                    self.attempts[(hostname, kind, name)] = attempt + 1
+                    delay = backoff_delay(attempt + 1, self.args.backoff)
+                    self.log(
+                        f"RETRY : {hostname} - {label} - {error} in {delay:.1f}s",
+                        Fore.YELLOW,
+                    )
+                    heapq.heappush(self.queue, (now + delay, hostname, kind, name))
+                    continue
+                self.log("FAILURE : " + hostname + " - " + label, Fore.RED)
+            # Stop polling getters which the platform does not support
+            if kind == GETTER and getter_unsupported(result):
+                record_unsupported(
+                    self.capabilities,
+                    self.platforms[hostname],
+                    read_os_version(hostname),
+                    name,
+                )
+                save_capability_cache(self.capabilities, self.args.capability_cache)
+                self.log("UNSUPPORTED : " + hostname + " - " + label, Fore.YELLOW)
+                continue
+            if not result[0].failed:
+                self.log("SUCCESS : " + hostname + " - " + label, Fore.GREEN)
+                self.latency.record(
+                    self.platforms[hostname],
+                    "config" if kind == CONFIG else name,
+                    seconds,
+                )
+                if kind == GETTER:
+                    update_indexes(
+                        hostname,
+                        name,
+                        result[1].result[name],
+                        self.endpoint_index,
+                        self.args.history_dir,
+                    )
+            interval = jittered(
+                item_interval(self.schedule, kind, name), self.schedule["jitter"]
+            )
+            heapq.heappush(self.queue, (now + interval, hostname, kind, name))
+        if now - self.latency_saved > LATENCY_SAVE_INTERVAL:
+            self.latency.save()
+            self.latency_saved = now
+
+    def evict_idle(self):
+        """
+        This function closes the connections of hosts which have been idle for longer
+        than the idle timeout.
+        :return:
+        """
+        now = time.monotonic()
+        for hostname, last_used in list(self.last_used.items()):
+            if (
+                hostname not in self.running
+                and now - last_used > self.args.idle_timeout
+            ):
+                self.nr.inventory.hosts[hostname].close_connections()
+                del self.last_used[hostname]
+
+    def run(self):
+        """
+        This function runs the daemon until it is stopped, i.e. by SIGTERM or Ctrl+C.
+        :return:
+        """
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.args.workers
+        ) as executor:
+            while not self.stopping or self.running:
+                now = time.monotonic()
+                # Move the due items to the host they belong to
+                while self.queue and self.queue[0][0] <= now:
+                    _, hostname, kind, name = heapq.heappop(self.queue)
+                    self.pending.setdefault(hostname, []).append((kind, name))
+                # Start a cycle for each free host with due items
+                for hostname in list(self.pending):
+                    if hostname in self.running or self.stopping:
+                        continue
+                    # Configs first, then facts, in the same order as day-one-toolkit.py
+                    items = sorted(
+                        self.pending.pop(hostname),
+                        key=lambda item: (item[0] != CONFIG, item[1] != "facts"),
+                    )
+                    items = [
+                        (kind, name, self.item_timeout(hostname, kind, name))
+                        for kind, name in items
+                    ]
+                    self.running[hostname] = executor.submit(
+                        run_cycle, self.nr, hostname, items, self.spill_threshold
+                    )
+                # Wait for a cycle to finish, or for the next item to fall due
+                timeout = 1.0
+                if self.queue:
+                    timeout = min(timeout, max(self.queue[0][0] - now, 0))
+                done, _ = concurrent.futures.wait(
+                    list(self.running.values()),
+                    timeout=timeout,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                if not self.running:
+                    time.sleep(timeout)
+                for hostname, future in list(self.running.items()):
+                    if future in done:
+                        del self.running[hostname]
+                        self.handle_results(hostname, future.result())
+                self.evict_idle()
+        self.nr.close_connections()
+        self.endpoint_index.close()
+        self.latency.save()
+
+
+def build_daemon_parser():
+    """
+    This function builds the argument parser of the polling daemon, with only the
+    options it uses.
+    :return: An argparse.ArgumentParser object.
+    """
+    parser = argparse.ArgumentParser(
+        description="Poll network devices for configurations and NAPALM getters."
+    )
+    add_selection_arguments(parser)
+    add_capability_arguments(parser, clear=False)
+    add_index_arguments(parser, run=False)
+    add_retry_arguments(parser)
+    add_memory_arguments(parser)
+    daemon = parser.add_argument_group("daemon")
+    daemon.add_argument(
+        "--schedule",
+        default=SCHEDULE_FILE,
+        help="The polling schedule (default: %(default)s)",
+    )
+    daemon.add_argument(
+        "--workers",
+        type=int,
+        default=DAEMON_WORKERS,
+        help="The number of hosts polled at the same time (default: %(default)s)",
+    )
+    daemon.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=IDLE_TIMEOUT,
+        help="Seconds before an unused connection is closed (default: %(default)s)",
+    )
+    return parser
+
+
+def main(argv=None):
+    """
+    This function is the command line interface to the polling daemon.
+    :param argv: A list of command line arguments. Defaults to sys.argv.
+    :return:
+    """
+    args = build_daemon_parser().parse_args(argv)
+    # Auto-reset colorama colours back after each print statement
+    init(autoreset=True)
+    nr = init_nornir(*read_credentials())
+    nr = filter_inventory(
+        nr,
+        hosts=args.hosts,
+        exclude_hosts=args.exclude_hosts,
+        groups=args.groups,
+        platforms=args.platforms,
+    )
+    plan = build_plan(
+        nr,
+        load_getter_matrix(args.getters_file),
+        getters=args.getters,
+        exclude_getters=args.exclude_getters,
+        configs=args.configs,
+        exclude_configs=args.exclude_configs,
+    )
+    prune_plan(plan, load_capability_cache(args.capability_cache))
+    # Create log directory if it doesn't exist.
+    pathlib.Path("logs").mkdir(exist_ok=True)
+    fmt_time = dt.datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+    with open("logs/DAEMON-LOG-" + fmt_time + ".txt", "w") as log_file:
+        polling_daemon = PollingDaemon(
+            nr, plan, load_schedule(args.schedule), args, log_file
+        )
+        signal.signal(signal.SIGTERM, polling_daemon.stop)
+        polling_daemon.log("STARTING DAEMON: " + fmt_time, Fore.MAGENTA)
+        try:
+            polling_daemon.run()
+        except KeyboardInterrupt:
+            # Let the running cycles finish, then close the connections
+            polling_daemon.stop()
+            polling_daemon.run()
+        polling_daemon.log("STOPPED DAEMON", Fore.MAGENTA)
+
+
+if __name__ == "__main__":
+    main()
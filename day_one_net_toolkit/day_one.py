@@ -0,0 +1,655 @@
+"""
+Collects configurations and NAPALM getters from network devices. This is the
+day-one-toolkit command, which can also be used as a library:
+
+from day_one_net_toolkit.day_one import getter_collector, main
+main(["--hosts", "lab-*", "--getters", "facts"])
+"""
+
+# Import Modules
+import concurrent.futures
+import heapq
+import itertools
+import multiprocessing
+import pathlib
+import sys
+import datetime as dt
+import time
+from colorama import Fore, init
+from day_one_net_toolkit.cli import build_parser
+from day_one_net_toolkit.credentials import read_credentials
+from day_one_net_toolkit.plan import load_getter_matrix, filter_inventory, build_plan
+from day_one_net_toolkit.capabilities import (
+    clear_capability_cache,
+    getter_unsupported,
+    load_capability_cache,
+    prune_plan,
+    read_os_version,
+    record_unsupported,
+    save_capability_cache,
+)
+from day_one_net_toolkit.archive import add_run
+from day_one_net_toolkit.configindex import ConfigIndex
+from day_one_net_toolkit.concurrency import LIMIT_POLL_INTERVAL, build_limiter
+from day_one_net_toolkit.commands import (
+    collect_commands,
+    load_command_matrix,
+    parse_output,
+)
+from day_one_net_toolkit.customers import connection_slot, run_customers
+from day_one_net_toolkit.endpoints import EndpointIndex
+from day_one_net_toolkit.inventory import host_subset
+from day_one_net_toolkit.manifest import (
+    compare_manifests,
+    load_manifest,
+    write_manifest,
+)
+from day_one_net_toolkit.memory import report_memory, set_memory_budget
+from day_one_net_toolkit.profiling import Profiler, add_span, report_profile
+from day_one_net_toolkit.progress import Progress, failure_class
+from day_one_net_toolkit.timeouts import (
+    LatencyStore,
+    backoff_delay,
+    is_transient,
+    item_key,
+)
+from day_one_net_toolkit.tasks import (
+    collect_config,
+    collect_getters,
+    index_config,
+    init_nornir,
+    update_indexes,
+)
+
+
+def getter_collector(args, username="", password=""):  # noqa
+    """
+    This function is the main function of the toolkit.
+
+    It performs two roles:
+
+    1) Collects configurations for all devices in the inventory,
+    based on NAPALM support.
+
+    These configurations are saved in the configs/ directory using the following convention:
+    <hostname>/<filter_name>.txt
+
+    2) Performs a collection of supported getters based on
+    the official NAPALM supported filter list:
+    https://napalm.readthedocs.io/en/latest/support/
+
+    It has been written in a way whereby one simply updates the appropriate platform
+    in the getter matrix file (inventory/getters.yaml) to add or remove supported getters.
+    All getters are stored in the facts/ directory using the following convention:
+    <hostname>/<filter_name>.json
+
+    The hosts, getters and config types processed can be narrowed down using the
+    command line options, i.e. --hosts 'lab-*' --getters lldp_neighbors
+
+    Getters which a platform does not support are recorded in the capability cache,
+    and are not requested again from hosts with the same driver and OS version.
+    :param args: The parsed command line arguments.
+    :param username: The default username for the inventory.
+    :param password: The default password for the inventory.
+    """
+    """
+    The following block of code is used to generate a log file in a directory.
+    These log files will indicate the success/failure of filter collector
+    for retrospective analysis.
+    """
+    # Capture time
+    cur_time = dt.datetime.now()
+    # Cleanup time, so that the format is clean for the output file 2019-07-01-13-04-59
+    fmt_time = cur_time.strftime("%Y-%m-%d-%H-%M-%S")
+    # Set log directory variable
+    log_dir = args.log_dir
+    # Create log directory if it doesn't exist.
+    pathlib.Path(log_dir).mkdir(parents=True, exist_ok=True)
+    # Create log file name, with timestamp in the name
+    filename = str("DISCOVERY-LOG") + "-" + fmt_time + ".txt"
+    # Join the log file name and log directory together into a variable
+    log_file_path = log_dir + "/" + filename
+    # Create the log file
+    log_file = open(log_file_path, "w")
+    # Start of logging output
+    print(f"{Fore.MAGENTA}STARTING DISCOVERY: " + str(fmt_time))
+    log_file.write("STARTING DISCOVERY: " + str(fmt_time) + "\n\n")
+    """
+    Initialise two counters, so that success and failure can be counted
+    and incremented as the getters are collected.
+    """
+    # Success Counter
+    success_count = 0
+    # Fail Counter
+    fail_count = 0
+    # Profile the run, when requested, timing each phase separately
+    profiler = Profiler(
+        args.profile and pathlib.Path(args.profile, "DISCOVERY-" + fmt_time)
+    )
+    profiler.start()
+    profiler.begin("inventory")
+    # Initialize Nornir, with the default username and password
+    nr = init_nornir(
+        username, password, cache_file=args.inventory_cache, files=args.inventory_files
+    )
+    """
+    The following block of code narrows the inventory down to the selected hosts
+    and works out which configs and getters to collect from each of them, using
+    the per-platform getter matrix. This happens before any connection is opened.
+    """
+    nr = filter_inventory(
+        nr,
+        hosts=args.hosts,
+        exclude_hosts=args.exclude_hosts,
+        groups=args.groups,
+        platforms=args.platforms,
+    )
+    getter_matrix = load_getter_matrix(args.getters_file)
+    plan = build_plan(
+        nr,
+        getter_matrix,
+        getters=args.getters,
+        exclude_getters=args.exclude_getters,
+        configs=args.configs,
+        exclude_configs=args.exclude_configs,
+    )
+    # Remove the getters known to be unsupported from the plan
+    capabilities = load_capability_cache(args.capability_cache)
+    skip_count = prune_plan(plan, capabilities, args.facts_dir)
+    # Open the endpoint index, which is updated as each host's getters are collected
+    endpoint_index = EndpointIndex(args.endpoint_index)
+    # Open the config index, which each config is added to as it is collected, under
+    # the name the configs are archived as
+    run = "RUN-" + fmt_time
+    config_index = ConfigIndex(args.config_index) if args.config_index else None
+    # The (host, config type) of each config collected, which are the ones archived
+    collected_configs = set()
+    # Track the progress of the (host, config or getter) items in the plan
+    progress = Progress(
+        sum(
+            len(host_plan["configs"]) + len(host_plan["getters"]) for host_plan in plan
+        ),
+        status_file=args.status_file,
+        interval=args.progress_interval,
+    )
+    # Drop large results from memory once saved, and limit large getters, when requested
+    spill_threshold = args.spill_threshold * 1e6 if args.bounded_memory else None
+    set_memory_budget(args.memory_budget)
+    # Load the recorded times, which the timeout of each item is worked out from
+    latency = LatencyStore(args.latency_file)
+    # Load the raw CLI commands when asked for, which are parsed in a process pool as
+    # hosts finish
+    command_matrix = load_command_matrix(args.commands_file) if args.commands else {}
+    # The parse pool is only started when there are commands. Its workers are spawned
+    # rather than forked, as forking once the collector threads and SSH transports are
+    # running can deadlock the new processes
+    parse_pool = None
+    if command_matrix:
+        parse_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=args.parse_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    parse_futures = []
+    command_fail_count = 0
+    """
+    The plan entries are processed from a queue ordered by the time they are due.
+    Items which fail with a transient error are put back on the queue as a new entry
+    for the host, due after a backoff, so they are retried after the other hosts
+    rather than holding up the run.
+
+    Hosts are collected in worker threads, as many at once as the concurrency limit
+    allows. The indexes, counters and capability cache are only updated from this
+    thread, as each host finishes.
+    """
+    order = itertools.count()
+    queue = [(0.0, next(order), host_plan) for host_plan in plan]
+    retry_count = 0
+    limiter = build_limiter(args, log_file, latency.medians())
+
+    def collect_host(host_plan):  # noqa
+        """
+        This function collects the configs, getters and raw commands of a host.
+        It runs in a worker thread.
+        :param host_plan: The plan entry of the host.
+        :return: A dictionary of the outcome of the host.
+        """
+        # Assign the hostname to a variable from the plan entry
+        hostname = host_plan["host"]
+        # Assign the platform and the number of earlier attempts to variables
+        platform = host_plan["platform"]
+        attempt = host_plan.get("attempt", 0)
+        outcome = {
+            "success": 0,
+            "failed": 0,
+            "commands_failed": 0,
+            "retry_plan": None,
+            "parse_jobs": [],
+            "indexed": [],
+            "unsupported": [],
+        }
+        # Items of the host which failed with a transient error, to be retried
+        retry_configs = []
+        retry_getters = []
+        # Note the start of the host, for its trace span when profiling
+        host_start = time.perf_counter()
+        # Narrow the inventory down to this host, so tasks only run against it
+        host_nr = host_subset(nr, [hostname])
+        # Starting processing of a host
+        label = str(hostname) + (" (retry " + str(attempt) + ")" if attempt else "")
+        print(f"{Fore.MAGENTA}** Start Processing Host: " + label)
+        log_file.write("** Start Processing Host: " + label + "\n")
+        # Take a session from the connection budget shared with the other customers,
+        # which is given back even when collecting the host fails
+        with connection_slot():
+            progress.open_session()
+            try:
+                # Report the getters which have been skipped, as they are known to be unsupported
+                if host_plan["skipped"]:
+                    skipped = ", ".join(host_plan["skipped"])
+                    print(f"{Fore.YELLOW}Skipping Unsupported Getters: " + skipped)
+                    log_file.write("Skipping Unsupported Getters: " + skipped + "\n")
+                for config in host_plan["configs"]:
+                    # Start collecting the config getters
+                    print("Processing " + str(config) + " config ... ")
+                    log_file.write("Processing " + str(config) + " config ... " + "\n")
+                    # Execute the collect_config function, with the timeout worked out for configs
+                    item_start = time.perf_counter()
+                    configs = host_nr.run(
+                        task=collect_config,
+                        getter=config,
+                        timeout=args.timeout or latency.timeout(platform, "config"),
+                        spill_threshold=spill_threshold,
+                        config_dir=args.configs_dir,
+                        on_failed=True,
+                    )
+                    """
+                    Access the specific 'napalm_get' result out of the collect_getters function
+                    and store whether the failed boolean is True (failure) or False (success)
+                    """
+                    configs_results = configs[hostname][0].failed
+                    # Conditional block to record success/fail count of the 'napalm_get' result
+                    error = failure_class(configs[hostname])
+                    # Feed the time and outcome of the item to the concurrency limit
+                    limiter.record(
+                        item_key(platform, "config"),
+                        time.perf_counter() - item_start,
+                        error if configs_results is True else None,
+                    )
+                    if (
+                        configs_results is True
+                        and is_transient(error)
+                        and attempt < args.retries
+                    ):
+                        retry_configs.append(config)
+                        print(
+                            f"{Fore.YELLOW}RETRY : "
+                            + str(hostname)
+                            + " - "
+                            + str(config)
+                            + " config - "
+                            + error
+                        )
+                        log_file.write(
+                            "RETRY : "
+                            + str(hostname)
+                            + " - "
+                            + str(config)
+                            + " config - "
+                            + error
+                            + "\n"
+                        )
+                    elif configs_results is True:
+                        print(
+                            f"{Fore.RED}FAILURE : "
+                            + str(hostname)
+                            + " - "
+                            + str(config)
+                            + " config"
+                        )
+                        log_file.write(
+                            "FAILURE : "
+                            + str(hostname)
+                            + " - "
+                            + str(config)
+                            + " config"
+                            + "\n"
+                        )
+                        outcome["failed"] += 1
+                        progress.item_done(failed=True, error=error)
+                    else:
+                        print(
+                            f"{Fore.GREEN}SUCCESS : "
+                            + str(hostname)
+                            + " - "
+                            + str(config)
+                            + " config"
+                        )
+                        log_file.write(
+                            "SUCCESS : "
+                            + str(hostname)
+                            + " - "
+                            + str(config)
+                            + " config"
+                            + "\n"
+                        )
+                        outcome["success"] += 1
+                        progress.item_done()
+                        latency.record(
+                            platform, "config", time.perf_counter() - item_start
+                        )
+                        outcome["indexed"].append(("config", config, None))
+                # For block to collect all supported getters
+                for entry in host_plan["getters"]:
+                    # Start processing getters
+                    print("Processing Getter: " + str(entry))
+                    log_file.write("Processing Getter: " + str(entry) + "\n")
+                    # Execute collect_getters function, with the timeout worked out for the getter
+                    item_start = time.perf_counter()
+                    getters = host_nr.run(
+                        task=collect_getters,
+                        getter=entry,
+                        timeout=args.timeout or latency.timeout(platform, entry),
+                        spill_threshold=spill_threshold,
+                        fact_dir=args.facts_dir,
+                        on_failed=True,
+                    )
+                    """
+                    Access the specific 'napalm_get' result out of the collect_getters function
+                    and store whether the failed boolean is True (failure) or False (success)
+                    """
+                    getters_results = getters[hostname][0].failed
+                    # Conditional block to record success/fail count of the 'napalm_get' result
+                    error = failure_class(getters[hostname])
+                    # Feed the time and outcome of the item to the concurrency limit
+                    limiter.record(
+                        item_key(platform, entry),
+                        time.perf_counter() - item_start,
+                        error if getters_results is True else None,
+                    )
+                    if (
+                        getters_results is True
+                        and is_transient(error)
+                        and attempt < args.retries
+                    ):
+                        retry_getters.append(entry)
+                        log_file.write(
+                            "RETRY : "
+                            + str(hostname)
+                            + " - "
+                            + str(entry)
+                            + " - "
+                            + error
+                            + "\n"
+                        )
+                        print(
+                            f"{Fore.YELLOW}RETRY : "
+                            + str(hostname)
+                            + " - "
+                            + str(entry)
+                            + " - "
+                            + error
+                        )
+                        continue
+                    if getters_results is True:
+                        log_file.write(
+                            "FAILURE : " + str(hostname) + " - " + str(entry) + "\n"
+                        )
+                        print(
+                            f"{Fore.RED}FAILURE : " + str(hostname) + " - " + str(entry)
+                        )
+                        outcome["failed"] += 1
+                        progress.item_done(failed=True, error=error)
+                    # Record getters which are not supported, so they are skipped next time
+                    if getter_unsupported(getters[hostname]):
+                        outcome["unsupported"].append(entry)
+                        # A failed getter is already done, one with an unsupported result isn't
+                        if getters_results is not True:
+                            progress.item_done()
+                    elif getters_results is not True:
+                        log_file.write(
+                            "SUCCESS : " + str(hostname) + " - " + str(entry) + "\n"
+                        )
+                        print(
+                            f"{Fore.GREEN}SUCCESS : "
+                            + str(hostname)
+                            + " - "
+                            + str(entry)
+                        )
+                        outcome["success"] += 1
+                        progress.item_done()
+                        latency.record(
+                            platform, entry, time.perf_counter() - item_start
+                        )
+                        # Add the result to the endpoint index and counter history
+                        outcome["indexed"].append(
+                            ("getter", entry, getters[hostname][1].result[entry])
+                        )
+                # Run the raw CLI commands of the platform, on the first attempt only
+                if command_matrix.get(platform) and not attempt:
+                    print("Processing Commands: " + str(len(command_matrix[platform])))
+                    log_file.write(
+                        "Processing Commands: "
+                        + str(len(command_matrix[platform]))
+                        + "\n"
+                    )
+                    commands = host_nr.run(
+                        task=collect_commands,
+                        commands=command_matrix[platform],
+                        command_dir=args.command_dir,
+                        on_failed=True,
+                    )
+                    if commands[hostname][0].failed:
+                        print(f"{Fore.RED}FAILURE : " + str(hostname) + " - commands")
+                        log_file.write(
+                            "FAILURE : " + str(hostname) + " - commands" + "\n"
+                        )
+                        outcome["commands_failed"] += 1
+                    else:
+                        # Report the commands which failed, the others are still parsed
+                        for command in commands[hostname][0].result["failed"]:
+                            print(
+                                f"{Fore.RED}FAILURE : "
+                                + str(hostname)
+                                + " - "
+                                + command
+                            )
+                            log_file.write(
+                                "FAILURE : " + str(hostname) + " - " + command + "\n"
+                            )
+                            outcome["commands_failed"] += 1
+                        # Hand the output to the parse pool, so parsing overlaps the collection
+                        outcome["parse_jobs"] = commands[hostname][0].result["jobs"]
+                # Release the host's results, now they have been saved
+                configs = getters = commands = None
+            finally:
+                # Close the host's session, so sessions don't pile up on the devices
+                progress.close_session()
+                host_nr.close_connections()
+        add_span(hostname, "host", host_start, platform=platform, attempt=attempt)
+        # Put the items to retry back on the queue, due after the backoff
+        if retry_configs or retry_getters:
+            outcome["retry_plan"] = dict(
+                host_plan,
+                configs=retry_configs,
+                getters=retry_getters,
+                skipped=[],
+                attempt=attempt + 1,
+            )
+        # Ending processing of host
+        print(f"{Fore.MAGENTA}** End Processing Host: " + str(hostname))
+        log_file.write("** End Processing Host: " + str(hostname) + "\n\n")
+        return outcome
+
+    profiler.begin("collection")
+    """
+    The following block is the main component of the program. Each host collects
+    the running config, the startup/candidate config and all supported getters
+    based on the platform entry in the getter matrix.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=limiter.maximum)
+    running = {}
+    while queue or running:
+        # Start the hosts which are due, as many as the concurrency limit allows
+        while queue and queue[0][0] <= time.monotonic() and limiter.try_acquire():
+            _, _, host_plan = heapq.heappop(queue)
+            running[executor.submit(collect_host, host_plan)] = host_plan
+        if not running:
+            # Wait for the backoff of a retry, once there is nothing else left to do
+            time.sleep(max(queue[0][0] - time.monotonic(), 0))
+            continue
+        # Wait for a host to finish, or for the next retry to be due. The limit can
+        # go up while waiting, so check it again regularly
+        timeout = None
+        if queue:
+            timeout = min(max(queue[0][0] - time.monotonic(), 0), LIMIT_POLL_INTERVAL)
+        done, _ = concurrent.futures.wait(
+            running, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for future in done:
+            host_plan = running.pop(future)
+            limiter.release()
+            hostname = host_plan["host"]
+            # A host which raised is reported as failed, the other hosts carry on
+            try:
+                outcome = future.result()
+            except Exception as e:
+                error = type(e).__name__ + ": " + str(e)
+                print(f"{Fore.RED}FAILURE : " + str(hostname) + " - " + error)
+                log_file.write("FAILURE : " + str(hostname) + " - " + error + "\n")
+                fail_count += 1
+                continue
+            success_count += outcome["success"]
+            fail_count += outcome["failed"]
+            command_fail_count += outcome["commands_failed"]
+            # Add the host's configs and getters to the indexes
+            for kind, name, result in outcome["indexed"]:
+                if kind == "getter":
+                    update_indexes(
+                        hostname, name, result, endpoint_index, args.history_dir
+                    )
+                else:
+                    collected_configs.add((hostname, name))
+                    if config_index is not None:
+                        index_config(
+                            config_index, run, hostname, name, args.configs_dir
+                        )
+            for entry in outcome["unsupported"]:
+                record_unsupported(
+                    capabilities,
+                    host_plan["platform"],
+                    read_os_version(hostname, args.facts_dir),
+                    entry,
+                )
+            parse_futures += [
+                parse_pool.submit(parse_output, job) for job in outcome["parse_jobs"]
+            ]
+            retry_plan = outcome["retry_plan"]
+            if retry_plan:
+                retry_count += len(retry_plan["configs"]) + len(retry_plan["getters"])
+                retry_due = time.monotonic() + backoff_delay(
+                    retry_plan["attempt"], args.backoff
+                )
+                heapq.heappush(queue, (retry_due, next(order), retry_plan))
+    executor.shutdown()
+    profiler.begin("export")
+    # Wait for the parsing of the raw command output to finish
+    for future in concurrent.futures.as_completed(parse_futures):
+        path, _, error = future.result()
+        if error:
+            print(f"{Fore.RED}PARSE FAILURE : " + path + " - " + error)
+            log_file.write("PARSE FAILURE : " + path + " - " + error + "\n")
+            command_fail_count += 1
+    if parse_pool is not None:
+        parse_pool.shutdown()
+    # Report the final progress
+    progress.finish()
+    log_file.write(Progress.format_status(progress.status()) + "\n\n")
+    # Add the two variables together to get a total count into a variable
+    total_count = success_count + fail_count
+    # Provide a summary of the main function and add to log file
+    print("SUMMARY" + "\n")
+    log_file.write("SUMMARY" + "\n\n")
+    print(f"{Fore.GREEN}SUCCESS COUNT : " + str(success_count))
+    log_file.write("SUCCESS COUNT : " + str(success_count) + "\n")
+    print(f"{Fore.RED}FAILURE COUNT : " + str(fail_count))
+    log_file.write("FAILURE COUNT : " + str(fail_count) + "\n")
+    print("TOTAL COUNT : " + str(total_count))
+    log_file.write("TOTAL COUNT : " + str(total_count) + "\n")
+    print(f"{Fore.YELLOW}SKIPPED UNSUPPORTED COUNT : " + str(skip_count))
+    log_file.write("SKIPPED UNSUPPORTED COUNT : " + str(skip_count) + "\n")
+    print(f"{Fore.YELLOW}RETRY COUNT : " + str(retry_count))
+    log_file.write("RETRY COUNT : " + str(retry_count) + "\n")
+    # Report the concurrency of the run, and save the tuned value for the next run
+    limiter.report(log_file, args.concurrency_file)
+    if command_matrix:
+        print("PARSED COMMANDS : " + str(len(parse_futures)))
+        log_file.write("PARSED COMMANDS : " + str(len(parse_futures)) + "\n")
+        print(f"{Fore.RED}COMMAND FAILURE COUNT : " + str(command_fail_count))
+        log_file.write("COMMAND FAILURE COUNT : " + str(command_fail_count) + "\n")
+    # Save the recorded times for the timeouts of the next run
+    latency.save()
+    # Save the capability cache for the next run
+    save_capability_cache(capabilities, args.capability_cache)
+    # Close the endpoint and config indexes
+    endpoint_index.close()
+    if config_index is not None:
+        config_index.close()
+    # Add the configs collected by this run to the compressed archive, leaving out the
+    # configs of hosts which weren't collected or failed
+    if args.archive_dir and collected_configs:
+        run = add_run(
+            args.archive_dir, args.configs_dir, run=run, configs=collected_configs
+        )
+        print(f"{Fore.CYAN}CONFIGS ARCHIVED : " + run)
+        log_file.write("CONFIGS ARCHIVED : " + run + "\n")
+    # Write the manifest of this run, and count the items changed since the last run
+    manifest, previous = write_manifest(
+        [host_plan["host"] for host_plan in plan],
+        args.manifest_dir,
+        args.facts_dir,
+        args.configs_dir,
+    )
+    print(f"{Fore.CYAN}MANIFEST : " + str(manifest))
+    log_file.write("MANIFEST : " + str(manifest) + "\n")
+    if previous:
+        changes = compare_manifests(load_manifest(previous), load_manifest(manifest))
+        print(f"{Fore.CYAN}CHANGED ITEMS SINCE LAST RUN : " + str(len(changes)))
+        log_file.write("CHANGED ITEMS SINCE LAST RUN : " + str(len(changes)) + "\n")
+    # Report the peak memory of the run, in bounded-memory mode
+    if args.bounded_memory or args.memory_budget:
+        report_memory(log_file)
+    # Report the time and peak memory of each phase, when profiling
+    report_profile(profiler, log_file)
+    # Close the log file
+    log_file.close()
+
+
+def main(argv=None):
+    """
+    This function is the command line interface of day-one-toolkit.
+    :param argv: A list of command line arguments. Defaults to sys.argv.
+    :return:
+    """
+    # Parse command line arguments
+    args = build_parser(
+        "Collect configurations and NAPALM getters from network devices."
+    ).parse_args(argv)
+    # Auto-reset colorama colours back after each print statement
+    init(autoreset=True)
+    # Clear the capability cache when requested, otherwise execute main program
+    if args.clear_capability_cache:
+        clear_capability_cache(args.capability_cache)
+        print(f"{Fore.CYAN}Capability cache cleared: " + str(args.capability_cache))
+    else:
+        username, password = read_credentials()
+        # Run each customer at the same time when there are several
+        if args.customers:
+            # Exit with an error when any customer's run failed
+            if not run_customers(getter_collector, args, username, password):
+                sys.exit(1)
+        else:
+            getter_collector(args, username, password)
+
+
+if __name__ == "__main__":
+    main()
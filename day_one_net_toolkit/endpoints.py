@@ -0,0 +1,238 @@
+"""
+An on-disk SQLite index of where endpoints live, built from the mac_address_table
+and arp_table getters. It maps MAC addresses to (host, interface, VLAN) and IP
+addresses to MAC addresses.
+
+day-one-toolkit.py updates the index as each host's getters are collected. The
+index can be queried, or rebuilt from a facts directory, from the command line:
+
+python -m day_one_net_toolkit.endpoints 00:1c:58:29:4a:71 10.0.0.20
+"""
+
+# Import Modules
+import argparse
+import ipaddress
+import os
+import pathlib
+import re
+import sqlite3
+import time
+from day_one_net_toolkit.factstore import FACT_DIR, load_getter
+
+# Default location of the endpoint index
+ENDPOINT_INDEX_FILE = "indexes/endpoints.db"
+# The getters which are added to the endpoint index
+ENDPOINT_GETTERS = ("mac_address_table", "arp_table")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mac (
+    mac TEXT NOT NULL,
+    host TEXT NOT NULL,
+    interface TEXT NOT NULL,
+    vlan INTEGER NOT NULL,
+    static INTEGER,
+    updated REAL,
+    PRIMARY KEY (mac, host, interface, vlan)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS mac_host ON mac (host);
+CREATE INDEX IF NOT EXISTS mac_port ON mac (host, interface);
+CREATE TABLE IF NOT EXISTS arp (
+    ip TEXT NOT NULL,
+    mac TEXT NOT NULL,
+    host TEXT NOT NULL,
+    interface TEXT NOT NULL,
+    age REAL,
+    updated REAL,
+    PRIMARY KEY (ip, mac, host, interface)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS arp_mac ON arp (mac);
+CREATE INDEX IF NOT EXISTS arp_host ON arp (host);
+"""
+
+
+def normalise_mac(mac):
+    """
+    This function normalises a MAC address to lower case, colon separated form.
+    i.e. "001C.5829.4A71" and "00-1C-58-29-4A-71" both become "00:1c:58:29:4a:71"
+    :param mac: The MAC address.
+    :return: The normalised MAC address, or None if it isn't a MAC address.
+    """
+    digits = re.sub(r"[^0-9a-f]", "", str(mac).lower())
+    if len(digits) != 12:
+        return None
+    return ":".join(digits[i : i + 2] for i in range(0, 12, 2))
+
+
+class EndpointIndex:
+    """
+    A SQLite endpoint index. Each host's rows are replaced in a single transaction
+    when its getters are added, so the index is always consistent between hosts.
+    """
+
+    def __init__(self, path=ENDPOINT_INDEX_FILE):
+        # Create the index directory and/or check that it exists
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        # WAL lets lookups run while a collection run is updating the index
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def add_host(self, hostname, getter, result):
+        """
+        This function replaces a host's entries in the index with a getter result.
+        :param hostname: The name of the host in the inventory.
+        :param getter: Either mac_address_table or arp_table.
+        :param result: The result of the getter for the host.
+        :return: The number of entries indexed.
+        """
+        now = time.time()
+        if getter == "mac_address_table":
+            rows = [
+                (
+                    normalise_mac(entry.get("mac")),
+                    hostname,
+                    str(entry.get("interface", "")),
+                    int(entry.get("vlan") or 0),
+                    int(bool(entry.get("static"))),
+                    now,
+                )
+                for entry in result or []
+            ]
+            delete = "DELETE FROM mac WHERE host = ?"
+            insert = "INSERT OR REPLACE INTO mac VALUES (?, ?, ?, ?, ?, ?)"
+        elif getter == "arp_table":
+            rows = [
+                (
+                    str(entry.get("ip", "")),
+                    normalise_mac(entry.get("mac")),
+                    hostname,
+                    str(entry.get("interface", "")),
+                    entry.get("age"),
+                    now,
+                )
+                for entry in result or []
+            ]
+            delete = "DELETE FROM arp WHERE host = ?"
+            insert = "INSERT OR REPLACE INTO arp VALUES (?, ?, ?, ?, ?, ?)"
+        else:
+            return 0
+        # Skip entries without a valid MAC address, i.e. incomplete ARP entries
+        rows = [row for row in rows if None not in row[:2]]
+        with self.conn:
+            self.conn.execute(delete, (hostname,))
+            self.conn.executemany(insert, rows)
+        return len(rows)
+
+    def locate_mac(self, mac):
+        """
+        This function returns where a MAC address has been learnt. Ports with the fewest
+        MAC addresses are listed first, as they are the most likely to be the edge port.
+        :param mac: The MAC address, in any format accepted by normalise_mac.
+        :return: A list of (mac, host, interface, vlan, MACs on the port) tuples.
+        """
+        return self.conn.execute(
+            """
+            SELECT m.mac, m.host, m.interface, m.vlan,
+                (SELECT COUNT(*) FROM mac p WHERE p.host = m.host AND p.interface = m.interface)
+                AS port_macs
+            FROM mac m WHERE m.mac = ? ORDER BY port_macs, m.host, m.interface
+            """,
+            (normalise_mac(mac),),
+        ).fetchall()
+
+    def resolve_ip(self, ip):
+        """
+        This function returns the MAC addresses an IP address resolves to.
+        :param ip: The IP address.
+        :return: A list of (ip, mac, host, interface) tuples.
+        """
+        return self.conn.execute(
+            "SELECT ip, mac, host, interface FROM arp WHERE ip = ? ORDER BY host",
+            (str(ipaddress.ip_address(ip)),),
+        ).fetchall()
+
+    def ips_of_mac(self, mac):
+        """
+        This function returns the IP addresses a MAC address has in the ARP tables.
+        :param mac: The MAC address, in any format accepted by normalise_mac.
+        :return: A sorted list of IP addresses.
+        """
+        rows = self.conn.execute(
+            "SELECT DISTINCT ip FROM arp WHERE mac = ?", (normalise_mac(mac),)
+        ).fetchall()
+        return sorted(row[0] for row in rows)
+
+    def close(self):
+        """
+        This function closes the index.
+        :return:
+        """
+        self.conn.close()
+
+
+def rebuild_index(index, fact_dir=FACT_DIR):
+    """
+    This function adds the mac_address_table and arp_table files of every host in a
+    facts directory to the endpoint index.
+    :param index: The EndpointIndex object.
+    :param fact_dir: The directory where the getters are stored.
+    :return: The number of entries indexed.
+    """
+    count = 0
+    for entry in sorted(os.scandir(fact_dir), key=lambda entry: entry.name):
+        if not entry.is_dir():
+            continue
+        for getter in ENDPOINT_GETTERS:
+            result = load_getter(fact_dir, entry.name, getter)
+            if result is not None:
+                count += index.add_host(entry.name, getter, result)
+    return count
+
+
+def main():
+    """
+    This function is the command line interface to the endpoint index.
+    :return:
+    """
+    parser = argparse.ArgumentParser(
+        description="Locate endpoints by MAC or IP address using the endpoint index."
+    )
+    parser.add_argument("queries", nargs="*", help="MAC or IP addresses to locate")
+    parser.add_argument(
+        "--index",
+        default=ENDPOINT_INDEX_FILE,
+        help="The endpoint index file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rebuild",
+        metavar="FACTS_DIR",
+        help="Add every host in a facts directory to the index first",
+    )
+    args = parser.parse_args()
+    index = EndpointIndex(args.index)
+    if args.rebuild:
+        print("Entries indexed: " + str(rebuild_index(index, args.rebuild)))
+    for query in args.queries:
+        # Work out the MAC addresses to locate, resolving IP addresses using ARP
+        try:
+            macs = sorted({row[1] for row in index.resolve_ip(query)})
+        except ValueError:
+            macs = [normalise_mac(query) or query]
+        if not macs:
+            print(f"NOT FOUND : {query}")
+        for mac in macs:
+            ips = ", ".join(index.ips_of_mac(mac)) or "no ARP entry"
+            locations = index.locate_mac(mac)
+            if not locations:
+                print(f"{query} : {mac} ({ips}) - not in any MAC address table")
+            for _, host, interface, vlan, port_macs in locations:
+                print(
+                    f"{query} : {mac} ({ips}) - {host} {interface} VLAN {vlan} "
+                    f"({port_macs} MACs on port)"
+                )
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
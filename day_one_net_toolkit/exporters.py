@@ -0,0 +1,277 @@
+"""
+Exporters for the datasets built by collection-toolkit.py.
+
+Each dataset (Facts, Interfaces, Interfaces_IP, LLDP and Users) is written to every
+selected exporter as each host is processed, so nothing waits for the end of the run:
+
+workbook - One sheet per dataset in the Excel workbook. A sheet which reaches the Excel
+           limit of 1,048,576 rows is continued on "<dataset> (2)", "<dataset> (3)" ...
+csv      - <export_dir>/<run>/<dataset>.csv
+jsonl    - <export_dir>/<run>/<dataset>.jsonl, one JSON object per row.
+parquet  - <export_dir>/<run>/<dataset>.parquet, written in row groups. Requires pyarrow.
+"""
+
+# Import Modules
+import csv
+import json
+import pathlib
+
+# Default location of the exported datasets
+EXPORT_DIR = "exports"
+# The export formats which can be selected
+EXPORT_FORMATS = ["workbook", "csv", "jsonl", "parquet"]
+# The maximum number of rows of an Excel sheet, including the header row
+MAX_SHEET_ROWS = 1048576
+# The number of rows buffered before a Parquet row group is written
+PARQUET_ROW_GROUP = 65536
+# The datasets and their headers, in the order the workbook tabs are created
+DATASETS = {
+    "Facts": [
+        "Hostname",
+        "Vendor",
+        "Model",
+        "OS Version",
+        "Serial Number",
+        "Uptime (seconds)",
+    ],
+    "Interfaces": [
+        "Name",
+        "Interface Name",
+        "Interface Description",
+        "Interface Up",
+        "Interface Enabled",
+    ],
+    "Interfaces_IP": [
+        "Name",
+        "Interface Name",
+        "IPv4 Address",
+        "IPv4 Prefix Length",
+        "IPv6 Address",
+        "IPv6 Prefix Length",
+    ],
+    "LLDP": [
+        "Local Hostname",
+        "Local Port",
+        "Remote Hostname",
+        "Remote Port",
+    ],
+    "Users": ["Hostname", "Username", "Level", "Password", "SSH Keys"],
+}
+
+
+class WorkbookExporter:
+    """
+    Writes each dataset to a sheet of an openpyxl workbook, splitting sheets which
+    reach the Excel row limit.
+    """
+
+    def __init__(self, wb, max_rows=MAX_SHEET_ROWS):
+        self.wb = wb
+        self.max_rows = max_rows
+        self.sheets = {}
+
+    def open(self, dataset, headers):
+        """
+        This function creates the first sheet of a dataset and writes the header row.
+        :param dataset: The name of the dataset.
+        :param headers: A list of the column headers.
+        :return:
+        """
+        self.sheets[dataset] = {"headers": headers, "count": 0}
+        self._new_sheet(dataset)
+
+    def _new_sheet(self, dataset):
+        sheet = self.sheets[dataset]
+        sheet["count"] += 1
+        title = dataset if sheet["count"] == 1 else f"{dataset} ({sheet['count']})"
+        sheet["ws"] = self.wb.create_sheet(title)
+        sheet["ws"].append(sheet["headers"])
+        sheet["rows"] = 1
+
+    def write_rows(self, dataset, rows):
+        """
+        This function appends rows to the current sheet of a dataset.
+        :param dataset: The name of the dataset.
+        :param rows: A list of rows, each a list of values in header order.
+        :return:
+        """
+        sheet = self.sheets[dataset]
+        for row in rows:
+            if sheet["rows"] >= self.max_rows:
+                self._new_sheet(dataset)
+            sheet["ws"].append(row)
+            sheet["rows"] += 1
+
+    def close(self):
+        """
+        The workbook is saved by create_workbook, along with any extra sheets.
+        :return: An empty list, as no files are written by the exporter itself.
+        """
+        return []
+
+
+class CsvExporter:
+    """
+    Writes each dataset to a CSV file.
+    """
+
+    extension = ".csv"
+
+    def __init__(self, output_dir):
+        self.output_dir = pathlib.Path(output_dir)
+        self.files = {}
+
+    def path(self, dataset):
+        return self.output_dir / (dataset + self.extension)
+
+    def open(self, dataset, headers):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        f = open(self.path(dataset), "w", newline="")
+        self.files[dataset] = (f, csv.writer(f))
+        self.files[dataset][1].writerow(headers)
+
+    def write_rows(self, dataset, rows):
+        f, writer = self.files[dataset]
+        writer.writerows(rows)
+        # Flush after each host, so the file can be followed while the run goes on
+        f.flush()
+
+    def close(self):
+        for f, _ in self.files.values():
+            f.close()
+        return [str(self.path(dataset)) for dataset in self.files]
+
+
+class JsonLinesExporter(CsvExporter):
+    """
+    Writes each dataset to a JSON Lines file, with one object per row keyed by header.
+    """
+
+    extension = ".jsonl"
+
+    def open(self, dataset, headers):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.files[dataset] = (open(self.path(dataset), "w"), headers)
+
+    def write_rows(self, dataset, rows):
+        f, headers = self.files[dataset]
+        f.writelines(
+            json.dumps(dict(zip(headers, row)), default=str) + "\n" for row in rows
+        )
+        f.flush()
+
+
+class ParquetExporter(CsvExporter):
+    """
+    Writes each dataset to a Parquet file, one row group per PARQUET_ROW_GROUP rows.
+    Every column is written as a string, as the types of a column can differ between
+    platforms, i.e. the privilege level of a user.
+    """
+
+    extension = ".parquet"
+
+    def __init__(self, output_dir, row_group=PARQUET_ROW_GROUP):
+        import pyarrow
+
+        super().__init__(output_dir)
+        self.row_group = row_group
+        self.pyarrow = pyarrow
+
+    def open(self, dataset, headers):
+        import pyarrow.parquet
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        schema = self.pyarrow.schema(
+            [(header, self.pyarrow.string()) for header in headers]
+        )
+        writer = pyarrow.parquet.ParquetWriter(str(self.path(dataset)), schema)
+        self.files[dataset] = (writer, schema, [])
+
+    def write_rows(self, dataset, rows):
+        _, _, buffer = self.files[dataset]
+        buffer.extend(rows)
+        if len(buffer) >= self.row_group:
+            self._write_buffer(dataset)
+
+    def _write_buffer(self, dataset):
+        writer, schema, buffer = self.files[dataset]
+        if not buffer:
+            return
+        columns = [
+            self.pyarrow.array(
+                [None if row[i] is None else str(row[i]) for row in buffer],
+                type=self.pyarrow.string(),
+            )
+            for i in range(len(schema))
+        ]
+        writer.write_table(self.pyarrow.Table.from_arrays(columns, schema=schema))
+        buffer.clear()
+
+    def close(self):
+        for dataset, (writer, _, _) in self.files.items():
+            self._write_buffer(dataset)
+            writer.close()
+        return [str(self.path(dataset)) for dataset in self.files]
+
+
+class Exports:
+    """
+    Fans the rows of each dataset out to every selected exporter.
+    """
+
+    def __init__(self, exporters):
+        self.exporters = exporters
+
+    def open(self, datasets=DATASETS):
+        """
+        This function opens every dataset on every exporter.
+        :param datasets: A dictionary of dataset name to its headers.
+        :return:
+        """
+        for dataset, headers in datasets.items():
+            for exporter in self.exporters:
+                exporter.open(dataset, headers)
+
+    def write_rows(self, dataset, rows):
+        """
+        This function writes the rows of a host to every exporter.
+        :param dataset: The name of the dataset.
+        :param rows: A list of rows, each a list of values in header order.
+        :return:
+        """
+        if not rows:
+            return
+        for exporter in self.exporters:
+            exporter.write_rows(dataset, rows)
+
+    def close(self):
+        """
+        This function closes every exporter.
+        :return: A list of the files written.
+        """
+        paths = []
+        for exporter in self.exporters:
+            paths.extend(exporter.close())
+        return paths
+
+
+def build_exports(formats, wb=None, output_dir=EXPORT_DIR):
+    """
+    This function creates the exporters for the selected formats.
+    :param formats: A list of export formats, i.e. ["workbook", "csv"]
+    :param wb: The openpyxl workbook, used by the workbook format.
+    :param output_dir: The directory the file formats are written to.
+    :return: An Exports object.
+    """
+    classes = {
+        "csv": CsvExporter,
+        "jsonl": JsonLinesExporter,
+        "parquet": ParquetExporter,
+    }
+    exporters = []
+    for export_format in formats:
+        if export_format == "workbook":
+            exporters.append(WorkbookExporter(wb))
+        else:
+            exporters.append(classes[export_format](output_dir))
+    return Exports(exporters)
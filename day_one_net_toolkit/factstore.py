@@ -0,0 +1,93 @@
+"""
+Functions used to read and write the getters saved by day-one-toolkit.py, using the
+facts/<hostname>/<getter>.json directory convention. This lets the results of a
+previous discovery be re-used without connecting to the devices again.
+"""
+
+# Import Modules
+import concurrent.futures
+import json
+import os
+import pathlib
+import time
+
+# Default facts directory
+FACT_DIR = "facts"
+# Default number of threads used to read the facts directory
+READ_WORKERS = 16
+
+
+def fact_file(fact_dir, hostname, getter):
+    """
+    This function returns the path of a getter file, i.e. facts/<hostname>/<getter>.json
+    :param fact_dir: The directory where the getters are stored.
+    :param hostname: The name of the host in the inventory.
+    :param getter: The name of the NAPALM getter.
+    :return: The path as a string.
+    """
+    return fact_dir + "/" + hostname + "/" + getter + ".json"
+
+
+def load_getter(fact_dir, hostname, getter, max_age=None):
+    """
+    This function loads a single getter file from the facts directory.
+    :param fact_dir: The directory where the getters are stored.
+    :param hostname: The name of the host in the inventory.
+    :param getter: The name of the NAPALM getter.
+    :param max_age: The maximum age of the file in seconds. Older files are stale.
+    :return: The getter result, or None if the file is missing, stale or invalid.
+    """
+    path = fact_file(fact_dir, hostname, getter)
+    try:
+        # Treat files older than the maximum age as missing
+        if max_age is not None and time.time() - os.stat(path).st_mtime > max_age:
+            return None
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_getter(fact_dir, hostname, getter, result):
+    """
+    This function saves a getter result to the facts directory, using the same
+    format as day-one-toolkit.py.
+    :param fact_dir: The directory where the getters are stored.
+    :param hostname: The name of the host in the inventory.
+    :param getter: The name of the NAPALM getter.
+    :param result: The getter result.
+    :return:
+    """
+    # Create host directory and/or check that it exists
+    pathlib.Path(fact_dir + "/" + hostname).mkdir(parents=True, exist_ok=True)
+    with open(fact_file(fact_dir, hostname, getter), "w") as f:
+        f.write(json.dumps(result, indent=2))
+
+
+def load_fact_store(fact_dir, hostnames, getters, max_age=None, workers=READ_WORKERS):
+    """
+    This function loads the getters of many hosts from the facts directory, reading
+    the files in parallel.
+    :param fact_dir: The directory where the getters are stored.
+    :param hostnames: A list of host names to load.
+    :param getters: A list of NAPALM getters to load.
+    :param max_age: The maximum age of the files in seconds. Older files are stale.
+    :param workers: The number of threads used to read the files.
+    :return: A tuple of the results as {getter: {hostname: result}} and a
+    list of the (hostname, getter) pairs which are missing or stale.
+    """
+    # Empty dictionary and list which will be populated as the files are read
+    store = {getter: {} for getter in getters}
+    missing = []
+    pairs = [(hostname, getter) for hostname in hostnames for getter in getters]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        # map() returns the results in the same order as the pairs
+        results = executor.map(
+            lambda pair: load_getter(fact_dir, pair[0], pair[1], max_age), pairs
+        )
+        for (hostname, getter), result in zip(pairs, results):
+            if result is None:
+                missing.append((hostname, getter))
+            else:
+                store[getter][hostname] = result
+    return store, missing
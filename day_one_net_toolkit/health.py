@@ -0,0 +1,326 @@
+"""
+A health scan of the optics and environment getters of the fleet.
+
+The nested getter results are flattened into one column per value across every host,
+i.e. the Rx power of every channel of every transceiver, and each threshold is checked
+with numpy over the whole column at once. The thresholds are set in inventory/health.yaml.
+
+Health_Ports - The transceivers whose light levels or bias current are out of range.
+Health_Hosts - The temperatures, CPU and memory out of range, and failed PSUs and fans.
+
+It can also be run from the command line against a facts directory:
+
+python -m day_one_net_toolkit.health --export health
+"""
+
+# Import Modules
+import argparse
+import os
+import time
+from ruamel.yaml import YAML
+from day_one_net_toolkit.exporters import build_exports
+from day_one_net_toolkit.factstore import FACT_DIR, READ_WORKERS, load_fact_store
+
+# Default health thresholds file
+HEALTH_FILE = "inventory/health.yaml"
+# The getters the health scan is built from
+HEALTH_GETTERS = ["optics", "environment"]
+# The thresholds used for the checks which aren't in the thresholds file
+DEFAULT_CHECKS = {
+    "rx_power": {"min": -14.0, "max": 2.0},
+    "tx_power": {"min": -8.0, "max": 3.0},
+    "laser_bias": {},
+    "temperature": {"max": 70.0},
+    "cpu": {"max": 80.0},
+    "memory": {"max": 90.0},
+}
+# The checks of each transceiver channel, and the optics value they read
+PORT_CHECKS = {
+    "rx_power": "input_power",
+    "tx_power": "output_power",
+    "laser_bias": "laser_bias_current",
+}
+# The health datasets and their headers
+HEALTH_DATASETS = {
+    "Health_Ports": ["Hostname", "Port", "Channel", "Check", "Value", "Limit"],
+    "Health_Hosts": ["Hostname", "Component", "Check", "Value", "Limit"],
+}
+
+
+def load_thresholds(health_file=HEALTH_FILE):
+    """
+    This function loads the health thresholds from a YAML file. Checks which aren't in
+    the file keep their default thresholds, and a missing file uses the defaults.
+    :param health_file: The path to the health YAML file.
+    :return: A dictionary with the "checks", "ignore_hosts" and "ignore_ports" keys.
+    """
+    try:
+        with open(health_file) as f:
+            health = YAML(typ="safe").load(f) or {}
+    except FileNotFoundError:
+        health = {}
+    checks = {check: dict(limits) for check, limits in DEFAULT_CHECKS.items()}
+    for check, limits in (health.get("checks") or {}).items():
+        checks[check] = {
+            bound: float(limit)
+            for bound, limit in (limits or {}).items()
+            if bound in ("min", "max") and limit is not None
+        }
+    ignore = health.get("ignore") or {}
+    return {
+        "checks": checks,
+        "ignore_hosts": set(ignore.get("hosts") or []),
+        "ignore_ports": {
+            (hostname, port)
+            for hostname, ports in (ignore.get("ports") or {}).items()
+            for port in ports or []
+        },
+    }
+
+
+def reading(value):
+    """
+    This function returns a reading of the optics getter, which is a dictionary of
+    instant, avg, min and max values on most platforms.
+    :param value: The reading.
+    :return: The instant reading, or the average, or None when there is none.
+    """
+    if isinstance(value, dict):
+        value = value.get("instant", value.get("avg"))
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class HealthColumns:
+    """
+    The optics and environment readings of the fleet, flattened into columns.
+    """
+
+    def __init__(self, ignore_hosts=(), ignore_ports=()):
+        self.ignore_hosts = set(ignore_hosts)
+        self.ignore_ports = set(ignore_ports)
+        # One row per transceiver channel, with a column of values per port check
+        self.ports = {"host": [], "port": [], "channel": []}
+        self.ports.update({check: [] for check in PORT_CHECKS})
+        # One row per host component, i.e. a temperature sensor or CPU
+        self.components = {"host": [], "component": [], "check": [], "value": []}
+        # One row per power supply and fan, with whether it is working
+        self.states = {"host": [], "component": [], "check": [], "ok": []}
+
+    def add_host(self, hostname, optics=None, environment=None):  # noqa
+        """
+        This function adds the optics and environment of a host to the columns.
+        :param hostname: The name of the host in the inventory.
+        :param optics: The result of the optics getter for the host, if any.
+        :param environment: The result of the environment getter for the host, if any.
+        :return:
+        """
+        if hostname in self.ignore_hosts:
+            return
+        ports = self.ports
+        for port, port_optics in (optics or {}).items():
+            if (hostname, port) in self.ignore_ports:
+                continue
+            channels = (port_optics.get("physical_channels") or {}).get("channel") or []
+            for channel in channels:
+                state = channel.get("state") or {}
+                ports["host"].append(hostname)
+                ports["port"].append(port)
+                ports["channel"].append(channel.get("index", 0))
+                for check, value in PORT_CHECKS.items():
+                    ports[check].append(reading(state.get(value)))
+        environment = environment or {}
+        for sensor, temperature in (environment.get("temperature") or {}).items():
+            self._component(
+                hostname, sensor, "temperature", temperature.get("temperature")
+            )
+            if temperature.get("is_alert") or temperature.get("is_critical"):
+                self._state(hostname, sensor, "temperature_alert", False)
+        for cpu, usage in (environment.get("cpu") or {}).items():
+            self._component(hostname, "cpu " + str(cpu), "cpu", usage.get("%usage"))
+        memory = environment.get("memory") or {}
+        used = reading(memory.get("used_ram"))
+        available = reading(memory.get("available_ram"))
+        if used is not None and available:
+            # Some platforms report the free memory as available, others the total
+            total = available if available > used else available + used
+            self._component(hostname, "memory", "memory", used * 100.0 / total)
+        for psu, power in (environment.get("power") or {}).items():
+            self._state(hostname, psu, "psu", power.get("status") is not False)
+        for fan, status in (environment.get("fans") or {}).items():
+            self._state(hostname, fan, "fan", status.get("status") is not False)
+
+    def _component(self, hostname, component, check, value):
+        self.components["host"].append(hostname)
+        self.components["component"].append(str(component))
+        self.components["check"].append(check)
+        self.components["value"].append(reading(value))
+
+    def _state(self, hostname, component, check, ok):
+        self.states["host"].append(hostname)
+        self.states["component"].append(str(component))
+        self.states["check"].append(check)
+        self.states["ok"].append(ok)
+
+
+def out_of_range(values, limits):
+    """
+    This function finds the values outside of the limits of a check. Missing values,
+    which are NaN, are never out of range.
+    :param values: A numpy array of float values.
+    :param limits: A dictionary with the optional "min" and "max" limits.
+    :return: A tuple of the indexes out of range, and the limit each one broke.
+    """
+    import numpy as np
+
+    low = values < limits["min"] if "min" in limits else np.zeros(len(values), bool)
+    high = values > limits["max"] if "max" in limits else np.zeros(len(values), bool)
+    indexes = np.flatnonzero(low | high)
+    broken = np.where(low[indexes], limits.get("min"), limits.get("max"))
+    return indexes, broken
+
+
+def scan(columns, checks=DEFAULT_CHECKS):
+    """
+    This function checks every reading of the fleet against the thresholds.
+    :param columns: The HealthColumns object.
+    :param checks: A dictionary of check name to its "min" and/or "max" limits.
+    :return: A tuple of the Health_Ports rows and the Health_Hosts rows.
+    """
+    import numpy as np
+
+    port_rows = []
+    ports = columns.ports
+    for check in PORT_CHECKS:
+        values = np.array(ports[check], dtype=float)
+        indexes, broken = out_of_range(values, checks.get(check, {}))
+        for i, limit in zip(indexes, broken):
+            port_rows.append(
+                [
+                    ports["host"][i],
+                    ports["port"][i],
+                    ports["channel"][i],
+                    check,
+                    round(float(values[i]), 2),
+                    limit,
+                ]
+            )
+    host_rows = []
+    components = columns.components
+    values = np.array(components["value"], dtype=float)
+    check_column = np.array(components["check"], dtype=object)
+    for check in set(components["check"]):
+        selected = np.flatnonzero(check_column == check)
+        indexes, broken = out_of_range(values[selected], checks.get(check, {}))
+        for i, limit in zip(selected[indexes], broken):
+            host_rows.append(
+                [
+                    components["host"][i],
+                    components["component"][i],
+                    check,
+                    round(float(values[i]), 2),
+                    limit,
+                ]
+            )
+    states = columns.states
+    failed = np.flatnonzero(~np.array(states["ok"], dtype=bool))
+    for i in failed:
+        host_rows.append(
+            [
+                states["host"][i],
+                states["component"][i],
+                states["check"][i],
+                "failed",
+                "",
+            ]
+        )
+    port_rows.sort(key=lambda row: (row[0], row[1], row[2], row[3]))
+    host_rows.sort(key=lambda row: (row[0], row[2], row[1]))
+    return port_rows, host_rows
+
+
+def load_health(
+    fact_dir=FACT_DIR, hostnames=None, thresholds=None, workers=READ_WORKERS
+):
+    """
+    This function flattens the optics and environment getters in a facts directory.
+    :param fact_dir: The directory where the getters are stored.
+    :param hostnames: A list of host names to load. Defaults to every host directory.
+    :param thresholds: The thresholds, as returned by load_thresholds, for the ignore lists.
+    :param workers: The number of threads used to read the files.
+    :return: A HealthColumns object.
+    """
+    if hostnames is None:
+        hostnames = sorted(
+            entry.name for entry in os.scandir(fact_dir) if entry.is_dir()
+        )
+    thresholds = thresholds or load_thresholds()
+    store, _ = load_fact_store(fact_dir, hostnames, HEALTH_GETTERS, workers=workers)
+    columns = HealthColumns(thresholds["ignore_hosts"], thresholds["ignore_ports"])
+    for hostname in hostnames:
+        columns.add_host(
+            hostname,
+            store["optics"].get(hostname),
+            store["environment"].get(hostname),
+        )
+    return columns
+
+
+def main():
+    """
+    This function is the command line interface to the health scan.
+    :return:
+    """
+    parser = argparse.ArgumentParser(
+        description="Scan the optics and environment of the fleet from a facts directory."
+    )
+    parser.add_argument(
+        "--facts-dir",
+        default=FACT_DIR,
+        help="The facts directory saved by day-one-toolkit.py (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--health-file",
+        default=HEALTH_FILE,
+        help="The health thresholds YAML file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="DIR",
+        help="Export the Health_Ports and Health_Hosts datasets as CSV files to a directory",
+    )
+    args = parser.parse_args()
+    start = time.perf_counter()
+    thresholds = load_thresholds(args.health_file)
+    columns = load_health(args.facts_dir, thresholds=thresholds)
+    port_rows, host_rows = scan(columns, thresholds["checks"])
+    for hostname, port, channel, check, value, limit in port_rows:
+        print(
+            f"{check.upper()} : {hostname} {port} channel {channel} - {value} ({limit})"
+        )
+    for hostname, component, check, value, limit in host_rows:
+        print(f"{check.upper()} : {hostname} {component} - {value} ({limit})")
+    print(
+        "Channels: "
+        + str(len(columns.ports["host"]))
+        + " - Components: "
+        + str(len(columns.components["host"]) + len(columns.states["host"]))
+        + " - Port exceptions: "
+        + str(len(port_rows))
+        + " - Host exceptions: "
+        + str(len(host_rows))
+        + f" - {(time.perf_counter() - start) * 1000:.0f} ms"
+    )
+    if args.export:
+        exports = build_exports(["csv"], output_dir=args.export)
+        exports.open(HEALTH_DATASETS)
+        exports.write_rows("Health_Ports", port_rows)
+        exports.write_rows("Health_Hosts", host_rows)
+        for path in exports.close():
+            print("Exceptions exported to: " + str(path))
+
+
+if __name__ == "__main__":
+    main()
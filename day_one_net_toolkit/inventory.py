@@ -0,0 +1,230 @@
+"""
+A cached Nornir inventory, so large inventories are not re-parsed from YAML on every run.
+
+The first run loads hosts.yaml, groups.yaml and defaults.yaml with the Nornir
+SimpleInventory and saves the compiled inventory, along with a host to platform index,
+to cache/inventory.pickle. Later runs load the compiled inventory while the size and
+modification time of each file are unchanged. Files which have only been touched are
+detected by their SHA-256 hash, so they don't cause the inventory to be re-parsed.
+
+The platform index also replaces nr.filter(platform=...), which works out the platform
+of every host through its groups each time it is called.
+"""
+
+# Import Modules
+import copy
+import hashlib
+import os
+import pathlib
+import pickle  # nosec - the cache is only ever written by the toolkit itself
+
+# Default location of the inventory files
+INVENTORY_FILES = {
+    "host_file": "inventory/hosts.yaml",
+    "group_file": "inventory/groups.yaml",
+    "defaults_file": "inventory/defaults.yaml",
+}
+# Default location of the compiled inventory
+INVENTORY_CACHE_FILE = "cache/inventory.pickle"
+# Changed whenever the layout of the compiled inventory changes
+CACHE_FORMAT = 1
+
+# The platform of each cached host, as {hostname: (host object, platform)}
+_platforms = {}
+
+
+def file_signature(path):
+    """
+    This function returns the size and modification time of a file.
+    :param path: The path of the file.
+    :return: A (size, mtime in ns) tuple, or None if the file doesn't exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def file_hash(path):
+    """
+    This function returns the SHA-256 hash of a file.
+    :param path: The path of the file.
+    :return: The hex digest, or None if the file doesn't exist.
+    """
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def cache_key(files):
+    """
+    This function returns the key the compiled inventory is stored against.
+    :param files: A list of the inventory file paths.
+    :return: A dictionary of path to {"signature", "hash"}.
+    """
+    return {
+        path: {"signature": file_signature(path), "hash": file_hash(path)}
+        for path in files
+    }
+
+
+def key_matches(key, files):
+    """
+    This function checks whether the inventory files still match a cache key. The
+    hashes are only checked for files whose size or modification time has changed.
+    :param key: The key saved with the compiled inventory.
+    :param files: A list of the inventory file paths.
+    :return: A tuple of whether the files match, and whether the key needs re-saving.
+    """
+    if sorted(key) != sorted(files):
+        return False, False
+    touched = False
+    for path in files:
+        if file_signature(path) == key[path]["signature"]:
+            continue
+        if file_hash(path) != key[path]["hash"]:
+            return False, False
+        touched = True
+    return True, touched
+
+
+def load_compiled_inventory(cache_file, files):
+    """
+    This function loads the compiled inventory, if it matches the inventory files.
+    :param cache_file: The path of the compiled inventory.
+    :param files: A list of the inventory file paths.
+    :return: The cache dictionary, or None if it is missing, out of date or unreadable.
+    """
+    try:
+        with open(cache_file, "rb") as f:
+            cache = pickle.load(f)  # nosec - the cache is only written by the toolkit
+    except Exception:  # nosec - any failure just means the inventory is re-parsed
+        return None
+    if not isinstance(cache, dict) or cache.get("format") != CACHE_FORMAT:
+        return None
+    matches, touched = key_matches(cache["key"], files)
+    if not matches:
+        return None
+    # Save the new modification times, so the hashes aren't checked again next time
+    if touched:
+        cache["key"] = cache_key(files)
+        save_compiled_inventory(cache, cache_file)
+    return cache
+
+
+def save_compiled_inventory(cache, cache_file):
+    """
+    This function saves the compiled inventory, replacing the file atomically so
+    sharded runs starting at the same time never read a partial file.
+    :param cache: The cache dictionary.
+    :param cache_file: The path of the compiled inventory.
+    :return:
+    """
+    pathlib.Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file + "." + str(os.getpid()) + ".tmp"
+    with open(tmp_file, "wb") as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cache_file)
+
+
+def compile_inventory(host_file, group_file, defaults_file):
+    """
+    This function parses the inventory files and builds the platform index.
+    :param host_file: The path of the hosts.yaml file.
+    :param group_file: The path of the groups.yaml file.
+    :param defaults_file: The path of the defaults.yaml file.
+    :return: A tuple of the Nornir Inventory and a {hostname: platform} dictionary.
+    """
+    from nornir.plugins.inventory.simple import SimpleInventory
+
+    inventory = SimpleInventory(
+        host_file=host_file, group_file=group_file, defaults_file=defaults_file
+    ).load()
+    platforms = {name: host.platform for name, host in inventory.hosts.items()}
+    return inventory, platforms
+
+
+class CachedInventory:
+    """
+    A Nornir inventory plugin which loads the SimpleInventory files through the
+    compiled inventory cache. It is registered as "CachedInventory" by init_nornir.
+    """
+
+    def __init__(
+        self,
+        host_file=INVENTORY_FILES["host_file"],
+        group_file=INVENTORY_FILES["group_file"],
+        defaults_file=INVENTORY_FILES["defaults_file"],
+        cache_file=INVENTORY_CACHE_FILE,
+    ):
+        self.files = [host_file, group_file, defaults_file]
+        self.cache_file = cache_file
+
+    def load(self):
+        """
+        This function loads the inventory, from the cache when it is up to date.
+        :return: The Nornir Inventory object.
+        """
+        cache = load_compiled_inventory(self.cache_file, self.files)
+        if cache is None:
+            # Work out the key before parsing, so a file edited meanwhile is re-parsed next time
+            key = cache_key(self.files)
+            inventory, platforms = compile_inventory(*self.files)
+            cache = {
+                "format": CACHE_FORMAT,
+                "key": key,
+                "inventory": inventory,
+                "platforms": platforms,
+            }
+            save_compiled_inventory(cache, self.cache_file)
+        inventory = cache["inventory"]
+        for name, host in inventory.hosts.items():
+            _platforms[name] = (host, cache["platforms"][name])
+        return inventory
+
+
+def host_platform(host):
+    """
+    This function returns the platform of a host, using the platform index when the
+    host was loaded from the compiled inventory.
+    :param host: The Nornir host object.
+    :return: The platform name.
+    """
+    entry = _platforms.get(host.name)
+    if entry is not None and entry[0] is host:
+        return entry[1]
+    return host.platform
+
+
+def platform_index(nr):
+    """
+    This function groups the hosts of a Nornir object by platform, in a single pass.
+    :param nr: The (filtered) Nornir object.
+    :return: A dictionary of platform to a list of host names, in inventory order.
+    """
+    index = {}
+    for name, host in nr.inventory.hosts.items():
+        index.setdefault(host_platform(host), []).append(name)
+    return index
+
+
+def host_subset(nr, hostnames):
+    """
+    This function narrows a Nornir object down to a list of hosts. Unlike nr.filter(),
+    only the listed hosts are visited, so narrowing down to a single host is instant.
+    :param nr: The Nornir object.
+    :param hostnames: A list of the host names to keep.
+    :return: A new Nornir object, sharing the runner and configuration of nr.
+    """
+    from nornir.core.inventory import Hosts, Inventory
+
+    subset = copy.copy(nr)
+    subset.inventory = Inventory(
+        hosts=Hosts({name: nr.inventory.hosts[name] for name in hostnames}),
+        groups=nr.inventory.groups,
+        defaults=nr.inventory.defaults,
+    )
+    return subset
@@ -0,0 +1,288 @@
+"""
+A fleet-wide index of the IP addresses collected with the interfaces_ip getter.
+
+Addresses are stored as integers in a sorted list, so "which interface owns this
+address" is a binary search, and duplicate addresses and overlapping subnets are
+found with a single sorted sweep. Subnet lookups use one hash table per prefix
+length, so they cost at most one lookup per prefix length in use.
+
+It can also be run from the command line against a facts directory:
+
+python -m day_one_net_toolkit.ipindex --lookup 10.0.0.1 --duplicates --overlaps
+"""
+
+# Import Modules
+import argparse
+import bisect
+import ipaddress
+import os
+from day_one_net_toolkit.factstore import FACT_DIR, READ_WORKERS, load_fact_store
+
+# Number of bits in an address, per IP version
+ADDRESS_BITS = {4: 32, 6: 128}
+
+
+def to_address(version, address):
+    """
+    This function converts an integer back to an address object.
+    :param version: The IP version, 4 or 6.
+    :param address: The address as an integer.
+    :return: An IPv4Address or IPv6Address object.
+    """
+    if version == 4:
+        return ipaddress.IPv4Address(address)
+    return ipaddress.IPv6Address(address)
+
+
+def parse_address(address):
+    """
+    This function converts an address string to an address object. The zone of an
+    IPv6 link-local address is dropped, i.e. "fe80::1%Gi0/0" becomes fe80::1.
+    :param address: The address as a string.
+    :return: An IPv4Address or IPv6Address object.
+    """
+    return ipaddress.ip_address(str(address).split("%")[0])
+
+
+def network_bounds(version, address, prefix_length):
+    """
+    This function returns the first and last address of the subnet of an address.
+    :param version: The IP version, 4 or 6.
+    :param address: The address as an integer.
+    :param prefix_length: The prefix length of the subnet.
+    :return: A tuple of the first and last address as integers.
+    """
+    host_bits = ADDRESS_BITS[version] - prefix_length
+    start = (address >> host_bits) << host_bits
+    return start, start + (1 << host_bits) - 1
+
+
+class IPIndex:
+    """
+    A sorted, prefix-aware index of the addresses configured across the fleet.
+
+    Each record is a (version, address, prefix length, hostname, interface) tuple.
+    Call build() after adding addresses and before querying the index.
+    """
+
+    def __init__(self):
+        # Records in the order they were added, sorted by build()
+        self.records = []
+        # (version, address) of each sorted record, used for binary searches
+        self.keys = []
+        # (version, prefix length) -> subnet start -> list of records
+        self.subnets = {}
+        # Prefix lengths in use per version, longest first
+        self.prefix_lengths = {4: [], 6: []}
+
+    def add(self, hostname, interface, address, prefix_length):
+        """
+        This function adds a single address to the index.
+        :param hostname: The name of the host in the inventory.
+        :param interface: The name of the interface the address is configured on.
+        :param address: The address as a string.
+        :param prefix_length: The prefix length of the address.
+        :return:
+        """
+        ip = parse_address(address)
+        self.records.append(
+            (ip.version, int(ip), int(prefix_length), str(hostname), str(interface))
+        )
+
+    def add_host(self, hostname, interfaces_ip):
+        """
+        This function adds every IPv4 and IPv6 address of a host to the index.
+        :param hostname: The name of the host in the inventory.
+        :param interfaces_ip: The result of the interfaces_ip getter for the host.
+        :return:
+        """
+        for interface, families in (interfaces_ip or {}).items():
+            for family in ("ipv4", "ipv6"):
+                for address, details in (families.get(family) or {}).items():
+                    self.add(hostname, interface, address, details["prefix_length"])
+
+    def build(self):
+        """
+        This function sorts the records and builds the subnet tables.
+        :return: The index, so calls can be chained.
+        """
+        self.records.sort()
+        self.keys = [(record[0], record[1]) for record in self.records]
+        self.subnets = {}
+        for record in self.records:
+            version, address, prefix_length = record[:3]
+            start = network_bounds(version, address, prefix_length)[0]
+            table = self.subnets.setdefault((version, prefix_length), {})
+            table.setdefault(start, []).append(record)
+        for version in self.prefix_lengths:
+            self.prefix_lengths[version] = sorted(
+                (length for v, length in self.subnets if v == version), reverse=True
+            )
+        return self
+
+    def owners(self, address):
+        """
+        This function returns the interfaces an address is configured on.
+        :param address: The address as a string.
+        :return: A list of records.
+        """
+        ip = parse_address(address)
+        key = (ip.version, int(ip))
+        first = bisect.bisect_left(self.keys, key)
+        last = bisect.bisect_right(self.keys, key)
+        return self.records[first:last]
+
+    def containing(self, address):
+        """
+        This function returns the records whose subnet contains an address, longest
+        prefix first. i.e. the interfaces an address would be reached through.
+        :param address: The address as a string.
+        :return: A list of records.
+        """
+        ip = parse_address(address)
+        matches = []
+        for prefix_length in self.prefix_lengths[ip.version]:
+            start = network_bounds(ip.version, int(ip), prefix_length)[0]
+            matches.extend(self.subnets[(ip.version, prefix_length)].get(start, []))
+        return matches
+
+    def duplicates(self):
+        """
+        This function returns the addresses configured on more than one interface.
+        Link-local addresses are ignored, as they are only unique per link.
+        :return: A list of (address, [records]) tuples.
+        """
+        duplicates = []
+        first = 0
+        while first < len(self.records):
+            last = bisect.bisect_right(self.keys, self.keys[first], lo=first)
+            group = self.records[first:last]
+            owners = {(record[3], record[4]) for record in group}
+            if len(owners) > 1 and not self._link_local(group[0]):
+                duplicates.append((self._address(group[0]), group))
+            first = last
+        return duplicates
+
+    def overlaps(self):
+        """
+        This function returns the subnets which sit inside a different, larger subnet,
+        i.e. a /25 on one interface and a /24 on another. Identical subnets on different
+        hosts are not reported, as they are the same segment.
+        :return: A list of (outer subnet, inner subnet) string tuples.
+        """
+        # Unique subnets as (version, start, -end, prefix length), so larger subnets sort first
+        subnets = sorted(
+            {
+                (version, start, -network_bounds(version, start, length)[1], length)
+                for (version, length), table in self.subnets.items()
+                for start in table
+                if not to_address(version, start).is_link_local
+            }
+        )
+        overlaps = []
+        # Stack of the subnets which enclose the current subnet
+        stack = []
+        for subnet in subnets:
+            version, start = subnet[0], subnet[1]
+            while stack and (stack[-1][0] != version or -stack[-1][2] < start):
+                stack.pop()
+            if stack:
+                overlaps.append((self._subnet(stack[-1]), self._subnet(subnet)))
+            stack.append(subnet)
+        return overlaps
+
+    @staticmethod
+    def _address(record):
+        return str(to_address(record[0], record[1]))
+
+    @staticmethod
+    def _subnet(subnet):
+        return str(to_address(subnet[0], subnet[1])) + "/" + str(subnet[3])
+
+    @staticmethod
+    def _link_local(record):
+        return to_address(record[0], record[1]).is_link_local
+
+
+def build_ip_index(results):
+    """
+    This function builds an IP index from interfaces_ip results.
+    :param results: An iterable of (hostname, interfaces_ip result) tuples.
+    :return: A built IPIndex object.
+    """
+    index = IPIndex()
+    for hostname, interfaces_ip in results:
+        index.add_host(hostname, interfaces_ip)
+    return index.build()
+
+
+def load_ip_index(fact_dir=FACT_DIR, hostnames=None, workers=READ_WORKERS):
+    """
+    This function builds an IP index from the interfaces_ip.json files in a facts directory.
+    :param fact_dir: The directory where the getters are stored.
+    :param hostnames: A list of host names to load. Defaults to every host directory.
+    :param workers: The number of threads used to read the files.
+    :return: A built IPIndex object.
+    """
+    if hostnames is None:
+        hostnames = sorted(
+            entry.name for entry in os.scandir(fact_dir) if entry.is_dir()
+        )
+    store, _ = load_fact_store(fact_dir, hostnames, ["interfaces_ip"], workers=workers)
+    return build_ip_index(store["interfaces_ip"].items())
+
+
+def format_record(record):
+    """
+    This function formats a record for display, i.e. "host Ethernet1 10.0.0.1/24"
+    :param record: The record tuple.
+    :return: The formatted string.
+    """
+    address = to_address(record[0], record[1])
+    return f"{record[3]} {record[4]} {address}/{record[2]}"
+
+
+def main():
+    """
+    This function is the command line interface to the IP index.
+    :return:
+    """
+    parser = argparse.ArgumentParser(
+        description="Index the IP addresses of the fleet from a facts directory."
+    )
+    parser.add_argument(
+        "--facts-dir",
+        default=FACT_DIR,
+        help="The facts directory saved by day-one-toolkit.py (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--lookup",
+        metavar="ADDRESS",
+        action="append",
+        help="Show the interfaces which own or contain an address",
+    )
+    parser.add_argument(
+        "--duplicates", action="store_true", help="Show duplicate addresses"
+    )
+    parser.add_argument(
+        "--overlaps", action="store_true", help="Show overlapping subnets"
+    )
+    args = parser.parse_args()
+    index = load_ip_index(args.facts_dir)
+    print("Addresses: " + str(len(index.records)))
+    for address in args.lookup or []:
+        for record in index.owners(address):
+            print(f"OWNER : {address} - " + format_record(record))
+        for record in index.containing(address):
+            print(f"SUBNET : {address} - " + format_record(record))
+    if args.duplicates:
+        for address, records in index.duplicates():
+            owners = ", ".join(format_record(record) for record in records)
+            print(f"DUPLICATE : {address} - " + owners)
+    if args.overlaps:
+        for outer, inner in index.overlaps():
+            print(f"OVERLAP : {inner} inside {outer}")
+
+
+if __name__ == "__main__":
+    main()
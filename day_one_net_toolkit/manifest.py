@@ -0,0 +1,315 @@
+"""
+Per-run manifests of the content hash of every getter and config collected, so the
+changes between two runs can be listed without comparing the files themselves.
+
+day-one-toolkit.py writes manifests/MANIFEST-<time>.json at the end of each run. The
+manifest holds {hostname: {item: hash}}, where an item is "facts/<getter>" or
+"configs/<type>". Hosts which weren't part of the run keep their hashes from the
+previous manifest. The content of each item is kept once per hash in manifests/objects/,
+so unified diffs can be produced for the changed items later.
+
+Getters which change on every run, and fields such as uptime, are left out of the
+hashes, so only real changes are reported.
+
+python -m day_one_net_toolkit.manifest --diffs
+"""
+
+# Import Modules
+import argparse
+import concurrent.futures
+import datetime as dt
+import difflib
+import glob
+import gzip
+import hashlib
+import json
+import os
+import pathlib
+from day_one_net_toolkit.factstore import FACT_DIR, READ_WORKERS
+
+# Default location of the manifests
+MANIFEST_DIR = "manifests"
+# Default configs directory
+CONFIG_DIR = "configs"
+# Getters which change on every run, so are not included in the manifest
+VOLATILE_GETTERS = {"interfaces_counters", "environment"}
+# Fields which change on every run, which are removed before hashing
+VOLATILE_FIELDS = {"uptime", "last_flapped", "age"}
+
+
+def strip_volatile(data):
+    """
+    This function removes the volatile fields from a getter result, at any depth.
+    :param data: The getter result.
+    :return: A copy of the result without the volatile fields.
+    """
+    if isinstance(data, dict):
+        return {
+            key: strip_volatile(value)
+            for key, value in data.items()
+            if key not in VOLATILE_FIELDS
+        }
+    if isinstance(data, list):
+        return [strip_volatile(value) for value in data]
+    return data
+
+
+def item_content(path):
+    """
+    This function reads a facts or configs file in the form that is hashed and diffed.
+    Getters are re-serialised with sorted keys, so key order doesn't count as a change.
+    :param path: The path of the file.
+    :return: The content as bytes, or None if the file can't be read.
+    """
+    try:
+        with open(path, "rb") as f:
+            content = f.read()
+        if path.endswith(".json"):
+            data = strip_volatile(json.loads(content))
+            content = json.dumps(data, indent=2, sort_keys=True).encode()
+        return content
+    except (OSError, ValueError):
+        return None
+
+
+def host_items(hostname, fact_dir=FACT_DIR, config_dir=CONFIG_DIR):
+    """
+    This function lists the facts and configs files of a host.
+    :param hostname: The name of the host in the inventory.
+    :param fact_dir: The directory where the getters are stored.
+    :param config_dir: The directory where the configs are stored.
+    :return: A list of (item, path) tuples, i.e. ("facts/users", "facts/host/users.json")
+    """
+    items = []
+    for directory, extension in [(fact_dir, ".json"), (config_dir, ".txt")]:
+        host_dir = os.path.join(directory, hostname)
+        if not os.path.isdir(host_dir):
+            continue
+        for entry in os.scandir(host_dir):
+            name = entry.name[: -len(extension)]
+            if not entry.name.endswith(extension) or name in VOLATILE_GETTERS:
+                continue
+            kind = "facts" if extension == ".json" else "configs"
+            items.append((kind + "/" + name, entry.path))
+    return sorted(items)
+
+
+def store_object(manifest_dir, digest, content):
+    """
+    This function stores the content of an item once per hash, compressed.
+    :param manifest_dir: The directory where the manifests are stored.
+    :param digest: The SHA-256 hash of the content.
+    :param content: The content as bytes.
+    :return:
+    """
+    path = pathlib.Path(manifest_dir, "objects", digest[:2], digest + ".gz")
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = str(path) + "." + str(os.getpid()) + ".tmp"
+    with gzip.open(tmp_file, "wb") as f:
+        f.write(content)
+    os.replace(tmp_file, path)
+
+
+def load_object(manifest_dir, digest):
+    """
+    This function loads the content of an item from the object store.
+    :param manifest_dir: The directory where the manifests are stored.
+    :param digest: The SHA-256 hash of the content.
+    :return: The content as text, or an empty string if it isn't stored.
+    """
+    try:
+        with gzip.open(
+            os.path.join(manifest_dir, "objects", digest[:2], digest + ".gz")
+        ) as f:
+            return f.read().decode(errors="replace")
+    except OSError:
+        return ""
+
+
+def hash_host(hostname, fact_dir, config_dir, manifest_dir):
+    """
+    This function hashes the facts and configs of a host, storing any new content.
+    :param hostname: The name of the host in the inventory.
+    :param fact_dir: The directory where the getters are stored.
+    :param config_dir: The directory where the configs are stored.
+    :param manifest_dir: The directory where the manifests are stored.
+    :return: A dictionary of item to hash.
+    """
+    hashes = {}
+    for item, path in host_items(hostname, fact_dir, config_dir):
+        content = item_content(path)
+        if content is None:
+            continue
+        digest = hashlib.sha256(content).hexdigest()
+        store_object(manifest_dir, digest, content)
+        hashes[item] = digest
+    return hashes
+
+
+def manifest_files(manifest_dir=MANIFEST_DIR):
+    """
+    This function lists the manifests, oldest first.
+    :param manifest_dir: The directory where the manifests are stored.
+    :return: A sorted list of manifest paths.
+    """
+    return sorted(glob.glob(os.path.join(manifest_dir, "MANIFEST-*.json")))
+
+
+def load_manifest(path):
+    """
+    This function loads a manifest.
+    :param path: The path of the manifest.
+    :return: A dictionary of hostname to {item: hash}.
+    """
+    with open(path) as f:
+        return json.load(f)["hosts"]
+
+
+def write_manifest(
+    hostnames,
+    manifest_dir=MANIFEST_DIR,
+    fact_dir=FACT_DIR,
+    config_dir=CONFIG_DIR,
+    workers=READ_WORKERS,
+):
+    """
+    This function writes the manifest of a run. The hosts of the run are hashed again,
+    and every other host is carried over from the previous manifest.
+    :param hostnames: A list of the host names collected in the run.
+    :param manifest_dir: The directory where the manifests are stored.
+    :param fact_dir: The directory where the getters are stored.
+    :param config_dir: The directory where the configs are stored.
+    :param workers: The number of threads used to read the files.
+    :return: A tuple of the new manifest path and the previous manifest path, or None.
+    """
+    pathlib.Path(manifest_dir).mkdir(parents=True, exist_ok=True)
+    previous = manifest_files(manifest_dir)
+    previous = previous[-1] if previous else None
+    hosts = load_manifest(previous) if previous else {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            lambda hostname: hash_host(hostname, fact_dir, config_dir, manifest_dir),
+            hostnames,
+        )
+        for hostname, hashes in zip(hostnames, results):
+            hosts[hostname] = hashes
+    created = dt.datetime.now()
+    path = os.path.join(
+        manifest_dir, "MANIFEST-" + created.strftime("%Y-%m-%d-%H-%M-%S") + ".json"
+    )
+    with open(path, "w") as f:
+        json.dump({"created": created.isoformat(), "hosts": hosts}, f, sort_keys=True)
+    return path, previous
+
+
+def compare_manifests(old, new):
+    """
+    This function lists the items which differ between two manifests.
+    :param old: The older manifest, as returned by load_manifest.
+    :param new: The newer manifest, as returned by load_manifest.
+    :return: A sorted list of (hostname, item, old hash, new hash) tuples. The old hash
+    is None for added items, and the new hash is None for removed items.
+    """
+    changes = []
+    for hostname in old.keys() | new.keys():
+        old_items = old.get(hostname, {})
+        new_items = new.get(hostname, {})
+        if old_items == new_items:
+            continue
+        for item in old_items.keys() | new_items.keys():
+            if old_items.get(item) != new_items.get(item):
+                changes.append(
+                    (hostname, item, old_items.get(item), new_items.get(item))
+                )
+    return sorted(changes)
+
+
+def change_label(old_hash, new_hash):
+    """
+    This function describes a change, i.e. ADDED, REMOVED or CHANGED.
+    """
+    if old_hash is None:
+        return "ADDED"
+    if new_hash is None:
+        return "REMOVED"
+    return "CHANGED"
+
+
+def unified_diff(manifest_dir, change):
+    """
+    This function produces the unified diff of a changed item. It runs in a worker process.
+    :param manifest_dir: The directory where the manifests are stored.
+    :param change: A (hostname, item, old hash, new hash) tuple.
+    :return: The diff as a string.
+    """
+    hostname, item, old_hash, new_hash = change
+    old = load_object(manifest_dir, old_hash) if old_hash else ""
+    new = load_object(manifest_dir, new_hash) if new_hash else ""
+    return "".join(
+        difflib.unified_diff(
+            old.splitlines(keepends=True),
+            new.splitlines(keepends=True),
+            fromfile="a/" + hostname + "/" + item,
+            tofile="b/" + hostname + "/" + item,
+        )
+    )
+
+
+def unified_diffs(manifest_dir, changes, workers=None):
+    """
+    This function produces the unified diffs of the changed items in a process pool.
+    :param manifest_dir: The directory where the manifests are stored.
+    :param changes: A list of changes, as returned by compare_manifests.
+    :param workers: The number of worker processes. Defaults to the number of CPUs.
+    :return: A generator of diff strings, in the same order as the changes.
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            unified_diff, [manifest_dir] * len(changes), changes, chunksize=16
+        )
+
+
+def main():
+    """
+    This function is the command line interface to the manifests.
+    :return:
+    """
+    parser = argparse.ArgumentParser(
+        description="List what changed between two runs of day-one-toolkit.py."
+    )
+    parser.add_argument(
+        "manifests",
+        nargs="*",
+        help="The old and new manifests to compare (default: the last two)",
+    )
+    parser.add_argument(
+        "--manifest-dir",
+        default=MANIFEST_DIR,
+        help="The directory where the manifests are stored (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--diffs",
+        action="store_true",
+        help="Show the unified diff of each changed item",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="The number of processes used for the diffs"
+    )
+    args = parser.parse_args()
+    paths = args.manifests or manifest_files(args.manifest_dir)[-2:]
+    if len(paths) != 2:
+        parser.error("two manifests are needed to compare")
+    changes = compare_manifests(load_manifest(paths[0]), load_manifest(paths[1]))
+    print("Comparing " + paths[0] + " to " + paths[1])
+    for hostname, item, old_hash, new_hash in changes:
+        print(f"{change_label(old_hash, new_hash)} : {hostname} - {item}")
+    print("CHANGED ITEMS : " + str(len(changes)))
+    if args.diffs:
+        for diff in unified_diffs(args.manifest_dir, changes, args.workers):
+            print(diff, end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Bounded-memory collection, enabled with --bounded-memory and --memory-budget.
+
+With --bounded-memory, getter results and configs are streamed straight to their file
+instead of being encoded in memory first. Payloads larger than the spill threshold are
+then dropped from the Nornir result and replaced with a Spilled reference to the file,
+which is only read back when an index needs it. collection-toolkit.py converts each
+batch of hosts to rows as soon as it is collected, instead of holding the results of
+every host of every platform until the end.
+
+With --memory-budget, large getters (i.e. mac_address_table or the configs of a chassis
+switch) only start while the resident set size of the process, plus the expected size of
+the large getters already running, is within the budget. One large getter is always
+allowed to run, so the collection can't stall.
+"""
+
+# Import Modules
+import contextlib
+import json
+import os
+import sys
+import threading
+from colorama import Fore
+
+# Default size above which a payload is spilled to disk, in MB
+SPILL_THRESHOLD = 8
+# Default number of hosts collected at a time by collection-toolkit.py in bounded mode
+BOUNDED_BATCH = 50
+# The getters whose payload can be large enough to be worth limiting
+LARGE_GETTERS = {
+    "arp_table",
+    "bgp_neighbors_detail",
+    "config",
+    "interfaces",
+    "interfaces_counters",
+    "lldp_neighbors_detail",
+    "mac_address_table",
+}
+# Number of seconds between checks of the resident set size while waiting
+BUDGET_POLL_INTERVAL = 1.0
+
+# The memory budget of the run, or None when there is no budget
+_budget = None
+
+
+class Spilled:
+    """
+    A reference to a payload which has been spilled to disk, in place of the payload.
+    """
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+
+    def __repr__(self):
+        return f"Spilled({self.path!r}, {self.size})"
+
+    def load(self):
+        """
+        This function reads the payload back from disk.
+        :return: The payload.
+        """
+        with open(self.path) as f:
+            if self.path.endswith(".json"):
+                return json.load(f)
+            return f.read()
+
+
+def load_spilled(value):
+    """
+    This function returns a payload, reading it back from disk when it was spilled.
+    :param value: The payload, or a Spilled reference.
+    :return: The payload.
+    """
+    if isinstance(value, Spilled):
+        return value.load()
+    return value
+
+
+def write_payload(path, payload, threshold):
+    """
+    This function streams a payload straight to its file, replacing it atomically.
+    Dictionaries are written as JSON and strings as text.
+    :param path: The path of the file.
+    :param payload: The getter result or config.
+    :param threshold: The size in bytes above which the payload is spilled.
+    :return: The payload, or a Spilled reference when it is above the threshold.
+    """
+    tmp_file = path + "." + str(os.getpid()) + "." + str(threading.get_ident()) + ".tmp"
+    with open(tmp_file, "w") as f:
+        if isinstance(payload, str):
+            f.write(payload)
+        else:
+            json.dump(payload, f, indent=2)
+    os.replace(tmp_file, path)
+    size = os.path.getsize(path)
+    if size > threshold:
+        return Spilled(path, size)
+    return payload
+
+
+def current_rss():
+    """
+    This function returns the resident set size of the process.
+    :return: The resident set size in bytes.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Not Linux, so fall back to the peak
+        return peak_rss()
+
+
+def peak_rss():
+    """
+    This function returns the peak resident set size of the process.
+    :return: The peak resident set size in bytes.
+    """
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # The peak is in bytes on macOS and KB elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryBudget:
+    """
+    Limits the large getters running at once, so the resident set size of the process
+    stays within a budget. The expected size of each getter is the largest payload it
+    has returned so far.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.expected = {}
+        self.running = []
+        self.waits = 0
+        self.condition = threading.Condition()
+
+    def admits(self, getter):
+        """
+        This function checks whether a large getter can start now.
+        :param getter: The name of the getter.
+        :return: True if it can start, otherwise False.
+        """
+        if not self.running:
+            return True
+        in_flight = sum(self.expected.get(running, 0) for running in self.running)
+        return current_rss() + in_flight + self.expected.get(getter, 0) <= self.limit
+
+    def acquire(self, getter):
+        """
+        This function waits until a large getter can start within the budget.
+        :param getter: The name of the getter.
+        :return:
+        """
+        with self.condition:
+            if not self.admits(getter):
+                self.waits += 1
+            # Memory is freed without a notification, so check the budget again regularly
+            while not self.admits(getter):
+                self.condition.wait(BUDGET_POLL_INTERVAL)
+            self.running.append(getter)
+
+    def release(self, getter, size=0):
+        """
+        This function records the end of a large getter, and the size of its payload.
+        :param getter: The name of the getter.
+        :param size: The size of the payload in bytes, when it is known.
+        :return:
+        """
+        with self.condition:
+            self.running.remove(getter)
+            self.expected[getter] = max(self.expected.get(getter, 0), size)
+            self.condition.notify_all()
+
+
+def set_memory_budget(limit_mb):
+    """
+    This function sets the memory budget of the run.
+    :param limit_mb: The budget in MB, or None for no budget.
+    :return:
+    """
+    global _budget
+    _budget = MemoryBudget(limit_mb * 1e6) if limit_mb else None
+
+
+@contextlib.contextmanager
+def memory_slot(getter):
+    """
+    This function holds a place in the memory budget around a large getter. It can be
+    used from the Nornir worker threads. The size of the payload can be recorded with
+    slot["size"] = <bytes>
+    :param getter: The name of the getter, or "config" for the configs.
+    :return:
+    """
+    slot = {"size": 0}
+    budget = _budget
+    if budget is None or getter not in LARGE_GETTERS:
+        yield slot
+        return
+    budget.acquire(getter)
+    try:
+        yield slot
+    finally:
+        budget.release(getter, slot["size"])
+
+
+def report_memory(log_file):
+    """
+    This function prints the peak resident set size of the run, and how often large
+    getters waited for the memory budget.
+    :param log_file: The log file of the run.
+    :return:
+    """
+    line = f"PEAK RSS : {peak_rss() / 1e6:.1f} MB"
+    if _budget is not None:
+        line += f" - budget {_budget.limit / 1e6:.1f} MB - waits {_budget.waits}"
+    # Display printout
+    print(f"{Fore.CYAN}" + line)
+    # Add to log file
+    log_file.write(line + "\n")
@@ -0,0 +1,151 @@
+"""
+Functions used to work out which hosts, getters and config types a toolkit run
+will process. Everything in here is applied to the Nornir inventory before any
+connection to a device is opened.
+"""
+
+# Import Modules
+import fnmatch
+from ruamel.yaml import YAML
+from day_one_net_toolkit.inventory import host_platform, platform_index
+
+# Default location of the per-platform getter matrix
+GETTERS_FILE = "inventory/getters.yaml"
+
+
+def load_getter_matrix(getters_file=GETTERS_FILE):
+    """
+    This function loads the per-platform getter matrix from a YAML file.
+
+    Each platform entry holds a list of NAPALM getters and a list of config
+    types to collect, for example:
+
+    ios:
+        getters:
+            - facts
+        configs:
+            - running
+    :param getters_file: The path to the getter matrix YAML file.
+    :return: A dictionary of platform to {"getters": [...], "configs": [...]}.
+    """
+    # Open and parse the getter matrix file
+    with open(getters_file) as f:
+        matrix = YAML(typ="safe").load(f) or {}
+    # Ensure each platform has both keys, so an empty list can be used to skip them
+    for platform, entry in matrix.items():
+        entry = entry or {}
+        matrix[platform] = {
+            "getters": list(entry.get("getters") or []),
+            "configs": list(entry.get("configs") or []),
+        }
+    return matrix
+
+
+def select_items(items, include=None, exclude=None):
+    """
+    This function filters a list of getters or config types using an include
+    and exclude list, preserving the original order.
+    :param items: The list of getter or config type names.
+    :param include: A list of names to keep. None or empty keeps everything.
+    :param exclude: A list of names to remove.
+    :return: The filtered list.
+    """
+    # Use sets for the membership checks
+    include = set(include or [])
+    exclude = set(exclude or [])
+    return [
+        item
+        for item in items
+        if (not include or item in include) and item not in exclude
+    ]
+
+
+def host_selected(host, hosts=None, exclude_hosts=None, groups=None, platforms=None):
+    """
+    This function determines whether a Nornir host matches the selection.
+    :param host: The Nornir host object.
+    :param hosts: A list of glob patterns matched against the host name.
+    :param exclude_hosts: A list of glob patterns which remove matching hosts.
+    :param groups: A list of group names, of which the host must be a member of one.
+    :param platforms: A list of platforms, of which the host must be one.
+    :return: True if the host is selected, otherwise False.
+    """
+    # Check the host name against the include globs
+    if hosts and not any(fnmatch.fnmatchcase(host.name, glob) for glob in hosts):
+        return False
+    # Check the host name against the exclude globs
+    if exclude_hosts and any(
+        fnmatch.fnmatchcase(host.name, glob) for glob in exclude_hosts
+    ):
+        return False
+    # Check the host group membership
+    if groups and not set(groups).intersection(g.name for g in host.groups):
+        return False
+    # Check the host platform
+    if platforms and host_platform(host) not in platforms:
+        return False
+    return True
+
+
+def filter_inventory(nr, hosts=None, exclude_hosts=None, groups=None, platforms=None):
+    """
+    This function narrows down the Nornir inventory to the selected hosts.
+    :param nr: The initialised Nornir object.
+    :param hosts: A list of glob patterns matched against the host name.
+    :param exclude_hosts: A list of glob patterns which remove matching hosts.
+    :param groups: A list of group names to keep.
+    :param platforms: A list of platforms to keep.
+    :return: A filtered Nornir object.
+    """
+    # Only filter when there is a selection, so the inventory is not copied needlessly
+    if not (hosts or exclude_hosts or groups or platforms):
+        return nr
+    return nr.filter(
+        filter_func=lambda host: host_selected(
+            host,
+            hosts=hosts,
+            exclude_hosts=exclude_hosts,
+            groups=groups,
+            platforms=platforms,
+        )
+    )
+
+
+def build_plan(
+    nr, matrix, getters=None, exclude_getters=None, configs=None, exclude_configs=None
+):
+    """
+    This function builds the collection plan for a run. The plan is a list with
+    one entry per host, in platform order of the getter matrix, holding the config
+    types and getters to collect from that host. The facts getter is always first.
+    :param nr: The (filtered) Nornir object.
+    :param matrix: The getter matrix, as returned by load_getter_matrix.
+    :param getters: A list of getters to include.
+    :param exclude_getters: A list of getters to exclude.
+    :param configs: A list of config types to include.
+    :param exclude_configs: A list of config types to exclude.
+    :return: A list of {"host", "platform", "configs", "getters"} dictionaries.
+    """
+    # Empty list which will be appended to in for loop
+    plan = []
+    # Group the hosts by platform once, rather than filtering the inventory per platform
+    index = platform_index(nr)
+    for platform, entry in matrix.items():
+        # Apply the include/exclude lists to this platforms getters and configs
+        platform_configs = select_items(entry["configs"], configs, exclude_configs)
+        platform_getters = select_items(entry["getters"], getters, exclude_getters)
+        # Collect facts first, so the OS version of the host is known for the other getters
+        platform_getters.sort(key=lambda getter: getter != "facts")
+        # Skip platforms which have nothing left to collect
+        if not platform_configs and not platform_getters:
+            continue
+        for hostname in index.get(platform, []):
+            plan.append(
+                {
+                    "host": hostname,
+                    "platform": platform,
+                    "configs": list(platform_configs),
+                    "getters": list(platform_getters),
+                }
+            )
+    return plan
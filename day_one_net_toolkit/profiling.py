@@ -0,0 +1,284 @@
+"""
+Profiling of a toolkit run, enabled with --profile.
+
+The run is split into phases, i.e. inventory, collection, parsing and export. For each
+phase the following files are written to profiles/<run>/:
+
+<phase>.prof - cProfile statistics of the main thread, i.e. for snakeviz or pstats.
+<phase>.folded - Stacks of every thread sampled every 5ms, in the folded format used by
+                 flamegraph.pl and speedscope. Nornir runs tasks in worker threads, which
+                 cProfile doesn't see.
+trace.json - Span events of each phase, host and getter in the Chrome trace event
+             format, which can be opened in chrome://tracing or ui.perfetto.dev.
+
+The peak memory of each phase is measured with tracemalloc.
+"""
+
+# Import Modules
+import collections
+import contextlib
+import cProfile
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+import tracemalloc
+from colorama import Fore
+
+# Default location of the profiles
+PROFILE_DIR = "profiles"
+# Number of seconds between the stack samples
+SAMPLE_INTERVAL = 0.005
+
+# The tracer of the run being profiled, or None when profiling is off
+_tracer = None
+
+
+class Tracer:
+    """
+    Records span events in the Chrome trace event format, from any thread.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+
+    def add(self, name, category, start, end, args=None):
+        """
+        This function records a span event.
+        :param name: The name of the span.
+        :param category: The category of the span.
+        :param start: The start of the span, from time.perf_counter()
+        :param end: The end of the span, from time.perf_counter()
+        :param args: A dictionary of extra values shown with the span.
+        :return:
+        """
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start - self.origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args or {},
+        }
+        with self.lock:
+            self.events.append(event)
+
+    @contextlib.contextmanager
+    def span(self, name, category, args=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, category, start, time.perf_counter(), args)
+
+    def write(self, path):
+        """
+        This function writes the span events to a trace file.
+        :param path: The path of the trace file.
+        :return:
+        """
+        with self.lock:
+            events = list(self.events)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+@contextlib.contextmanager
+def span(name, category="task", **args):
+    """
+    This function records a span event around a block, when a run is being profiled.
+    It can be used from the Nornir worker threads.
+    :param name: The name of the span, i.e. the host name.
+    :param category: The category of the span, i.e. getter
+    :param args: Extra values shown with the span, i.e. getter="facts"
+    :return:
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield
+        return
+    with tracer.span(name, category, args):
+        yield
+
+
+def add_span(name, category, start, **args):
+    """
+    This function records a span event from a start time until now, for spans which
+    don't fit around a single block.
+    :param name: The name of the span, i.e. the host name.
+    :param category: The category of the span, i.e. host
+    :param start: The start of the span, from time.perf_counter()
+    :param args: Extra values shown with the span.
+    :return:
+    """
+    tracer = _tracer
+    if tracer is not None:
+        tracer.add(name, category, start, time.perf_counter(), args)
+
+
+class Sampler(threading.Thread):
+    """
+    Samples the stacks of every other thread, and counts them per phase.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(name="profiler-sampler", daemon=True)
+        self.interval = interval
+        self.phase = None
+        self.stacks = collections.defaultdict(collections.Counter)
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            phase = self.phase
+            if phase is None:
+                continue
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                        f":{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                self.stacks[phase][";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class Profiler:
+    """
+    Profiles the phases of a run. When output_dir is None every method does nothing,
+    so the toolkits can call it whether --profile is set or not.
+    """
+
+    def __init__(self, output_dir=None):
+        self.output_dir = output_dir
+        self.profiles = {}
+        self.elapsed = collections.OrderedDict()
+        self.peaks = {}
+        self.current = None
+        self.sampler = None
+
+    def start(self):
+        """
+        This function starts tracing memory, sampling stacks and recording spans.
+        """
+        global _tracer
+        if self.output_dir is None:
+            return
+        tracemalloc.start()
+        _tracer = Tracer()
+        self.sampler = Sampler()
+        self.sampler.start()
+
+    def begin(self, phase):
+        """
+        This function starts a phase, ending the current phase first. A phase which is
+        begun more than once adds to its earlier results.
+        :param phase: The name of the phase, i.e. collection
+        :return:
+        """
+        if self.output_dir is None:
+            return
+        self.end()
+        self.current = (phase, time.perf_counter())
+        # The peak is only reset per phase on Python 3.9+, before that it is the run's peak
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        self.sampler.phase = phase
+        self.profiles.setdefault(phase, cProfile.Profile()).enable()
+
+    def iterate(self, iterable, phase, then):
+        """
+        This function times the reading of each item of an iterable as one phase, and
+        what the caller does with the item as another. i.e. a generator which polls the
+        devices as it is read, and its results being converted to rows.
+        :param iterable: The iterable, i.e. a generator of results.
+        :param phase: The phase the items are read in, i.e. collection
+        :param then: The phase the items are used in, i.e. parsing
+        :return: A generator of the items.
+        """
+        iterator = iter(iterable)
+        while True:
+            self.begin(phase)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            self.begin(then)
+            yield item
+        self.begin(then)
+
+    def end(self):
+        """
+        This function ends the current phase, recording its time and peak memory.
+        """
+        if self.output_dir is None or self.current is None:
+            return
+        phase, start = self.current
+        self.profiles[phase].disable()
+        self.sampler.phase = None
+        end = time.perf_counter()
+        self.elapsed[phase] = self.elapsed.get(phase, 0.0) + end - start
+        self.peaks[phase] = max(
+            self.peaks.get(phase, 0), tracemalloc.get_traced_memory()[1]
+        )
+        _tracer.add(phase, "phase", start, end)
+        self.current = None
+
+    def stop(self):
+        """
+        This function ends the profiling and writes the profile files.
+        :return: A list of (phase, seconds, peak memory in bytes) tuples.
+        """
+        global _tracer
+        if self.output_dir is None:
+            return []
+        self.end()
+        self.sampler.stop()
+        tracemalloc.stop()
+        output_dir = pathlib.Path(self.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for phase, profile in self.profiles.items():
+            profile.dump_stats(str(output_dir / (phase + ".prof")))
+            with open(output_dir / (phase + ".folded"), "w") as f:
+                for stack, count in self.sampler.stacks[phase].most_common():
+                    f.write(stack + " " + str(count) + "\n")
+        _tracer.write(output_dir / "trace.json")
+        _tracer = None
+        return [
+            (phase, seconds, self.peaks[phase])
+            for phase, seconds in self.elapsed.items()
+        ]
+
+
+def report_profile(profiler, log_file):
+    """
+    This function stops a profiler and prints the time and peak memory of each phase.
+    :param profiler: The Profiler object.
+    :param log_file: The log file of the run.
+    :return:
+    """
+    for phase, seconds, peak in profiler.stop():
+        line = f"PROFILE : {phase} - {seconds:.2f}s - peak memory {peak / 1e6:.1f} MB"
+        # Display printout
+        print(f"{Fore.CYAN}" + line)
+        # Add to log file
+        log_file.write(line + "\n")
+    if profiler.output_dir is not None:
+        # Display printout
+        print(f"{Fore.CYAN}Profiles written to: " + str(profiler.output_dir))
+        # Add to log file
+        log_file.write("Profiles written to: " + str(profiler.output_dir) + "\n")
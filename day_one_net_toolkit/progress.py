@@ -0,0 +1,216 @@
+"""
+Progress of a day-one-toolkit.py run, measured in (host, config or getter) items.
+
+The progress is printed as a single line on a TTY every few seconds, and written to a
+JSON status file, so a scheduled run can be watched by other tools:
+
+{
+  "started": "2019-07-01T13:04:59", "updated": "2019-07-01T13:06:14", "done": false,
+  "planned": 400, "completed": 120, "succeeded": 118, "failed": 2, "in_flight": 1,
+  "items_per_second": 1.6, "eta_seconds": 175.0,
+  "failures": {"ConnectionException": 2}
+}
+"""
+
+# Import Modules
+import datetime as dt
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+from colorama import Fore
+
+# Default number of seconds between progress updates
+PROGRESS_INTERVAL = 5.0
+# Number of seconds between checks of whether an update is due, while items are running
+REFRESH_INTERVAL = 2.0
+
+
+def failure_class(multi_result):
+    """
+    This function names the class of the exception which failed a task. The innermost
+    exception is used, rather than the NornirSubTaskError of the parent task.
+    :param multi_result: The MultiResult of a task for a host.
+    :return: The exception class name, or "Failed" if there is no exception.
+    """
+    name = "Failed"
+    for result in multi_result:
+        if result.exception is not None:
+            name = type(result.exception).__name__
+    return name
+
+
+def format_duration(seconds):
+    """
+    This function formats a number of seconds as HH:MM:SS.
+    """
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class Progress:
+    """
+    Counts the completed items of a run, and reports the progress periodically.
+    """
+
+    def __init__(
+        self, planned, status_file=None, interval=PROGRESS_INTERVAL, stream=None
+    ):
+        self.planned = planned
+        self.status_file = status_file
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.started = dt.datetime.now()
+        self.start_time = time.monotonic()
+        self.last_report = None
+        self.succeeded = 0
+        self.failures = {}
+        self.in_flight = 0
+        self.done = False
+        # Hosts are collected in several threads at once
+        self.lock = threading.RLock()
+        # Report from a timer as well, so the progress stays current during long items,
+        # i.e. a large mac_address_table or config
+        self.stopped = threading.Event()
+        if self.status_file or self.stream.isatty():
+            threading.Thread(target=self.refresh, name="progress", daemon=True).start()
+
+    @property
+    def completed(self):
+        return self.succeeded + sum(self.failures.values())
+
+    def open_session(self):
+        """
+        This function records a device session being opened.
+        """
+        with self.lock:
+            self.in_flight += 1
+
+    def close_session(self):
+        """
+        This function records a device session being closed, and reports the progress
+        when it is due.
+        """
+        with self.lock:
+            self.in_flight -= 1
+            self.report()
+
+    def item_done(self, failed=False, error="Failed"):
+        """
+        This function records a completed item, and reports the progress when it is due.
+        :param failed: Whether the item failed.
+        :param error: The class of the failure, i.e. ConnectionException
+        :return:
+        """
+        with self.lock:
+            if failed:
+                self.failures[error] = self.failures.get(error, 0) + 1
+            else:
+                self.succeeded += 1
+            self.report()
+
+    def refresh(self):
+        """
+        This function reports the progress when it is due, until the run is finished.
+        It runs in its own thread.
+        :return:
+        """
+        while not self.stopped.wait(min(self.interval, REFRESH_INTERVAL)):
+            with self.lock:
+                if not self.done:
+                    self.report()
+
+    def status(self):
+        """
+        This function builds the machine-readable status of the run.
+        :return: A dictionary of the progress.
+        """
+        elapsed = time.monotonic() - self.start_time
+        rate = self.completed / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.planned - self.completed, 0)
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "updated": dt.datetime.now().isoformat(timespec="seconds"),
+            "done": self.done,
+            "planned": self.planned,
+            "completed": self.completed,
+            "succeeded": self.succeeded,
+            "failed": sum(self.failures.values()),
+            "in_flight": self.in_flight,
+            "items_per_second": round(rate, 2),
+            "eta_seconds": round(remaining / rate, 1) if rate > 0 else None,
+            "failures": dict(sorted(self.failures.items())),
+        }
+
+    def report(self, force=False):
+        """
+        This function prints the progress on a TTY and writes the status file, at most
+        once every interval unless forced.
+        :param force: Report even when the interval has not passed.
+        :return:
+        """
+        now = time.monotonic()
+        if (
+            not force
+            and self.last_report is not None
+            and now - self.last_report < self.interval
+        ):
+            return
+        self.last_report = now
+        status = self.status()
+        if self.status_file:
+            self.write_status(status)
+        if self.stream.isatty():
+            print(f"{Fore.CYAN}" + self.format_status(status), file=self.stream)
+
+    def write_status(self, status):
+        """
+        This function replaces the status file atomically, so it is never read half written.
+        :param status: The status dictionary.
+        :return:
+        """
+        pathlib.Path(self.status_file).parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = str(self.status_file) + "." + str(os.getpid()) + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(status, f, indent=2)
+        os.replace(tmp_file, self.status_file)
+
+    @staticmethod
+    def format_status(status):
+        """
+        This function formats the status as a single line for the console.
+        :param status: The status dictionary.
+        :return: The progress line.
+        """
+        percent = (
+            status["completed"] * 100.0 / status["planned"]
+            if status["planned"]
+            else 100.0
+        )
+        line = (
+            f"PROGRESS : {status['completed']}/{status['planned']} items ({percent:.1f}%)"
+            f" - {status['in_flight']} in flight - {status['items_per_second']:.2f} items/s"
+            f" - {status['failed']} failed"
+        )
+        if status["failures"]:
+            line += (
+                " ("
+                + ", ".join(
+                    f"{name}: {count}" for name, count in status["failures"].items()
+                )
+                + ")"
+            )
+        if status["eta_seconds"] is not None and not status["done"]:
+            line += " - ETA " + format_duration(status["eta_seconds"])
+        return line
+
+    def finish(self):
+        """
+        This function marks the run as done and reports the final progress.
+        """
+        with self.lock:
+            self.done = True
+            self.report(force=True)
+        self.stopped.set()
@@ -0,0 +1,456 @@
+"""
+A local read-only query service over the facts/ and configs/ directories, so dashboards
+and scripts can look up the latest collected results without connecting to the devices.
+
+The service listens on localhost, or on a Unix socket, and answers GET requests:
+
+/hosts                          - The hosts, filtered with ?model=, ?vendor= or ?os_version=
+/hosts/<host>                   - The getters and configs collected from a host
+/hosts/<host>/getters/<getter>  - A getter result, i.e. /hosts/lab-csr-01/getters/facts
+/hosts/<host>/configs/<type>    - A config, i.e. /hosts/lab-csr-01/configs/running
+/indexes/<name>                 - The hosts of each model, vendor, os_version or getter
+/status                         - The number of hosts and the cache statistics
+
+Files are served from an in-memory LRU cache, keyed by their size and modification
+time so a file rewritten by a later run is read again. Every response has an ETag, and a
+request with a matching If-None-Match is answered with 304 Not Modified. The indexes are
+built from the facts getters when the service starts, and rebuilt when a new run has
+written its manifest, or when the hosts, getters or configs on disk have changed without
+one, i.e. after a run with a host filter or a save_getter() from a script.
+
+python -m day_one_net_toolkit.query --port 8421
+python -m day_one_net_toolkit.query --socket /tmp/day-one.sock
+"""
+
+# Import Modules
+import argparse
+import collections
+import hashlib
+import http.server
+import json
+import os
+import socketserver
+import threading
+import time
+import urllib.parse
+from day_one_net_toolkit.factstore import (
+    FACT_DIR,
+    READ_WORKERS,
+    fact_file,
+    load_fact_store,
+)
+from day_one_net_toolkit.manifest import CONFIG_DIR, MANIFEST_DIR, manifest_files
+
+# Default address of the query service
+QUERY_HOST = "127.0.0.1"
+QUERY_PORT = 8421
+# Default size of the file cache, in MB
+CACHE_SIZE = 256
+# Number of seconds between checks for new results, which the indexes are rebuilt after
+REFRESH_INTERVAL = 30
+# The fields of the facts getter which are indexed
+INDEXED_FACTS = ["model", "vendor", "os_version"]
+
+
+def etag(body):
+    """
+    This function returns the ETag of a response body.
+    :param body: The body as bytes.
+    :return: The quoted ETag.
+    """
+    return '"' + hashlib.sha1(body).hexdigest() + '"'  # nosec - not used for security
+
+
+class LRUCache:
+    """
+    A thread-safe least recently used cache of response bodies, limited in total size.
+    """
+
+    def __init__(self, max_bytes=CACHE_SIZE * 1000000):
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        This function returns a cached entry, marking it as recently used.
+        :param key: The key of the entry.
+        :return: The (body, etag) tuple, or None if it isn't cached.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        """
+        This function caches an entry, evicting the least recently used entries to
+        stay within the size limit. Entries larger than the whole cache aren't cached.
+        :param key: The key of the entry.
+        :param entry: The (body, etag) tuple.
+        :return:
+        """
+        size = len(entry[0])
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[0])
+            self.entries[key] = entry
+            self.size += size
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted[0])
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class QueryService:
+    """
+    The data behind the query service: the cached files and the prebuilt indexes.
+    """
+
+    def __init__(
+        self,
+        fact_dir=FACT_DIR,
+        config_dir=CONFIG_DIR,
+        manifest_dir=MANIFEST_DIR,
+        cache_size=CACHE_SIZE,
+        workers=READ_WORKERS,
+    ):
+        self.fact_dir = fact_dir
+        self.config_dir = config_dir
+        self.manifest_dir = manifest_dir
+        self.workers = workers
+        self.cache = LRUCache(cache_size * 1000000)
+        self.lock = threading.Lock()
+        self.generation = None
+        self.checked = 0.0
+        self.indexes = {}
+        self.refresh()
+
+    def host_names(self):
+        """
+        This function returns the hosts with a facts or configs directory.
+        """
+        hostnames = set()
+        for directory in (self.fact_dir, self.config_dir):
+            try:
+                hostnames.update(
+                    entry.name for entry in os.scandir(directory) if entry.is_dir()
+                )
+            except OSError:
+                continue
+        return sorted(hostnames)
+
+    def list_items(self, directory, hostname, suffix):
+        """
+        This function returns the items saved for a host, i.e. the getter names.
+        """
+        try:
+            names = os.listdir(os.path.join(directory, hostname))
+        except OSError:
+            return []
+        return sorted(name[: -len(suffix)] for name in names if name.endswith(suffix))
+
+    def data_generation(self):
+        """
+        This function returns what the indexes are built from: the latest manifest and
+        the modification times and sizes of the facts and configs directories, of each
+        host's directories and of each host's facts getter. A new host, getter or config
+        changes its directory, and a rewritten facts getter changes its own file.
+        :return: A tuple which changes whenever the indexes are out of date.
+        """
+        manifests = manifest_files(self.manifest_dir)
+        paths = [self.fact_dir, self.config_dir]
+        for hostname in self.host_names():
+            paths.append(os.path.join(self.fact_dir, hostname))
+            paths.append(os.path.join(self.config_dir, hostname))
+            paths.append(fact_file(self.fact_dir, hostname, "facts"))
+        stats = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                stats.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stats.append(None)
+        return manifests[-1] if manifests else None, tuple(stats)
+
+    def refresh(self, force=True):
+        """
+        This function rebuilds the indexes, when a run has finished or the results on
+        disk have changed since they were built. The results are only checked for every
+        REFRESH_INTERVAL seconds.
+        :param force: Whether to rebuild the indexes without checking.
+        :return:
+        """
+        now = time.monotonic()
+        if not force and now - self.checked < REFRESH_INTERVAL:
+            return
+        with self.lock:
+            self.checked = now
+            generation = self.data_generation()
+            if not force and generation == self.generation:
+                return
+            hostnames = self.host_names()
+            hosts = {
+                hostname: {
+                    "getters": self.list_items(self.fact_dir, hostname, ".json"),
+                    "configs": self.list_items(self.config_dir, hostname, ".txt"),
+                }
+                for hostname in hostnames
+            }
+            store, _ = load_fact_store(
+                self.fact_dir, hostnames, ["facts"], workers=self.workers
+            )
+            indexes = {field: {} for field in INDEXED_FACTS}
+            for hostname, facts in store["facts"].items():
+                for field in INDEXED_FACTS:
+                    value = str(facts.get(field, ""))
+                    indexes[field].setdefault(value, []).append(hostname)
+            indexes["getter"] = {}
+            for hostname, items in hosts.items():
+                for getter in items["getters"]:
+                    indexes["getter"].setdefault(getter, []).append(hostname)
+            # Serialise the indexes once, so they are served straight from memory
+            self.indexes = {
+                name: self.json_entry(index) for name, index in indexes.items()
+            }
+            self.indexes["hosts"] = self.json_entry(hostnames)
+            self.hosts = {
+                hostname: self.json_entry(items) for hostname, items in hosts.items()
+            }
+            self.facts = {field: indexes[field] for field in INDEXED_FACTS}
+            self.generation = generation
+
+    @staticmethod
+    def json_entry(data):
+        body = json.dumps(data, indent=2).encode()
+        return body, etag(body)
+
+    def file_entry(self, path):
+        """
+        This function returns the body and ETag of a file, from the cache when the
+        file is unchanged since it was cached.
+        :param path: The path of the file.
+        :return: The (body, etag) tuple, or None if the file doesn't exist.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        entry = self.cache.get(key)
+        if entry is None:
+            with open(path, "rb") as f:
+                body = f.read()
+            entry = (body, etag(body))
+            self.cache.put(key, entry)
+        return entry
+
+    def hosts_entry(self, query):
+        """
+        This function returns the hosts, filtered by the indexed facts in a query.
+        :param query: The parsed query string, i.e. {"model": ["CSR1000V"]}
+        :return: The (body, etag) tuple.
+        """
+        filters = [field for field in INDEXED_FACTS if field in query]
+        if not filters:
+            return self.indexes["hosts"]
+        hostnames = None
+        for field in filters:
+            matches = set()
+            for value in query[field]:
+                matches.update(self.facts[field].get(value, []))
+            hostnames = matches if hostnames is None else hostnames & matches
+        return self.json_entry(sorted(hostnames))
+
+    def lookup(self, path, query):
+        """
+        This function answers a request path.
+        :param path: The request path, split into its parts.
+        :param query: The parsed query string.
+        :return: A tuple of (body, etag, content type), or None if there is no match.
+        """
+        # Pick up the indexes of a newer run
+        self.refresh(force=False)
+        if any(part in ("", ".", "..") for part in path):
+            return None
+        if path == ["hosts"]:
+            return self.hosts_entry(query) + ("application/json",)
+        if path == ["status"]:
+            status = {"hosts": len(self.hosts), "cache": self.cache.stats()}
+            return self.json_entry(status) + ("application/json",)
+        if len(path) == 2 and path[0] == "indexes":
+            entry = self.indexes.get(path[1])
+            return entry and entry + ("application/json",)
+        if len(path) == 2 and path[0] == "hosts":
+            entry = self.hosts.get(path[1])
+            return entry and entry + ("application/json",)
+        if len(path) == 4 and path[0] == "hosts" and path[2] == "getters":
+            entry = self.file_entry(
+                os.path.join(self.fact_dir, path[1], path[3] + ".json")
+            )
+            return entry and entry + ("application/json",)
+        if len(path) == 4 and path[0] == "hosts" and path[2] == "configs":
+            entry = self.file_entry(
+                os.path.join(self.config_dir, path[1], path[3] + ".txt")
+            )
+            return entry and entry + ("text/plain; charset=utf-8",)
+        return None
+
+
+class QueryHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Answers the GET requests of the query service.
+    """
+
+    server_version = "day-one-query"
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        path = urllib.parse.unquote(url.path).strip("/").split("/")
+        query = urllib.parse.parse_qs(url.query)
+        found = self.server.service.lookup(path, query)
+        if found is None:
+            self.send_error(404, "Not Found")
+            return
+        body, tag, content_type = found
+        # Answer conditional requests for unchanged data without a body
+        if tag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", tag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", tag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Requests over a Unix socket have no client address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class QueryServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class UnixQueryServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def build_server(service, host=QUERY_HOST, port=QUERY_PORT, socket_path=None):
+    """
+    This function builds the server of the query service.
+    :param service: The QueryService object.
+    :param host: The address to listen on.
+    :param port: The port to listen on.
+    :param socket_path: The path of a Unix socket to listen on instead, or None.
+    :return: The server object, which is started with serve_forever()
+    """
+    if socket_path:
+        # Remove the socket of an earlier service
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixQueryServer(socket_path, QueryHandler)
+    else:
+        server = QueryServer((host, port), QueryHandler)
+    server.service = service
+    server.verbose = False
+    return server
+
+
+def main():
+    """
+    This function is the command line interface to the query service.
+    :return:
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve the collected facts and configs over HTTP, read-only."
+    )
+    parser.add_argument(
+        "--facts-dir",
+        default=FACT_DIR,
+        help="The facts directory saved by day-one-toolkit.py (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--configs-dir",
+        default=CONFIG_DIR,
+        help="The configs directory saved by day-one-toolkit.py (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--manifest-dir",
+        default=MANIFEST_DIR,
+        help="The manifests, which show when a new run has finished (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--host",
+        default=QUERY_HOST,
+        help="The address to listen on (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=QUERY_PORT,
+        help="The port to listen on (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--socket", metavar="PATH", help="Listen on a Unix socket instead"
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=CACHE_SIZE,
+        metavar="MB",
+        help="The size of the file cache (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Log every request to stderr"
+    )
+    args = parser.parse_args()
+    service = QueryService(
+        args.facts_dir, args.configs_dir, args.manifest_dir, args.cache_size
+    )
+    server = build_server(service, args.host, args.port, args.socket)
+    server.verbose = args.verbose
+    print(
+        "Serving "
+        + str(len(service.hosts))
+        + " hosts on "
+        + (args.socket or "http://" + args.host + ":" + str(args.port))
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
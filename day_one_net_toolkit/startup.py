@@ -0,0 +1,99 @@
+"""
+A startup time benchmark of the toolkit commands, using python -X importtime.
+
+Each command module is imported in a fresh interpreter. The cumulative import time is
+reported, and the run fails when a command is over the time budget or imports one of
+the slow dependencies, which should only be imported once they are needed.
+
+python -m day_one_net_toolkit.startup --budget 150
+"""
+
+# Import Modules
+import argparse
+import subprocess  # nosec
+import sys
+
+# The modules behind each command
+COMMAND_MODULES = [
+    "day_one_net_toolkit.day_one",
+    "day_one_net_toolkit.collection",
+    "day_one_net_toolkit.daemon",
+    "day_one_net_toolkit.topology",
+    "day_one_net_toolkit.ipindex",
+    "day_one_net_toolkit.endpoints",
+    "day_one_net_toolkit.counters",
+    "day_one_net_toolkit.query",
+    "day_one_net_toolkit.configindex",
+    "day_one_net_toolkit.bgp",
+    "day_one_net_toolkit.health",
+    "day_one_net_toolkit.manifest",
+    "day_one_net_toolkit.archive",
+    "day_one_net_toolkit.commands",
+]
+# Dependencies which are slow to import, so must not be imported at startup
+SLOW_MODULES = [
+    "nornir",
+    "nornir_napalm",
+    "napalm",
+    "netmiko",
+    "openpyxl",
+    "numpy",
+    "requests",
+]
+# Default budget for the cumulative import time of a command, in milliseconds
+STARTUP_BUDGET = 150
+
+
+def import_times(module):
+    """
+    This function imports a module in a fresh interpreter and parses the import times.
+    :param module: The name of the module to import.
+    :return: A dictionary of each imported module to its cumulative import time in ms.
+    """
+    output = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stderr
+    times = {}
+    for line in output.splitlines():
+        # i.e. "import time:       350 |     152276 | openpyxl"
+        fields = line.split("|")
+        if not line.startswith("import time:") or not fields[1].strip().isdigit():
+            continue
+        times[fields[2].strip()] = int(fields[1]) / 1000
+    return times
+
+
+def main():
+    """
+    This function is the command line interface to the startup benchmark.
+    :return:
+    """
+    parser = argparse.ArgumentParser(
+        description="Measure the startup time of the toolkit commands."
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=STARTUP_BUDGET,
+        help="The import time budget of each command in ms (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    failed = False
+    for module in COMMAND_MODULES:
+        times = import_times(module)
+        slow = sorted(name for name in times if name in SLOW_MODULES)
+        status = "OK"
+        if times[module] > args.budget or slow:
+            status = "FAIL"
+            failed = True
+        print(f"{status} : {module} - {times[module]:.1f} ms")
+        for name in slow:
+            print(f"SLOW IMPORT : {module} - {name} ({times[name]:.1f} ms)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Summary aggregates of the collection-toolkit datasets, which would otherwise be built
+by hand with pivot tables:
+
+Summary_Models - The number of hosts of each vendor, model and OS version.
+Summary_Interfaces - The interfaces of each host which are admin up but oper down.
+Summary_Users - The hosts with local users outside of the standard set.
+
+Only the columns the aggregates need are kept as the datasets are written, and the
+aggregates are worked out with numpy over whole columns, so they stay quick with
+hundreds of thousands of interface rows.
+"""
+
+# Local users expected on every host, the others are reported in Summary_Users
+STANDARD_USERS = ["admin"]
+# The summary datasets and their headers
+SUMMARY_DATASETS = {
+    "Summary_Models": ["Vendor", "Model", "OS Version", "Hosts"],
+    "Summary_Interfaces": [
+        "Hostname",
+        "Interfaces",
+        "Admin Up Oper Down",
+        "Admin Up Oper Down (%)",
+    ],
+    "Summary_Users": ["Hostname", "Non-standard Users", "Usernames"],
+}
+
+
+class SummaryCollector:
+    """
+    An exporter which keeps the columns of the datasets used by the summary.
+    """
+
+    def __init__(self):
+        self.columns = {
+            "Facts": ([], [], []),
+            "Interfaces": ([], [], []),
+            "Users": ([], []),
+        }
+
+    def open(self, dataset, headers):
+        return
+
+    def write_rows(self, dataset, rows):
+        """
+        This function keeps the summary columns of the rows of a host.
+        :param dataset: The name of the dataset.
+        :param rows: A list of rows, each a list of values in header order.
+        :return:
+        """
+        if dataset == "Facts":
+            vendors, models, versions = self.columns["Facts"]
+            for row in rows:
+                vendors.append(str(row[1]))
+                models.append(str(row[2]))
+                versions.append(str(row[3]))
+        elif dataset == "Interfaces":
+            hosts, up, enabled = self.columns["Interfaces"]
+            for row in rows:
+                hosts.append(row[0])
+                up.append(row[3] is True)
+                enabled.append(row[4] is True)
+        elif dataset == "Users":
+            hosts, usernames = self.columns["Users"]
+            for row in rows:
+                hosts.append(row[0])
+                usernames.append(str(row[1]))
+
+    def close(self):
+        return []
+
+
+def model_counts(vendors, models, versions):
+    """
+    This function counts the hosts of each vendor, model and OS version.
+    :param vendors: A list of the vendor of each host.
+    :param models: A list of the model of each host.
+    :param versions: A list of the OS version of each host.
+    :return: A list of [vendor, model, OS version, count] rows, most common first.
+    """
+    import numpy as np
+
+    if not vendors:
+        return []
+    # Encode each column as integer codes, and combine them into a single key
+    key = np.zeros(len(vendors), dtype=np.int64)
+    for column in (vendors, models, versions):
+        values, codes = np.unique(np.array(column, dtype=object), return_inverse=True)
+        key = key * len(values) + codes
+    _, first, counts = np.unique(key, return_index=True, return_counts=True)
+    rows = []
+    # Stable sort, so ties stay in vendor, model and OS version order
+    for i in np.argsort(-counts, kind="stable"):
+        row = first[i]
+        rows.append(
+            [str(vendors[row]), str(models[row]), str(versions[row]), int(counts[i])]
+        )
+    return rows
+
+
+def down_interfaces(hosts, up, enabled):
+    """
+    This function works out the interfaces of each host which are admin up but oper down.
+    :param hosts: A list of the host of each interface.
+    :param up: A list of whether each interface is oper up.
+    :param enabled: A list of whether each interface is admin up.
+    :return: A list of [hostname, interfaces, admin up oper down, percent] rows.
+    """
+    import numpy as np
+
+    if not hosts:
+        return []
+    names, codes = np.unique(np.array(hosts, dtype=object), return_inverse=True)
+    down = np.fromiter(enabled, dtype=bool, count=len(hosts)) & ~np.fromiter(
+        up, dtype=bool, count=len(hosts)
+    )
+    totals = np.bincount(codes, minlength=len(names))
+    down_counts = np.bincount(codes, weights=down, minlength=len(names)).astype(
+        np.int64
+    )
+    percents = np.round(down_counts * 100.0 / totals, 1)
+    return [
+        [str(name), int(total), int(count), float(percent)]
+        for name, total, count, percent in zip(names, totals, down_counts, percents)
+    ]
+
+
+def nonstandard_users(hosts, usernames, standard_users=STANDARD_USERS):
+    """
+    This function lists the hosts with local users outside of the standard set.
+    :param hosts: A list of the host of each user.
+    :param usernames: A list of the username of each user.
+    :param standard_users: A list of the usernames expected on every host.
+    :return: A list of [hostname, count, usernames] rows.
+    """
+    import numpy as np
+
+    if not hosts:
+        return []
+    host_array = np.array(hosts, dtype=object)
+    user_array = np.array(usernames, dtype=object)
+    extra = ~np.isin(user_array, np.array(standard_users, dtype=object))
+    host_array, user_array = host_array[extra], user_array[extra]
+    # Sort by host, then split the usernames at each change of host
+    order = np.lexsort((user_array.astype(str), host_array.astype(str)))
+    host_array, user_array = host_array[order], user_array[order]
+    names, starts, counts = np.unique(
+        host_array.astype(str), return_index=True, return_counts=True
+    )
+    return [
+        [str(name), int(count), ", ".join(user_array[start : start + count])]
+        for name, start, count in zip(names, starts, counts)
+    ]
+
+
+def summarise(collector, standard_users=STANDARD_USERS):
+    """
+    This function builds the summary datasets from the kept columns.
+    :param collector: The SummaryCollector object.
+    :param standard_users: A list of the usernames expected on every host.
+    :return: A dictionary of summary dataset name to its rows.
+    """
+    return {
+        "Summary_Models": model_counts(*collector.columns["Facts"]),
+        "Summary_Interfaces": down_interfaces(*collector.columns["Interfaces"]),
+        "Summary_Users": nonstandard_users(
+            *collector.columns["Users"], standard_users=standard_users
+        ),
+    }
@@ -0,0 +1,249 @@
+"""
+The Nornir tasks used to collect configs and NAPALM getters from a device, shared by
+day-one-toolkit.py and the polling daemon.
+
+Nornir, the NAPALM plugins and requests are slow to import, so they are only imported
+once a connection is about to be made. This keeps small runs, i.e. --help or building
+the workbook from the facts directory, quick to start.
+"""
+
+# Import Modules
+import json
+import os
+import pathlib
+from colorama import Fore
+from day_one_net_toolkit.endpoints import ENDPOINT_GETTERS
+from day_one_net_toolkit.factstore import FACT_DIR
+from day_one_net_toolkit.manifest import CONFIG_DIR
+from day_one_net_toolkit.memory import load_spilled, memory_slot, write_payload
+from day_one_net_toolkit.profiling import span
+from day_one_net_toolkit.timeouts import DEFAULT_TIMEOUT
+from day_one_net_toolkit.inventory import (
+    INVENTORY_CACHE_FILE,
+    INVENTORY_FILES,
+    CachedInventory,
+)
+
+
+def init_nornir(
+    username="", password="", cache_file=INVENTORY_CACHE_FILE, files=INVENTORY_FILES
+):
+    """
+    This function initialises Nornir with the toolkit inventory, which is loaded
+    through the compiled inventory cache.
+    :param username: The default username for the inventory.
+    :param password: The default password for the inventory.
+    :param cache_file: The path of the compiled inventory.
+    :param files: A dictionary of the host_file, group_file and defaults_file paths.
+    :return: The initialised Nornir object.
+    """
+    from nornir import InitNornir
+    from nornir.core.plugins.inventory import InventoryPluginRegister
+    from requests.packages.urllib3.exceptions import InsecureRequestWarning
+    import requests
+
+    # Disable urllib3 warnings
+    requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+    # Initialize Nornir and define the inventory variables.
+    InventoryPluginRegister.register("CachedInventory", CachedInventory)
+    nr = InitNornir(
+        inventory={
+            "plugin": "CachedInventory",
+            "options": dict(files, cache_file=cache_file),
+        }
+    )
+    # Set default username and password
+    nr.inventory.defaults.username = username
+    nr.inventory.defaults.password = password
+    return nr
+
+
+def set_timeout(task, timeout):
+    """
+    This function applies a NAPALM timeout to the host's connection. A connection which
+    isn't open yet is opened with the timeout. An open connection has the timeout set
+    on the driver, which is honoured by the netmiko based drivers, junos and eos.
+    :param task: The Nornir task.
+    :param timeout: The timeout in seconds, or None for the timeout of the inventory.
+    :return:
+    """
+    extras = task.host.get_connection_parameters("napalm").extras or {}
+    if timeout is None:
+        # A connection which isn't open yet is opened as the inventory sets it
+        if "napalm" not in task.host.connections:
+            return
+        # Put back the timeout of the inventory, in case another item changed it
+        timeout = extras.get("timeout", DEFAULT_TIMEOUT)
+    if "napalm" not in task.host.connections:
+        task.host.open_connection(
+            "napalm", task.nornir.config, extras=dict(extras, timeout=timeout)
+        )
+        return
+    connection = task.host.connections["napalm"].connection
+    connection.timeout = timeout
+    device = getattr(connection, "device", None)
+    # netmiko based drivers, i.e. ios, nxos_ssh and iosxr
+    if hasattr(device, "read_timeout_override"):
+        device.read_timeout_override = timeout
+    # junos, using PyEZ
+    elif hasattr(device, "timeout"):
+        device.timeout = timeout
+    # eos, using pyeapi
+    transport = getattr(getattr(device, "connection", None), "transport", None)
+    if hasattr(transport, "timeout"):
+        transport.timeout = timeout
+
+
+def collect_getters(
+    task, getter, timeout=None, spill_threshold=None, fact_dir=FACT_DIR
+):
+    """
+    This function is used to collect all applicable getters for the applicable OS
+    and then store these results under the respective facts/<hostname>/ directory.
+    :param task: The name of the task to be run.
+    :param getter: The name of the NAPALM getter.
+    :param timeout: The NAPALM timeout in seconds. Defaults to the inventory setting.
+    :param spill_threshold: The size in bytes above which the result is dropped from
+                            memory once saved, or None to keep every result.
+    :param fact_dir: The directory where the getters are stored.
+    :return: An AggregatedResult of this task.
+    """
+    from nornir_napalm.plugins.tasks import napalm_get
+    from nornir_utils.plugins.tasks.files import write_file
+
+    # Assign hostname directory to a variable
+    host_dir = task.host.name
+    # Assign the destination directory to a variable. i.e facts/hostname/
+    entry_dir = fact_dir + "/" + host_dir
+    # Create facts directory and/or check that it exists
+    pathlib.Path(fact_dir).mkdir(parents=True, exist_ok=True)
+    # Create entry directory and/or check that it exists
+    pathlib.Path(entry_dir).mkdir(exist_ok=True)
+    # Try/except block to catch exceptions, such as NotImplementedError
+    try:
+        # Apply the timeout of this getter to the connection
+        set_timeout(task, timeout)
+        # Wait for room in the memory budget, when the getter can be large
+        with memory_slot(getter) as slot:
+            # Gather facts using napalm_get and assign to a variable
+            with span(task.host.name, "getter", getter=getter):
+                facts_result = task.run(task=napalm_get, getters=[getter])
+            filename = str(entry_dir) + "/" + str(getter) + ".json"
+            # Stream the results straight to the file in bounded-memory mode
+            if spill_threshold is not None:
+                with span(task.host.name, "encode", getter=getter):
+                    facts_result[0].result[getter] = write_payload(
+                        filename, facts_result[0].result[getter], spill_threshold
+                    )
+                slot["size"] = os.path.getsize(filename)
+                return
+            # Encode the results, traced separately as it can be slow for large getters
+            with span(task.host.name, "encode", getter=getter):
+                content = json.dumps(facts_result[0].result[getter], indent=2)
+            slot["size"] = len(content)
+        # Write the results to a JSON, using the convention <filter_name>.json
+        task.run(
+            task=write_file,
+            content=content,
+            filename=f"" + filename,  # noqa
+        )  # noqa
+    # Handle NAPALM Not Implemented Error exceptions
+    except NotImplementedError:
+        return "Getter Not Implemented"
+    except AttributeError:
+        return "AttributeError: Driver has no attribute"
+
+
+def collect_config(
+    task, getter, timeout=None, spill_threshold=None, config_dir=CONFIG_DIR
+):
+    """
+    This function is used to collect applicable configs getters for the applicable OS
+    and then store these results under the respective configs/<hostname>/ directory
+    :param task: The name of the task to be run.
+    :param getter: The name of the NAPALM config getter.
+    :param timeout: The NAPALM timeout in seconds. Defaults to the inventory setting.
+    :param spill_threshold: The size in bytes above which the config is dropped from
+                            memory once saved, or None to keep every config.
+    :param config_dir: The directory where the configs are stored.
+    :return: An AggregatedResult of this task.
+    """
+    from nornir_napalm.plugins.tasks import napalm_get
+    from nornir_utils.plugins.tasks.files import write_file
+
+    # Assign hostname directory to a variable
+    host_dir = task.host.name
+    # Assign the destination directory to a variable. i.e configs/hostname/
+    entry_dir = config_dir + "/" + host_dir
+    # Create facts directory and/or check that it exists
+    pathlib.Path(config_dir).mkdir(parents=True, exist_ok=True)
+    # Create entry directory and/or check that it exists
+    pathlib.Path(entry_dir).mkdir(exist_ok=True)
+    # Try/except block to catch exceptions, such as NotImplementedError
+    try:
+        # Apply the timeout of the configs to the connection
+        set_timeout(task, timeout)
+        # Wait for room in the memory budget, as configs can be large
+        with memory_slot("config") as slot:
+            # Gather config using napalm_get and assign to a variable
+            with span(task.host.name, "config", config=getter):
+                config_result = task.run(task=napalm_get, getters=["config"])
+            filename = str(entry_dir) + "/" + str(getter) + ".txt"
+            slot["size"] = len(config_result.result["config"][getter])
+            # Stream the config straight to the file in bounded-memory mode
+            if spill_threshold is not None:
+                config_result.result["config"][getter] = write_payload(
+                    filename, config_result.result["config"][getter], spill_threshold
+                )
+                return
+        # Write the results to a JSON, using the convention <filter_name>.txt
+        task.run(
+            task=write_file,
+            content=config_result.result["config"][getter],
+            filename=f"" + filename,  # noqa
+        )
+    # Handle NAPALM Not Implemented Error exceptions
+    except NotImplementedError:
+        print(f"{Fore.YELLOW}NAPALM get filter not implemented " + str(getter))
+
+
+def update_indexes(hostname, getter, result, endpoint_index, history_dir):
+    """
+    This function adds a successfully collected getter to the endpoint index or the
+    interface counter history, when it is one of the getters they are built from.
+    :param hostname: The name of the host in the inventory.
+    :param getter: The name of the NAPALM getter.
+    :param result: The getter result.
+    :param endpoint_index: The EndpointIndex object.
+    :param history_dir: The directory where the counter history is stored.
+    :return:
+    """
+    from day_one_net_toolkit.counters import CounterHistory
+
+    # Read the result back from disk when it was spilled, and is needed by an index
+    if getter in ENDPOINT_GETTERS or getter == "interfaces_counters":
+        result = load_spilled(result)
+    # Add MAC address and ARP tables to the endpoint index straight away
+    if getter in ENDPOINT_GETTERS:
+        endpoint_index.add_host(hostname, getter, result)
+    # Append the interface counters to the counter history
+    if getter == "interfaces_counters":
+        CounterHistory(history_dir, hostname).append(result)
+
+
+def index_config(config_index, run, hostname, config_type, config_dir=CONFIG_DIR):
+    """
+    This function adds a successfully collected config to the config index.
+    :param config_index: The ConfigIndex object.
+    :param run: The name of the run, i.e. RUN-2019-07-01-13-04-59
+    :param hostname: The name of the host in the inventory.
+    :param config_type: The config type, i.e. running
+    :param config_dir: The directory where the configs are stored.
+    :return:
+    """
+    path = pathlib.Path(config_dir, hostname, config_type + ".txt")
+    # Configs which aren't implemented by the driver have no file
+    if path.exists():
+        config_index.add_config(
+            run, hostname, config_type, path.read_text(errors="replace")
+        )
@@ -0,0 +1,165 @@
+"""
+The timeout and retry policy of the napalm_get calls.
+
+The time taken by each successful config or getter is recorded per (platform, item) in
+cache/latency.json. The NAPALM timeout of an item is then worked out from a high
+percentile of its recorded times, so get_config on a big Junos box gets a long timeout
+while facts on a dead host fails quickly. Items without enough samples keep the timeout
+of the inventory, i.e. a timeout in the napalm connection extras, or the NAPALM default.
+
+Items which fail with a transient error, i.e. a connection timeout or reset, are retried
+with exponential backoff and full jitter. Retries are put back on the queue of the run,
+so no worker is blocked while waiting for the backoff.
+"""
+
+# Import Modules
+import json
+import math
+import os
+import pathlib
+import random
+
+# Default location of the recorded latencies
+LATENCY_FILE = "cache/latency.json"
+# The NAPALM default timeout, used when the inventory doesn't set one
+DEFAULT_TIMEOUT = 60.0
+# Bounds of the worked out timeouts, in seconds
+MIN_TIMEOUT = 10.0
+MAX_TIMEOUT = 900.0
+# The percentile of the recorded times the timeout is based on
+TIMEOUT_PERCENTILE = 95
+# The timeout is this many times the percentile, to leave room for a slow day
+TIMEOUT_FACTOR = 3.0
+# The number of samples needed before the timeout is worked out
+MIN_SAMPLES = 5
+# The number of most recent samples kept per (platform, item)
+MAX_SAMPLES = 200
+# Default number of retries of a transient failure
+RETRIES = 2
+# Default base and cap of the exponential backoff, in seconds
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 60.0
+# Exception classes which are worth retrying. Authentication failures and
+# unsupported getters will fail the same way again, so are not retried.
+TRANSIENT_ERRORS = {
+    "ConnectionException",
+    "ConnectionClosedException",
+    "ConnectionResetError",
+    "ConnectTimeout",
+    "ConnectTimeoutError",
+    "EOFError",
+    "NetmikoTimeoutException",
+    "ReadTimeout",
+    "ReadTimeoutError",
+    "RpcTimeoutError",
+    "SSHException",
+    "TimeoutError",
+    "timeout",
+}
+
+
+def item_key(platform, item):
+    """
+    This function returns the key an item's latencies are stored against.
+    :param platform: The platform of the host, i.e. ios
+    :param item: The getter name, or "config" for the configs.
+    :return: The key, i.e. "junos/config"
+    """
+    return str(platform) + "/" + str(item)
+
+
+def percentile(samples, q):
+    """
+    This function returns the q-th percentile of a list of samples, using the
+    nearest-rank method.
+    :param samples: A list of numbers.
+    :param q: The percentile, from 0 to 100.
+    :return: The percentile value.
+    """
+    ordered = sorted(samples)
+    rank = max(math.ceil(q * len(ordered) / 100.0) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class LatencyStore:
+    """
+    The recorded times of each (platform, item), and the timeouts worked out from them.
+    """
+
+    def __init__(self, latency_file=LATENCY_FILE):
+        self.latency_file = latency_file
+        try:
+            with open(latency_file) as f:
+                self.samples = json.load(f)
+        except (OSError, ValueError):
+            self.samples = {}
+
+    def record(self, platform, item, seconds):
+        """
+        This function records the time taken by a successful item.
+        :param platform: The platform of the host.
+        :param item: The getter name, or "config" for the configs.
+        :param seconds: The time taken.
+        :return:
+        """
+        samples = self.samples.setdefault(item_key(platform, item), [])
+        samples.append(round(seconds, 3))
+        del samples[:-MAX_SAMPLES]
+
+    def timeout(self, platform, item):
+        """
+        This function works out the NAPALM timeout of an item.
+        :param platform: The platform of the host.
+        :param item: The getter name, or "config" for the configs.
+        :return: The timeout in seconds, or None to keep the timeout of the inventory
+        when the item doesn't have enough samples yet.
+        """
+        samples = self.samples.get(item_key(platform, item), [])
+        if len(samples) < MIN_SAMPLES:
+            return None
+        timeout = percentile(samples, TIMEOUT_PERCENTILE) * TIMEOUT_FACTOR
+        return round(min(max(timeout, MIN_TIMEOUT), MAX_TIMEOUT), 1)
+
+    def medians(self):
+        """
+        This function returns the usual time taken by each item, for the items with
+        enough samples.
+        :return: A dictionary of item key, i.e. "junos/config", to the median in seconds.
+        """
+        return {
+            key: percentile(samples, 50)
+            for key, samples in self.samples.items()
+            if len(samples) >= MIN_SAMPLES
+        }
+
+    def save(self):
+        """
+        This function saves the recorded times, replacing the file atomically.
+        :return:
+        """
+        pathlib.Path(self.latency_file).parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.latency_file + "." + str(os.getpid()) + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.samples, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.latency_file)
+
+
+def is_transient(error):
+    """
+    This function determines whether a failure is worth retrying.
+    :param error: The exception class name, as returned by failure_class.
+    :return: True if the failure is transient, otherwise False.
+    """
+    return error in TRANSIENT_ERRORS
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """
+    This function returns the delay before a retry, using exponential backoff with full
+    jitter, so retries of hosts which failed together don't all fire at the same moment.
+    :param attempt: The number of the retry, starting at 1.
+    :param base: The base delay in seconds.
+    :param cap: The maximum delay in seconds.
+    :return: The delay in seconds.
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))  # nosec
@@ -0,0 +1,356 @@
+"""
+A fleet-wide topology index built from the lldp_neighbors getter of every host.
+
+The index answers "what is connected to X" with dictionary lookups, pairs up both
+ends of each link and flags links which are only seen from one side. It can be
+exported to JSON or GraphML, i.e. for viewing in yEd or Gephi.
+
+It can also be run from the command line against a facts directory:
+
+python -m day_one_net_toolkit.topology --neighbors lab-arista-01 --export topology.graphml
+"""
+
+# Import Modules
+import argparse
+import ipaddress
+import json
+import os
+from xml.sax.saxutils import escape, quoteattr
+from day_one_net_toolkit.factstore import FACT_DIR, READ_WORKERS, load_fact_store
+
+# Common interface name abbreviations, which are expanded so both ends of a link match
+INTERFACE_ABBREVIATIONS = [
+    ("hundredgige", "hundredgigabitethernet"),
+    ("fortygige", "fortygigabitethernet"),
+    ("tengige", "tengigabitethernet"),
+    ("gige", "gigabitethernet"),
+    ("hu", "hundredgigabitethernet"),
+    ("fo", "fortygigabitethernet"),
+    ("gi", "gigabitethernet"),
+    ("te", "tengigabitethernet"),
+    ("fa", "fastethernet"),
+    ("eth", "ethernet"),
+    ("et", "ethernet"),
+]
+# Link states reported by the index
+SYMMETRIC = "symmetric"
+ASYMMETRIC = "asymmetric"
+HALF_SEEN = "half-seen"
+
+
+def normalise_fqdn(hostname):
+    """
+    This function normalises a hostname, keeping its domain.
+    i.e. "LAB-ARISTA-01.lab.dfjt.local." becomes "lab-arista-01.lab.dfjt.local"
+    :param hostname: The hostname to normalise.
+    :return: The normalised hostname.
+    """
+    return str(hostname).strip().lower().rstrip(".")
+
+
+def normalise_hostname(hostname):
+    """
+    This function normalises a hostname to its short name, so the name in the inventory
+    and the name advertised in LLDP match. i.e. "LAB-ARISTA-01.lab.dfjt.local." becomes
+    "lab-arista-01". IP addresses are left as they are.
+    :param hostname: The hostname to normalise.
+    :return: The normalised hostname.
+    """
+    hostname = normalise_fqdn(hostname)
+    try:
+        ipaddress.ip_address(hostname)
+        return hostname
+    except ValueError:
+        return hostname.split(".")[0]
+
+
+def normalise_port(port):
+    """
+    This function normalises an interface name, so abbreviated and full names match.
+    i.e. "Gi0/1" and "GigabitEthernet0/1" both become "gigabitethernet0/1"
+    :param port: The interface name to normalise.
+    :return: The normalised interface name.
+    """
+    port = str(port).strip().lower().replace(" ", "")
+    for short, full in INTERFACE_ABBREVIATIONS:
+        if port.startswith(full):
+            return port
+        # Only expand when the abbreviation is followed by the interface number
+        if port.startswith(short) and port[len(short) : len(short) + 1].isdigit():
+            return full + port[len(short) :]
+    return port
+
+
+class TopologyIndex:
+    """
+    An adjacency index of the LLDP neighbors across the fleet.
+
+    Each observation is stored as node -> local port -> [(remote node, remote port)],
+    where nodes and ports are normalised, so lookups are constant time.
+    """
+
+    def __init__(self):
+        # Normalised node name to the name it was first seen with
+        self.nodes = {}
+        # Short name to the nodes with that short name, to match names without a domain
+        self.short_names = {}
+        # Normalised node names which have reported their own LLDP neighbors
+        self.collected = set()
+        # node -> local port -> list of (remote node, remote port)
+        self.adjacency = {}
+        # Set of (node, port, remote node, remote port) observations
+        self.observations = set()
+
+    def _resolve(self, hostname):
+        """
+        This function finds the node of a hostname. The fully qualified name is matched
+        first, then the short name, so a name with and without its domain match while
+        hosts with the same short name in different domains are kept apart.
+        :param hostname: The hostname, with or without its domain.
+        :return: The node, or None if the hostname isn't known.
+        """
+        fqdn = normalise_fqdn(hostname)
+        if fqdn in self.nodes:
+            return fqdn
+        short = normalise_hostname(fqdn)
+        for node in self.short_names.get(short, []):
+            if fqdn == short or node == short:
+                return node
+        return None
+
+    def _node(self, hostname):
+        node = self._resolve(hostname)
+        if node is None:
+            node = normalise_fqdn(hostname)
+            self.nodes[node] = str(hostname)
+            self.short_names.setdefault(normalise_hostname(node), []).append(node)
+        return node
+
+    def add_host(self, hostname, lldp_neighbors):
+        """
+        This function adds the LLDP neighbors of a host to the index. All neighbors
+        of a port are kept, not only the first one.
+        :param hostname: The name of the host in the inventory.
+        :param lldp_neighbors: The result of the lldp_neighbors getter for the host.
+        :return:
+        """
+        node = self._node(hostname)
+        self.collected.add(node)
+        ports = self.adjacency.setdefault(node, {})
+        for local_port, neighbors in (lldp_neighbors or {}).items():
+            port = normalise_port(local_port)
+            for neighbor in neighbors:
+                remote = (
+                    self._node(neighbor.get("hostname", "")),
+                    normalise_port(neighbor.get("port", "")),
+                )
+                observation = (node, port) + remote
+                if observation not in self.observations:
+                    self.observations.add(observation)
+                    ports.setdefault(port, []).append(remote)
+
+    def neighbors(self, hostname):
+        """
+        This function returns what is connected to a host.
+        :param hostname: The host name, with or without its domain.
+        :return: A dictionary of local port to a list of (remote node, remote port).
+        """
+        return self.adjacency.get(self._resolve(hostname), {})
+
+    def port_neighbors(self, hostname, port):
+        """
+        This function returns what is connected to a port of a host.
+        :param hostname: The host name, with or without its domain.
+        :param port: The interface name, in any form accepted by normalise_port.
+        :return: A list of (remote node, remote port).
+        """
+        return self.neighbors(hostname).get(normalise_port(port), [])
+
+    def link_state(self, node, port, remote_node, remote_port):
+        """
+        This function works out whether a link has been seen from both ends.
+        :return: SYMMETRIC when both ends report each other, HALF_SEEN when the
+        remote node hasn't been collected, otherwise ASYMMETRIC.
+        """
+        if (remote_node, remote_port, node, port) in self.observations:
+            return SYMMETRIC
+        if remote_node not in self.collected:
+            return HALF_SEEN
+        return ASYMMETRIC
+
+    def links(self):
+        """
+        This function yields each link once, with both ends of symmetric links paired up.
+        :return: A generator of (node, port, remote node, remote port, state) tuples.
+        """
+        for node, port, remote_node, remote_port in self.observations:
+            state = self.link_state(node, port, remote_node, remote_port)
+            # Only yield symmetric links from the end which sorts first
+            if state == SYMMETRIC and (remote_node, remote_port) < (node, port):
+                continue
+            yield node, port, remote_node, remote_port, state
+
+    def problem_links(self):
+        """
+        This function returns the links which have not been seen from both ends.
+        :return: A sorted list of (node, port, remote node, remote port, state) tuples.
+        """
+        return sorted(link for link in self.links() if link[4] != SYMMETRIC)
+
+    def to_json(self, path):
+        """
+        This function exports the topology as a JSON node and link list.
+        :param path: The file to write to.
+        :return:
+        """
+        topology = {
+            "nodes": [
+                {"id": node, "name": name, "collected": node in self.collected}
+                for node, name in sorted(self.nodes.items())
+            ],
+            "links": [
+                {
+                    "source": node,
+                    "source_port": port,
+                    "target": remote_node,
+                    "target_port": remote_port,
+                    "state": state,
+                }
+                for node, port, remote_node, remote_port, state in sorted(self.links())
+            ],
+        }
+        with open(path, "w") as f:
+            json.dump(topology, f, indent=2)
+
+    def to_graphml(self, path):
+        """
+        This function exports the topology as GraphML. The file is written as a stream,
+        so large topologies are not built up in memory first.
+        :param path: The file to write to.
+        :return:
+        """
+        with open(path, "w") as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+            for key, domain in [
+                ("name", "node"),
+                ("collected", "node"),
+                ("source_port", "edge"),
+                ("target_port", "edge"),
+                ("state", "edge"),
+            ]:
+                attr_type = "boolean" if key == "collected" else "string"
+                f.write(
+                    f'  <key id="{key}" for="{domain}" attr.name="{key}" '
+                    f'attr.type="{attr_type}"/>\n'
+                )
+            f.write('  <graph id="lldp" edgedefault="undirected">\n')
+            for node, name in sorted(self.nodes.items()):
+                f.write(f"    <node id={quoteattr(node)}>")
+                f.write(f'<data key="name">{escape(str(name))}</data>')
+                collected = "true" if node in self.collected else "false"
+                f.write(f'<data key="collected">{collected}</data></node>\n')
+            for node, port, remote_node, remote_port, state in sorted(self.links()):
+                f.write(
+                    f"    <edge source={quoteattr(node)} target={quoteattr(remote_node)}>"
+                )
+                f.write(f'<data key="source_port">{escape(port)}</data>')
+                f.write(f'<data key="target_port">{escape(remote_port)}</data>')
+                f.write(f'<data key="state">{state}</data></edge>\n')
+            f.write("  </graph>\n</graphml>\n")
+
+    def export(self, path):
+        """
+        This function exports the topology, using GraphML for .graphml files
+        and JSON for anything else.
+        :param path: The file to write to.
+        :return:
+        """
+        if path.lower().endswith(".graphml"):
+            self.to_graphml(path)
+        else:
+            self.to_json(path)
+
+
+def build_topology(results):
+    """
+    This function builds a topology index from lldp_neighbors results.
+    :param results: An iterable of (hostname, lldp_neighbors result) tuples.
+    :return: A TopologyIndex object.
+    """
+    index = TopologyIndex()
+    for hostname, lldp_neighbors in results:
+        index.add_host(hostname, lldp_neighbors)
+    return index
+
+
+def load_topology(fact_dir=FACT_DIR, hostnames=None, workers=READ_WORKERS):
+    """
+    This function builds a topology index from the lldp_neighbors.json files in
+    a facts directory.
+    :param fact_dir: The directory where the getters are stored.
+    :param hostnames: A list of host names to load. Defaults to every host directory.
+    :param workers: The number of threads used to read the files.
+    :return: A TopologyIndex object.
+    """
+    if hostnames is None:
+        hostnames = sorted(
+            entry.name for entry in os.scandir(fact_dir) if entry.is_dir()
+        )
+    store, _ = load_fact_store(fact_dir, hostnames, ["lldp_neighbors"], workers=workers)
+    return build_topology(store["lldp_neighbors"].items())
+
+
+def main():
+    """
+    This function is the command line interface to the topology index.
+    :return:
+    """
+    parser = argparse.ArgumentParser(
+        description="Build an LLDP topology of the fleet from a facts directory."
+    )
+    parser.add_argument(
+        "--facts-dir",
+        default=FACT_DIR,
+        help="The facts directory saved by day-one-toolkit.py (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--neighbors",
+        metavar="HOST",
+        action="append",
+        help="Show what is connected to a host",
+    )
+    parser.add_argument(
+        "--problems",
+        action="store_true",
+        help="Show the links which have not been seen from both ends",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="FILE",
+        help="Export the topology to a .graphml or .json file",
+    )
+    args = parser.parse_args()
+    index = load_topology(args.facts_dir)
+    print(
+        "Nodes: "
+        + str(len(index.nodes))
+        + " - Collected: "
+        + str(len(index.collected))
+        + " - Observations: "
+        + str(len(index.observations))
+    )
+    for hostname in args.neighbors or []:
+        for port, remotes in sorted(index.neighbors(hostname).items()):
+            for remote_node, remote_port in remotes:
+                print(f"{hostname} {port} -> {remote_node} {remote_port}")
+    if args.problems:
+        for node, port, remote_node, remote_port, state in index.problem_links():
+            print(f"{state.upper()} : {node} {port} -> {remote_node} {remote_port}")
+    if args.export:
+        index.export(args.export)
+        print("Topology exported to: " + str(args.export))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Tests of the dictionary compressed config archive.
+"""
+
+# Import Modules
+import pytest
+from day_one_net_toolkit.archive import (
+    ArchivedRun,
+    add_run,
+    read_configs,
+    run_files,
+    train_dictionary,
+)
+
+
+def config(hostname, index):
+    lines = ["hostname " + hostname, "service timestamps debug datetime msec"]
+    lines += [
+        f"interface GigabitEthernet0/{port}\n description port {port} of {hostname}"
+        for port in range(index % 7 + 24)
+    ]
+    return "\n".join(lines + ["end"]) + "\n"
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    for i in range(40):
+        hostname = "rtr-" + str(i)
+        (tmp_path / "configs" / hostname).mkdir(parents=True)
+        (tmp_path / "configs" / hostname / "running.txt").write_text(
+            config(hostname, i)
+        )
+    (tmp_path / "configs" / "rtr-0" / "startup.txt").write_text(config("rtr-0", 3))
+    return str(tmp_path / "configs")
+
+
+def test_add_run_round_trip(tmp_path, config_dir):
+    archive_dir = str(tmp_path / "archive")
+    run = add_run(archive_dir, config_dir, run="RUN-2000-01-01-00-00-00")
+    assert run_files(archive_dir) == [run]
+    archived = ArchivedRun(archive_dir, run)
+    assert archived.index["dictionary"] != 0
+    assert archived.entries()[:2] == [("rtr-0", "running"), ("rtr-0", "startup")]
+    assert archived.read("rtr-7", "running") == config("rtr-7", 7).encode()
+    # The next run re-uses the dictionary, rather than training another one
+    second = add_run(archive_dir, config_dir, run="RUN-2000-01-02-00-00-00")
+    assert ArchivedRun(archive_dir, second).index["dictionary"] == (
+        archived.index["dictionary"]
+    )
+    assert run_files(archive_dir) == [run, second]
+
+
+def test_add_run_collected_configs(tmp_path, config_dir):
+    archive_dir = str(tmp_path / "archive")
+    # Only the configs collected by the run are archived, not every file left over
+    collected = {("rtr-" + str(i), "running") for i in range(1, 40)}
+    run = add_run(archive_dir, config_dir, configs=collected)
+    archived = ArchivedRun(archive_dir, run)
+    assert archived.index["dictionary"] != 0
+    assert set(archived.entries()) == collected
+
+
+def test_extract(tmp_path, config_dir):
+    archive_dir = str(tmp_path / "archive")
+    run = add_run(archive_dir, config_dir)
+    output_dir = tmp_path / "extracted"
+    assert ArchivedRun(archive_dir, run).extract(str(output_dir), ["rtr-0"]) == 2
+    assert sorted(read_configs(str(output_dir))) == sorted(
+        entry for entry in read_configs(config_dir) if entry[0] == "rtr-0"
+    )
+
+
+def test_too_few_configs(tmp_path):
+    (tmp_path / "configs" / "rtr-01").mkdir(parents=True)
+    (tmp_path / "configs" / "rtr-01" / "running.txt").write_text("hostname rtr-01\n")
+    archive_dir = str(tmp_path / "archive")
+    config_dir = str(tmp_path / "configs")
+    assert train_dictionary(archive_dir, config_dir) == 0
+    # Without a dictionary the configs are still compressed and read back
+    run = add_run(archive_dir, config_dir)
+    assert (
+        ArchivedRun(archive_dir, run).read("rtr-01", "running") == b"hostname rtr-01\n"
+    )
@@ -0,0 +1,130 @@
+"""
+Tests of the fleet-wide BGP session map.
+"""
+
+# Import Modules
+from day_one_net_toolkit.bgp import (
+    AS_MISMATCH,
+    DOWN,
+    ESTABLISHED,
+    EXTERNAL,
+    ONE_SIDED,
+    SessionMap,
+    as_number,
+    normalise_address,
+)
+
+
+def neighbors(*peers):
+    """
+    This function builds a bgp_neighbors result from (remote address, local AS,
+    remote AS, up) tuples.
+    """
+    return {
+        "global": {
+            "peers": {
+                remote_address: {
+                    "local_as": local_as,
+                    "remote_as": remote_as,
+                    "is_up": up,
+                    "address_family": {"ipv4": {"received_prefixes": 10}},
+                }
+                for remote_address, local_as, remote_as, up in peers
+            }
+        }
+    }
+
+
+def detail(*peers):
+    """
+    This function builds a bgp_neighbors_detail result from (local address, remote
+    address) tuples.
+    """
+    return {
+        "global": {
+            "0": [
+                {"local_address": local_address, "remote_address": remote_address}
+                for local_address, remote_address in peers
+            ]
+        }
+    }
+
+
+def states(session_map):
+    return {
+        (entry.hostname, entry.remote_address): entry.state
+        for entry in session_map.sessions
+    }
+
+
+def test_normalise():
+    assert normalise_address("2001:DB8::0001/128") == "2001:db8::1"
+    assert normalise_address(None) == ""
+    assert as_number("1.10") == 65546
+    assert as_number("") == 0
+
+
+def test_build():
+    session_map = SessionMap()
+    session_map.add_host(
+        "rtr-01",
+        neighbors(
+            ("10.0.0.2", 65001, 65002, True),
+            ("10.0.1.3", 65001, 65003, True),
+            ("10.0.2.4", 65001, 65004, False),
+            ("192.0.2.1", 65001, 64496, True),
+        ),
+        detail(("10.0.0.1", "10.0.0.2"), ("10.0.1.1", "10.0.1.3")),
+    )
+    session_map.add_host(
+        "rtr-02",
+        neighbors(("10.0.0.1", 65002, 65001, True)),
+        detail(("10.0.0.2", "10.0.0.1")),
+    )
+    # rtr-03 expects rtr-01 to be in a different AS
+    session_map.add_host(
+        "rtr-03",
+        neighbors(("10.0.1.1", 65003, 65009, True)),
+        detail(("10.0.1.3", "10.0.1.1")),
+    )
+    # rtr-04 owns the address rtr-01 peers with, but has no session
+    session_map.add_host(
+        "rtr-04", {}, interfaces_ip={"Gi1": {"ipv4": {"10.0.2.4": {}}}}
+    )
+    session_map.build()
+    assert states(session_map) == {
+        ("rtr-01", "10.0.0.2"): ESTABLISHED,
+        ("rtr-01", "10.0.1.3"): AS_MISMATCH,
+        ("rtr-01", "10.0.2.4"): ONE_SIDED,
+        ("rtr-01", "192.0.2.1"): EXTERNAL,
+        ("rtr-02", "10.0.0.1"): ESTABLISHED,
+        ("rtr-03", "10.0.1.1"): AS_MISMATCH,
+    }
+    # Each paired session is listed once
+    assert len(list(session_map.pairs())) == 4
+    problems = [
+        (entry.hostname, entry.remote_address) for entry, _ in session_map.problems()
+    ]
+    assert problems == [("rtr-01", "10.0.1.3"), ("rtr-01", "10.0.2.4")]
+    assert session_map.remote_hostname(session_map.sessions[2]) == "rtr-04"
+    assert session_map.remote_hostname(session_map.sessions[3]) == ""
+
+
+def test_build_without_local_address():
+    session_map = SessionMap()
+    session_map.add_host(
+        "rtr-01",
+        neighbors(("10.0.0.2", 65001, 65002, True)),
+        detail(("10.0.0.1", "10.0.0.2")),
+    )
+    # rtr-02 only has bgp_neighbors, so its end is paired on rtr-01's end
+    session_map.add_host(
+        "rtr-02",
+        neighbors(("10.0.0.1", 65002, 65001, False)),
+        interfaces_ip={"Gi1": {"ipv4": {"10.0.0.2": {}}}},
+    )
+    session_map.build()
+    rtr_01, rtr_02 = session_map.sessions
+    assert rtr_01.peer is rtr_02
+    assert rtr_02.local_address == "10.0.0.2"
+    assert rtr_01.state == rtr_02.state == DOWN
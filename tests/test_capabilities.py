@@ -0,0 +1,77 @@
+"""
+Tests of the unsupported getter capability cache.
+"""
+
+# Import Modules
+import json
+from types import SimpleNamespace
+from day_one_net_toolkit.capabilities import (
+    UNKNOWN_VERSION,
+    getter_unsupported,
+    load_capability_cache,
+    prune_plan,
+    read_os_version,
+    record_unsupported,
+    save_capability_cache,
+    unsupported_getters,
+)
+
+
+def save_facts(fact_dir, hostname, facts):
+    (fact_dir / hostname).mkdir()
+    (fact_dir / hostname / "facts.json").write_text(json.dumps(facts))
+
+
+def host_plan(hostname, getters):
+    return {"host": hostname, "platform": "ios", "configs": [], "getters": getters}
+
+
+def test_record_unsupported():
+    cache = {}
+    record_unsupported(cache, "ios", "15.2", "optics")
+    record_unsupported(cache, "ios", "15.2", "bgp_neighbors")
+    record_unsupported(cache, "ios", "15.2", "optics")
+    assert unsupported_getters(cache, "ios", "15.2") == {"optics", "bgp_neighbors"}
+    assert unsupported_getters(cache, "ios", "16.9") == set()
+
+
+def test_cache_round_trip(tmp_path):
+    cache_file = str(tmp_path / "cache" / "capabilities.json")
+    assert load_capability_cache(cache_file) == {}
+    cache = {}
+    record_unsupported(cache, "ios", "15.2", "optics")
+    save_capability_cache(cache, cache_file)
+    assert load_capability_cache(cache_file) == cache
+
+
+def test_read_os_version(tmp_path):
+    save_facts(tmp_path, "rtr-01", {"os_version": "15.2"})
+    fact_dir = str(tmp_path)
+    assert read_os_version("rtr-01", fact_dir) == "15.2"
+    assert read_os_version("rtr-02", fact_dir) == UNKNOWN_VERSION
+
+
+def test_prune_plan(tmp_path):
+    save_facts(tmp_path, "rtr-01", {"os_version": "15.2"})
+    save_facts(tmp_path, "rtr-02", {"os_version": "16.9"})
+    fact_dir = str(tmp_path)
+    cache = {}
+    record_unsupported(cache, "ios", "15.2", "optics")
+    plan = [
+        host_plan("rtr-01", ["facts", "optics", "interfaces"]),
+        host_plan("rtr-02", ["facts", "optics"]),
+    ]
+    assert prune_plan(plan, cache, fact_dir) == 1
+    assert plan[0]["getters"] == ["facts", "interfaces"]
+    assert plan[0]["skipped"] == ["optics"]
+    assert plan[1]["getters"] == ["facts", "optics"]
+    assert plan[1]["skipped"] == []
+
+
+def test_getter_unsupported():
+    def result(exception=None, value=None):
+        return SimpleNamespace(exception=exception, result=value)
+
+    assert getter_unsupported([result(), result(NotImplementedError())])
+    assert getter_unsupported([result(value="Getter Not Implemented")])
+    assert not getter_unsupported([result(), result(ConnectionError())])
@@ -0,0 +1,99 @@
+"""
+Tests of the raw CLI command collection and parsing.
+"""
+
+# Import Modules
+import json
+from types import SimpleNamespace
+from nornir.core.exceptions import NornirSubTaskError
+from day_one_net_toolkit.cli import build_parser
+from day_one_net_toolkit.commands import (
+    collect_commands,
+    command_slug,
+    load_command_matrix,
+    parse_all,
+    saved_jobs,
+)
+
+TEMPLATE = "<group>\nhostname {{ hostname }}\n</group>"
+COMMANDS = [
+    {
+        "command": "show running-config | include hostname",
+        "parser": "ttp",
+        "template": TEMPLATE,
+    },
+    {"command": "show clock", "parser": "none", "template": None},
+    {"command": "show inventory", "parser": "textfsm", "template": None},
+]
+
+
+class FakeTask:
+    def __init__(self, outputs):
+        self.host = SimpleNamespace(name="rtr-01", platform="ios")
+        self.outputs = outputs
+
+    def run(self, task, command_string, name):
+        output = self.outputs[command_string]
+        if output is None:
+            raise NornirSubTaskError(task, None)
+        return SimpleNamespace(result=output)
+
+
+def test_load_command_matrix(tmp_path):
+    commands_file = tmp_path / "commands.yaml"
+    commands_file.write_text(
+        "ios:\n  - command: show inventory\n  - command: show clock\n    parser: none\n"
+    )
+    assert load_command_matrix(str(commands_file)) == {
+        "ios": [
+            {"command": "show inventory", "parser": "textfsm", "template": None},
+            {"command": "show clock", "parser": "none", "template": None},
+        ]
+    }
+    assert load_command_matrix(str(tmp_path / "missing.yaml")) == {}
+
+
+def test_command_slug():
+    assert command_slug("show ip  route | i 0/0") == "show_ip_route_-_i_0-0"
+
+
+def test_collect_and_parse(tmp_path):
+    command_dir = str(tmp_path)
+    task = FakeTask(
+        {
+            COMMANDS[0]["command"]: "hostname rtr-01\n",
+            COMMANDS[1]["command"]: "12:00:00 UTC\n",
+            COMMANDS[2]["command"]: None,
+        }
+    )
+    result = collect_commands(task, COMMANDS, command_dir)
+    # The failed command doesn't stop the others being saved and parsed
+    assert result["failed"] == ["show inventory"]
+    assert [job["command"] for job in result["jobs"]] == [COMMANDS[0]["command"]]
+    assert (tmp_path / "rtr-01" / "show_clock.txt").read_text() == "12:00:00 UTC\n"
+    assert saved_jobs(command_dir) == result["jobs"]
+    [(path, records, error)] = parse_all(result["jobs"], workers=1, processes=False)
+    assert (records, error) == (1, None)
+    with open(path + ".json") as f:
+        assert json.load(f) == [{"hostname": "rtr-01"}]
+
+
+def test_parse_error(tmp_path):
+    job = {
+        "command": "show version",
+        "parser": "textfsm",
+        "template": None,
+        "platform": "not_a_platform",
+        "path": str(tmp_path / "show_version"),
+    }
+    (tmp_path / "show_version.txt").write_text("Version 1\n")
+    [(_, records, error)] = parse_all([job], workers=1, processes=False)
+    assert records == 0
+    assert error is not None
+
+
+def test_commands_opt_in():
+    parser = build_parser("test")
+    # A run without --commands collects the same as before the commands were added
+    assert parser.parse_args([]).commands is False
+    assert parser.parse_args(["--commands"]).commands is True
@@ -0,0 +1,91 @@
+"""
+Tests of the adaptive concurrency limit.
+"""
+
+# Import Modules
+from day_one_net_toolkit.concurrency import MIN_WINDOW, ConcurrencyLimiter
+
+
+def fill(limiter, count, seconds=1.0, error=None):
+    for _ in range(count):
+        limiter.record("ios/facts", seconds, error)
+
+
+def saturated_limiter(limit=8, **kwargs):
+    limiter = ConcurrencyLimiter(limit, maximum=20, adaptive=True, **kwargs)
+    for _ in range(limit):
+        limiter.acquire()
+    return limiter
+
+
+def test_healthy_window_increases():
+    limiter = saturated_limiter()
+    fill(limiter, 8)
+    assert limiter.limit == 9
+    assert limiter.decisions[-1]["reason"] == "healthy"
+
+
+def test_not_saturated_holds():
+    limiter = ConcurrencyLimiter(8, maximum=20, adaptive=True)
+    fill(limiter, 8)
+    assert limiter.limit == 8
+    assert limiter.decisions[-1]["reason"] == "not saturated"
+
+
+def test_congestion_errors_halve():
+    limiter = saturated_limiter()
+    fill(limiter, 6)
+    fill(limiter, 2, error="ConnectionException")
+    assert limiter.limit == 4
+    assert limiter.decisions[-1]["reason"] == "errors"
+
+
+def test_other_errors_are_not_congestion():
+    limiter = saturated_limiter()
+    fill(limiter, 6)
+    fill(limiter, 2, error="NotImplementedError")
+    assert limiter.limit == 9
+
+
+def test_latency_halves():
+    limiter = saturated_limiter(baselines={"ios/facts": 1.0})
+    fill(limiter, 8, seconds=3.0)
+    assert limiter.limit == 4
+    assert limiter.decisions[-1]["reason"] == "latency"
+
+
+def test_draining_ignores_old_sessions():
+    limiter = saturated_limiter()
+    fill(limiter, 8, error="ConnectionException")
+    assert limiter.limit == 4
+    # Items of the sessions opened before the decrease don't start a window
+    limiter.release()
+    fill(limiter, 1, error="ConnectionException")
+    assert (limiter.limit, limiter.items) == (4, 0)
+    for _ in range(3):
+        limiter.release()
+    fill(limiter, MIN_WINDOW)
+    assert len(limiter.decisions) == 2
+
+
+def test_window_minimum_and_bounds():
+    limiter = saturated_limiter(limit=1)
+    fill(limiter, MIN_WINDOW - 1)
+    assert limiter.decisions == []
+    fill(limiter, 1)
+    assert limiter.limit == 2
+    limiter = saturated_limiter(limit=1)
+    fill(limiter, MIN_WINDOW, error="ConnectionException")
+    assert limiter.limit == 1
+
+
+def test_tuned_averages_after_first_decrease():
+    limiter = ConcurrencyLimiter(10, maximum=20, adaptive=True)
+    limiter.decisions = [
+        {"old": 10, "new": 11},
+        {"old": 11, "new": 5},
+        {"old": 5, "new": 6},
+        {"old": 6, "new": 7},
+    ]
+    assert limiter.tuned() == 6
+    assert ConcurrencyLimiter(10).tuned() == 10
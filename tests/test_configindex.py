@@ -0,0 +1,103 @@
+"""
+Tests of the SQLite inverted index of config lines.
+"""
+
+# Import Modules
+import pytest
+from day_one_net_toolkit.configindex import (
+    ConfigIndex,
+    regex_literals,
+    token_conditions,
+    tokenize,
+)
+
+RTR_01 = """hostname rtr-01
+!
+ip http server
+interface GigabitEthernet1
+ ip address 10.0.0.1 255.255.255.0
+ ip access-group MGMT in
+"""
+RTR_02 = """hostname rtr-02
+!
+no ip http server
+interface GigabitEthernet1
+ ip address 10.0.1.1 255.255.255.0
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ConfigIndex(str(tmp_path / "indexes" / "configs.db"))
+    index.add_config("RUN-2000-01-01-00-00-00", "rtr-01", "running", RTR_01)
+    index.add_config("RUN-2000-01-01-00-00-00", "rtr-02", "running", RTR_02)
+    yield index
+    index.close()
+
+
+def test_tokenize():
+    assert tokenize(" ip address 10.0.0.1 255.255.255.0") == {
+        "ip",
+        "address",
+        "10.0.0.1",
+        "255.255.255.0",
+    }
+
+
+def test_regex_literals():
+    assert regex_literals(r"access-group \S+ in") == ["access-group ", " in"]
+    assert regex_literals(r"^ip http server$") == ["ip http server"]
+    assert regex_literals(r"ip (http|ssh) server") == ["ip ", " server"]
+    # A top level alternation has no fragments every match contains
+    assert regex_literals(r"http|ssh") == []
+
+
+def test_token_conditions():
+    assert token_conditions("http server") == [("suffix", "http"), ("prefix", "server")]
+    assert token_conditions(" http server ") == [("exact", "http"), ("exact", "server")]
+    assert token_conditions("ttp") == [("infix", "ttp")]
+
+
+def test_search_literal(index):
+    hits = index.search("ip http server")
+    assert [(host, lineno, line) for host, _, _, lineno, line in hits] == [
+        ("rtr-01", 3, "ip http server"),
+        ("rtr-02", 3, "no ip http server"),
+    ]
+    # Literals are case sensitive unless asked otherwise
+    assert index.search("IP HTTP") == []
+    assert len(index.search("IP HTTP", ignore_case=True)) == 2
+
+
+def test_search_infix(index):
+    # The first and last tokens can be partial
+    hits = index.search("ccess-gro")
+    assert [(host, line) for host, _, _, _, line in hits] == [
+        ("rtr-01", " ip access-group MGMT in")
+    ]
+    hits = index.search("0.1.1 255")
+    assert [host for host, _, _, _, _ in hits] == ["rtr-02"]
+
+
+def test_search_regex(index):
+    hits = index.search(r"access-group \S+ in$", regex=True)
+    assert [host for host, _, _, _, _ in hits] == ["rtr-01"]
+    hits = index.search(r"^ip http server", regex=True)
+    assert [host for host, _, _, _, _ in hits] == ["rtr-01"]
+    hits = index.search(r"10\.0\.\d\.1 ", regex=True)
+    assert [host for host, _, _, _, _ in hits] == ["rtr-01", "rtr-02"]
+
+
+def test_search_runs(index):
+    # An unchanged config only adds a row
+    assert index.add_config("RUN-2000-01-02-00-00-00", "rtr-01", "running", RTR_01) == 0
+    changed = RTR_02.replace("no ip http server", "ip http server")
+    assert index.add_config("RUN-2000-01-02-00-00-00", "rtr-02", "running", changed) > 0
+    # The latest run of each config is searched by default
+    hits = index.search("no ip http server")
+    assert hits == []
+    hits = index.search("no ip http server", run="RUN-2000-01-01-00-00-00")
+    assert [host for host, _, _, _, _ in hits] == ["rtr-02"]
+    hits = index.search("ip http server", all_runs=True)
+    assert len(hits) == 4
+    assert len(index.search("ip http server", all_runs=True, limit=1)) == 1
@@ -0,0 +1,88 @@
+"""
+Tests of the interface counter history.
+"""
+
+# Import Modules
+import os
+import numpy as np
+from day_one_net_toolkit.counters import (
+    COUNTER_FIELDS,
+    MISSING,
+    WRAP_32,
+    CounterHistory,
+    counter_deltas,
+)
+
+
+def sample(*values):
+    return np.array(values, dtype=np.uint64).reshape(len(values), 1, 1)
+
+
+def test_counter_deltas_forward():
+    assert counter_deltas(sample(100, 250))[0, 0, 0] == 150
+
+
+def test_counter_deltas_32_bit_wrap():
+    deltas = counter_deltas(sample(WRAP_32 - 10, 5))
+    assert deltas[0, 0, 0] == 15
+
+
+def test_counter_deltas_reset():
+    # A 64-bit counter going backwards, or a large drop, is a reset
+    assert counter_deltas(sample(WRAP_32 * 4, 7))[0, 0, 0] == 7
+    assert counter_deltas(sample(WRAP_32 // 4, 1000))[0, 0, 0] == 1000
+
+
+def test_counter_deltas_missing():
+    deltas = counter_deltas(sample(MISSING, 10, 20))
+    assert np.isnan(deltas[0, 0, 0])
+    assert deltas[1, 0, 0] == 10
+
+
+def test_history_rates(tmp_path):
+    history = CounterHistory(tmp_path, "rtr-01")
+    history.append({"Gi0/0": {"rx_octets": 1000}}, timestamp=100.0)
+    history.append({"Gi0/0": {"rx_octets": 3000}}, timestamp=110.0)
+    assert history.append({"Gi0/0": {"rx_octets": 1000}}, timestamp=120.0) == 3
+    timestamps, rates = history.rates()
+    column = COUNTER_FIELDS.index("rx_octets")
+    assert timestamps.tolist() == [110.0, 120.0]
+    assert rates[:, 0, column].tolist() == [200.0, 100.0]
+    # Counters which weren't reported are missing
+    assert np.isnan(rates[0, 0, COUNTER_FIELDS.index("tx_octets")])
+
+
+def test_history_new_interface(tmp_path):
+    history = CounterHistory(tmp_path, "rtr-01")
+    history.append({"Gi0/0": {"rx_octets": 1}}, timestamp=100.0)
+    history.append({"Gi0/0": {"rx_octets": 2}, "Gi0/1": {"rx_octets": 5}}, 110.0)
+    history = CounterHistory(tmp_path, "rtr-01")
+    counters = history.counters()
+    assert history.interfaces == ["Gi0/0", "Gi0/1"]
+    assert counters.shape == (2, 2, len(COUNTER_FIELDS))
+    assert counters[0, 1, 0] == MISSING
+
+
+def test_history_truncates_partial_sample(tmp_path):
+    history = CounterHistory(tmp_path, "rtr-01")
+    history.append({"Gi0/0": {"rx_octets": 1}}, timestamp=100.0)
+    # A run interrupted after writing the counters but not the timestamp
+    with open(os.path.join(history.path, "counters.bin"), "ab") as f:
+        f.write(b"\0" * 8 * len(COUNTER_FIELDS))
+    assert history.append({"Gi0/0": {"rx_octets": 2}}, timestamp=110.0) == 2
+    assert history.counters()[:, 0, COUNTER_FIELDS.index("rx_octets")].tolist() == [
+        1,
+        2,
+    ]
+
+
+def test_history_recovers_interrupted_new_interface(tmp_path):
+    history = CounterHistory(tmp_path, "rtr-01")
+    history.append({"Gi0/0": {"rx_octets": 1}}, timestamp=100.0)
+    # Grown counters written, but the run stopped before the interface list was saved
+    grown = np.full((1, 2, len(COUNTER_FIELDS)), MISSING, dtype=np.uint64)
+    grown.tofile(os.path.join(history.path, "counters.bin.tmp"))
+    history = CounterHistory(tmp_path, "rtr-01")
+    assert history.append({"Gi0/0": {"rx_octets": 2}}, timestamp=110.0) == 2
+    assert not os.path.exists(os.path.join(history.path, "counters.bin.tmp"))
+    assert history.counters().shape == (2, 1, len(COUNTER_FIELDS))
@@ -0,0 +1,124 @@
+"""
+Tests of the multi-customer runs and the fair-share connection budget.
+"""
+
+# Import Modules
+import argparse
+import os
+import threading
+import time
+from types import SimpleNamespace
+from day_one_net_toolkit import customers
+from day_one_net_toolkit.customers import (
+    FairShareBudget,
+    connection_slot,
+    customer_args,
+    run_customers,
+)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_fair_share():
+    budget = FairShareBudget(2)
+    budget.acquire("acme")
+    budget.acquire("acme")
+    granted = []
+
+    def acquire(customer):
+        budget.acquire(customer)
+        granted.append(customer)
+
+    # acme asks first, but globex has no sessions open so is granted first
+    for waiting, customer in enumerate(["acme", "globex"], 1):
+        threading.Thread(target=acquire, args=(customer,), daemon=True).start()
+        wait_for(lambda: len(budget.waiting) == waiting)
+    budget.release("acme")
+    wait_for(lambda: granted == ["globex"])
+    budget.release("globex")
+    wait_for(lambda: granted == ["globex", "acme"])
+    assert budget.stats()["globex"]["sessions"] == 1
+    assert budget.stats()["acme"]["sessions"] == 3
+
+
+def test_budget_limit():
+    budget = FairShareBudget(1)
+    budget.acquire("acme")
+    thread = threading.Thread(target=budget.acquire, args=("globex",), daemon=True)
+    thread.start()
+    time.sleep(0.1)
+    assert thread.is_alive()
+    budget.release("acme")
+    thread.join(5)
+    assert not thread.is_alive()
+    assert budget.open["globex"] == 1
+
+
+def test_connection_slot_without_budget():
+    assert customers._budget is None
+    with connection_slot():
+        pass
+
+
+def record_customer(args, username, password):
+    with open(args.record_file, "a") as f:
+        f.write(args.customer_name + "\n")
+    if args.customer_name == "bad":
+        raise RuntimeError("customer failed")
+
+
+def test_run_customers(tmp_path):
+    for name in ["acme", "bad"]:
+        (tmp_path / name).mkdir()
+    args = SimpleNamespace(
+        customers=[("acme", str(tmp_path / "acme")), ("bad", str(tmp_path / "bad"))],
+        connection_budget=2,
+        record_file=str(tmp_path / "customers.txt"),
+    )
+    assert run_customers(record_customer, args) is False
+    names = (tmp_path / "customers.txt").read_text().split()
+    assert sorted(names) == ["acme", "bad"]
+    args.customers = args.customers[:1]
+    assert run_customers(record_customer, args) is True
+
+
+def test_customer_args(tmp_path):
+    directory = tmp_path / "acme"
+    (directory / "inventory").mkdir(parents=True)
+    (directory / "inventory" / "commands.yaml").write_text("{}")
+    args = argparse.Namespace(
+        customers=[("acme", str(directory))],
+        inventory_files={"host_file": "inventory/hosts.yaml"},
+        log_dir="logs",
+        facts_dir="facts",
+        archive_dir="",
+        history_dir=str(tmp_path / "history"),
+        getters_file="inventory/getters.yaml",
+        commands_file="inventory/commands.yaml",
+    )
+    cwd = os.getcwd()
+    customer = customer_args(args, "acme", str(directory))
+    assert os.getcwd() == cwd
+    assert customer.customers is None
+    assert customer.customer_name == "acme"
+    assert customer.inventory_files == {
+        "host_file": os.path.join(str(directory), "inventory/hosts.yaml")
+    }
+    assert customer.log_dir == os.path.join(str(directory), "logs")
+    assert customer.facts_dir == os.path.join(str(directory), "facts")
+    # A disabled output stays disabled and an absolute path is kept
+    assert customer.archive_dir == ""
+    assert customer.history_dir == str(tmp_path / "history")
+    # The shared data files are used unless the customer has its own copy
+    assert customer.getters_file == "inventory/getters.yaml"
+    assert customer.commands_file == os.path.join(
+        str(directory), "inventory/commands.yaml"
+    )
+    # The arguments of the run are left as they are
+    assert args.log_dir == "logs"
+    assert args.customers == [("acme", str(directory))]
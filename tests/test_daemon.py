@@ -0,0 +1,119 @@
+"""
+Tests of the polling daemon scheduler.
+"""
+
+# Import Modules
+import io
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from day_one_net_toolkit import daemon
+from day_one_net_toolkit.daemon import (
+    CONFIG,
+    GETTER,
+    PollingDaemon,
+    build_daemon_parser,
+    item_interval,
+    load_schedule,
+)
+
+
+class FakeNornir:
+    def __init__(self, hostnames):
+        self.inventory = SimpleNamespace(
+            hosts={
+                hostname: SimpleNamespace(close_connections=lambda: None)
+                for hostname in hostnames
+            }
+        )
+
+    def close_connections(self):
+        pass
+
+
+def build_args(tmp_path):
+    return SimpleNamespace(
+        capability_cache=str(tmp_path / "capabilities.json"),
+        endpoint_index=str(tmp_path / "endpoints.db"),
+        history_dir=str(tmp_path / "history"),
+        latency_file=str(tmp_path / "latency.json"),
+        bounded_memory=False,
+        spill_threshold=8,
+        memory_budget=None,
+        timeout=None,
+        retries=0,
+        backoff=1.0,
+        workers=4,
+        idle_timeout=600,
+    )
+
+
+def test_load_schedule(tmp_path):
+    schedule_file = tmp_path / "schedule.yaml"
+    schedule_file.write_text("default: 600\ngetters:\n  arp_table: 60\n")
+    schedule = load_schedule(str(schedule_file))
+    assert schedule["configs"] == 600.0
+    assert item_interval(schedule, GETTER, "arp_table") == 60.0
+    assert item_interval(schedule, GETTER, "facts") == 600.0
+    assert item_interval(schedule, CONFIG, "running") == 600.0
+
+
+def test_daemon_parser():
+    parser = build_daemon_parser()
+    args = parser.parse_args(["--schedule", "schedule.yaml", "--workers", "5"])
+    assert (args.schedule, args.workers, args.retries) == ("schedule.yaml", 5, 2)
+    # Options of day-one-toolkit.py which the daemon doesn't use are rejected
+    for option in ["--clear-capability-cache", "--status-file", "--export"]:
+        with pytest.raises(SystemExit):
+            parser.parse_args([option, "x"])
+
+
+def test_cycles_never_overlap(tmp_path, monkeypatch):
+    plan = [
+        {"host": "rtr-01", "platform": "ios", "configs": [], "getters": []},
+        {"host": "rtr-02", "platform": "ios", "configs": [], "getters": []},
+    ]
+    schedule = {"default": 3600.0, "jitter": 0.0, "configs": 3600.0, "getters": {}}
+    polling = PollingDaemon(
+        FakeNornir(["rtr-01", "rtr-02"]),
+        plan,
+        schedule,
+        build_args(tmp_path),
+        io.StringIO(),
+    )
+    now = time.monotonic()
+    polling.queue = sorted(
+        [
+            (now, "rtr-01", GETTER, "facts"),
+            (now, "rtr-02", GETTER, "facts"),
+            (now + 0.05, "rtr-01", GETTER, "arp_table"),
+            (now + 0.05, "rtr-01", CONFIG, "running"),
+        ]
+    )
+    cycles = []
+    active = {}
+    overlaps = []
+    lock = threading.Lock()
+
+    def run_cycle(nr, hostname, items, *args):
+        with lock:
+            active[hostname] = active.get(hostname, 0) + 1
+            overlaps.append(active[hostname] > 1)
+            cycles.append((hostname, [item[1] for item in items]))
+            if len(cycles) == 3:
+                polling.stop()
+        time.sleep(0.2)
+        with lock:
+            active[hostname] -= 1
+        return []
+
+    monkeypatch.setattr(daemon, "run_cycle", run_cycle)
+    polling.run()
+    assert not any(overlaps)
+    # The items which fell due during the first cycle are collected together, configs first
+    assert sorted(cycles) == [
+        ("rtr-01", ["facts"]),
+        ("rtr-01", ["running", "arp_table"]),
+        ("rtr-02", ["facts"]),
+    ]
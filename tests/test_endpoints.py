@@ -0,0 +1,69 @@
+"""
+Tests of the MAC and ARP endpoint index.
+"""
+
+# Import Modules
+import pytest
+from day_one_net_toolkit.endpoints import EndpointIndex, normalise_mac
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = EndpointIndex(str(tmp_path / "endpoints.db"))
+    index.add_host(
+        "sw-01",
+        "mac_address_table",
+        [
+            {"mac": "001C.5829.4A71", "interface": "Gi0/1", "vlan": 10},
+            {"mac": "00:1c:58:29:4a:72", "interface": "Gi0/24", "vlan": 10},
+            {"mac": "00:1c:58:29:4a:73", "interface": "Gi0/24", "vlan": 10},
+        ],
+    )
+    index.add_host(
+        "sw-02",
+        "mac_address_table",
+        [{"mac": "00-1C-58-29-4A-71", "interface": "Gi0/48", "vlan": 10}]
+        + [
+            {"mac": "00:00:00:00:00:0" + str(i), "interface": "Gi0/48", "vlan": 10}
+            for i in range(3)
+        ],
+    )
+    index.add_host(
+        "rtr-01",
+        "arp_table",
+        [
+            {"ip": "10.0.0.20", "mac": "001c.5829.4a71", "interface": "Vlan10"},
+            {"ip": "10.0.0.21", "mac": "incomplete", "interface": "Vlan10"},
+        ],
+    )
+    yield index
+    index.close()
+
+
+def test_normalise_mac():
+    assert normalise_mac("001C.5829.4A71") == "00:1c:58:29:4a:71"
+    assert normalise_mac("00-1C-58-29-4A-71") == "00:1c:58:29:4a:71"
+    assert normalise_mac("incomplete") is None
+
+
+def test_locate_mac_edge_port_first(index):
+    locations = index.locate_mac("00:1C:58:29:4A:71")
+    assert [(host, interface, macs) for _, host, interface, _, macs in locations] == [
+        ("sw-01", "Gi0/1", 1),
+        ("sw-02", "Gi0/48", 4),
+    ]
+
+
+def test_resolve_ip(index):
+    assert index.resolve_ip("10.0.0.20") == [
+        ("10.0.0.20", "00:1c:58:29:4a:71", "rtr-01", "Vlan10")
+    ]
+    # Incomplete ARP entries are not indexed
+    assert index.resolve_ip("10.0.0.21") == []
+    assert index.ips_of_mac("001c.5829.4a71") == ["10.0.0.20"]
+
+
+def test_add_host_replaces_rows(index):
+    assert index.add_host("sw-01", "mac_address_table", []) == 0
+    assert [row[1] for row in index.locate_mac("001c.5829.4a71")] == ["sw-02"]
+    assert index.add_host("sw-01", "users", {"admin": {}}) == 0
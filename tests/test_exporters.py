@@ -0,0 +1,57 @@
+"""
+Tests of the dataset exporters.
+"""
+
+# Import Modules
+import argparse
+import importlib.util
+import json
+import pytest
+from openpyxl import Workbook
+from day_one_net_toolkit.cli import export_formats
+from day_one_net_toolkit.exporters import WorkbookExporter, build_exports
+
+
+def test_workbook_sheet_splitting():
+    wb = Workbook()
+    exporter = WorkbookExporter(wb, max_rows=3)
+    exporter.open("Users", ["Hostname", "Username"])
+    exporter.write_rows("Users", [["rtr-01", "user" + str(i)] for i in range(5)])
+    assert wb.sheetnames[1:] == ["Users", "Users (2)", "Users (3)"]
+    # Every sheet starts with the header row
+    rows = [list(wb[title].values) for title in wb.sheetnames[1:]]
+    assert [len(sheet) for sheet in rows] == [3, 3, 2]
+    assert all(sheet[0] == ("Hostname", "Username") for sheet in rows)
+    assert rows[2][1] == ("rtr-01", "user4")
+
+
+def test_file_exports(tmp_path):
+    exports = build_exports(["csv", "jsonl"], output_dir=str(tmp_path))
+    exports.open({"Users": ["Hostname", "Username"]})
+    exports.write_rows("Users", [["rtr-01", "admin"]])
+    exports.write_rows("Users", [])
+    paths = exports.close()
+    assert sorted(paths) == [
+        str(tmp_path / "Users.csv"),
+        str(tmp_path / "Users.jsonl"),
+    ]
+    assert (tmp_path / "Users.csv").read_text().splitlines() == [
+        "Hostname,Username",
+        "rtr-01,admin",
+    ]
+    with open(tmp_path / "Users.jsonl") as f:
+        assert [json.loads(line) for line in f] == [
+            {"Hostname": "rtr-01", "Username": "admin"}
+        ]
+
+
+def test_export_formats():
+    assert export_formats("workbook,csv") == ["workbook", "csv"]
+    with pytest.raises(argparse.ArgumentTypeError):
+        export_formats("csv,xml")
+
+
+def test_export_formats_parquet(monkeypatch):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(argparse.ArgumentTypeError, match="requires"):
+        export_formats("csv,parquet")
@@ -0,0 +1,49 @@
+"""
+Tests of the facts directory reader and writer.
+"""
+
+# Import Modules
+import os
+import time
+from day_one_net_toolkit.factstore import (
+    fact_file,
+    load_fact_store,
+    load_getter,
+    save_getter,
+)
+
+
+def test_round_trip(tmp_path):
+    fact_dir = str(tmp_path)
+    save_getter(fact_dir, "rtr-01", "facts", {"vendor": "Cisco"})
+    assert fact_file(fact_dir, "rtr-01", "facts") == fact_dir + "/rtr-01/facts.json"
+    assert load_getter(fact_dir, "rtr-01", "facts") == {"vendor": "Cisco"}
+    assert load_getter(fact_dir, "rtr-01", "users") is None
+
+
+def test_stale_and_invalid_files(tmp_path):
+    fact_dir = str(tmp_path)
+    save_getter(fact_dir, "rtr-01", "facts", {"vendor": "Cisco"})
+    path = fact_file(fact_dir, "rtr-01", "facts")
+    old = time.time() - 7200
+    os.utime(path, (old, old))
+    assert load_getter(fact_dir, "rtr-01", "facts", max_age=3600) is None
+    assert load_getter(fact_dir, "rtr-01", "facts", max_age=10800) is not None
+    with open(path, "w") as f:
+        f.write("{not json")
+    assert load_getter(fact_dir, "rtr-01", "facts") is None
+
+
+def test_load_fact_store(tmp_path):
+    fact_dir = str(tmp_path)
+    save_getter(fact_dir, "rtr-01", "facts", {"vendor": "Cisco"})
+    save_getter(fact_dir, "rtr-01", "users", {"admin": {}})
+    save_getter(fact_dir, "rtr-02", "facts", {"vendor": "Juniper"})
+    store, missing = load_fact_store(
+        fact_dir, ["rtr-01", "rtr-02"], ["facts", "users"], workers=2
+    )
+    assert store == {
+        "facts": {"rtr-01": {"vendor": "Cisco"}, "rtr-02": {"vendor": "Juniper"}},
+        "users": {"rtr-01": {"admin": {}}},
+    }
+    assert missing == [("rtr-02", "users")]
@@ -0,0 +1,61 @@
+"""
+Tests of the optics and environment health scan.
+"""
+
+# Import Modules
+from day_one_net_toolkit.health import (
+    DEFAULT_CHECKS,
+    HealthColumns,
+    load_thresholds,
+    scan,
+)
+
+
+def optics(*powers):
+    return {
+        "physical_channels": {
+            "channel": [
+                {"index": i, "state": {"input_power": {"instant": power}}}
+                for i, power in enumerate(powers)
+            ]
+        }
+    }
+
+
+def test_scan():
+    columns = HealthColumns(ignore_ports={("rtr-01", "Et3")})
+    columns.add_host(
+        "rtr-01",
+        optics={"Et1": optics(-3.0, -20.5), "Et2": optics(None), "Et3": optics(-40.0)},
+        environment={
+            "temperature": {"cpu": {"temperature": 75.0}},
+            "cpu": {0: {"%usage": 20.0}},
+            "memory": {"used_ram": 950, "available_ram": 1000},
+            "power": {"PSU1": {"status": True}, "PSU2": {"status": False}},
+        },
+    )
+    port_rows, host_rows = scan(columns)
+    assert port_rows == [["rtr-01", "Et1", 1, "rx_power", -20.5, -14.0]]
+    assert host_rows == [
+        ["rtr-01", "memory", "memory", 95.0, 90.0],
+        ["rtr-01", "PSU2", "psu", "failed", ""],
+        ["rtr-01", "cpu", "temperature", 75.0, 70.0],
+    ]
+
+
+def test_ignore_hosts():
+    columns = HealthColumns(ignore_hosts={"rtr-01"})
+    columns.add_host("rtr-01", optics={"Et1": optics(-40.0)})
+    assert scan(columns) == ([], [])
+
+
+def test_load_thresholds(tmp_path):
+    health_file = tmp_path / "health.yaml"
+    health_file.write_text(
+        "checks:\n  cpu:\n    max: 50\nignore:\n  ports:\n    rtr-01: [Et1]\n"
+    )
+    thresholds = load_thresholds(str(health_file))
+    assert thresholds["checks"]["cpu"] == {"max": 50.0}
+    assert thresholds["checks"]["rx_power"] == DEFAULT_CHECKS["rx_power"]
+    assert thresholds["ignore_ports"] == {("rtr-01", "Et1")}
+    assert load_thresholds(str(tmp_path / "missing.yaml"))["checks"] == DEFAULT_CHECKS
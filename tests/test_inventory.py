@@ -0,0 +1,94 @@
+"""
+Tests of the compiled inventory cache.
+"""
+
+# Import Modules
+import os
+import pytest
+from day_one_net_toolkit import inventory
+from day_one_net_toolkit.inventory import (
+    cache_key,
+    key_matches,
+    load_compiled_inventory,
+    save_compiled_inventory,
+)
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for name in ["hosts.yaml", "groups.yaml", "defaults.yaml"]:
+        path = tmp_path / name
+        path.write_text("---\n# " + name + "\n")
+        paths.append(str(path))
+    return paths
+
+
+def touch(path, offset=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset * 10**9))
+
+
+def test_key_matches_unchanged(files):
+    assert key_matches(cache_key(files), files) == (True, False)
+
+
+def test_key_matches_touched(files):
+    key = cache_key(files)
+    # Only the modification time changed, so the hash still matches
+    touch(files[0])
+    assert key_matches(key, files) == (True, True)
+
+
+def test_key_matches_edited(files):
+    key = cache_key(files)
+    with open(files[1], "a") as f:
+        f.write("lab:\n")
+    assert key_matches(key, files) == (False, False)
+    assert key_matches(key, files[:2]) == (False, False)
+
+
+def test_load_compiled_inventory(tmp_path, files):
+    cache_file = str(tmp_path / "cache" / "inventory.pickle")
+    assert load_compiled_inventory(cache_file, files) is None
+    cache = {
+        "format": inventory.CACHE_FORMAT,
+        "key": cache_key(files),
+        "inventory": "compiled",
+        "platforms": {},
+    }
+    save_compiled_inventory(cache, cache_file)
+    assert load_compiled_inventory(cache_file, files)["inventory"] == "compiled"
+    # A touched file re-saves the key, so the hash isn't checked on the next load
+    touch(files[2])
+    assert load_compiled_inventory(cache_file, files) is not None
+    assert load_compiled_inventory(cache_file, files)["key"] == cache_key(files)
+    # An edited file invalidates the cache
+    with open(files[2], "a") as f:
+        f.write("platform: ios\n")
+    assert load_compiled_inventory(cache_file, files) is None
+
+
+def test_load_compiled_inventory_format(tmp_path, files):
+    cache_file = str(tmp_path / "inventory.pickle")
+    save_compiled_inventory({"format": -1, "key": cache_key(files)}, cache_file)
+    assert load_compiled_inventory(cache_file, files) is None
+    with open(cache_file, "wb") as f:
+        f.write(b"not a pickle")
+    assert load_compiled_inventory(cache_file, files) is None
+
+
+def test_cached_inventory(tmp_path, files, monkeypatch):
+    with open(files[0], "w") as f:
+        f.write("---\nlab-ios-01:\n  platform: ios\n")
+    cache_file = str(tmp_path / "inventory.pickle")
+    loaded = inventory.CachedInventory(*files, cache_file=cache_file).load()
+    assert inventory.host_platform(loaded.hosts["lab-ios-01"]) == "ios"
+
+    # The second load comes from the cache, without parsing the YAML files
+    def compile_inventory(*_):
+        raise AssertionError("inventory parsed")
+
+    monkeypatch.setattr(inventory, "compile_inventory", compile_inventory)
+    loaded = inventory.CachedInventory(*files, cache_file=cache_file).load()
+    assert list(loaded.hosts) == ["lab-ios-01"]
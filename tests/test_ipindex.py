@@ -0,0 +1,78 @@
+"""
+Tests of the fleet IP address index.
+"""
+
+# Import Modules
+import ipaddress
+import pytest
+from day_one_net_toolkit.ipindex import IPIndex, network_bounds, parse_address
+
+
+@pytest.fixture
+def index():
+    index = IPIndex()
+    index.add("rtr-01", "Gi0/0", "10.0.0.1", 24)
+    index.add("rtr-02", "Gi0/0", "10.0.0.2", 24)
+    index.add("rtr-02", "Gi0/1", "10.0.0.130", 25)
+    index.add("rtr-03", "Gi0/0", "10.0.0.1", 24)
+    index.add("rtr-01", "Gi0/0", "2001:db8::1", 64)
+    index.add("rtr-01", "Gi0/0", "fe80::1%Gi0/0", 64)
+    index.add("rtr-02", "Gi0/0", "fe80::1%Gi0/0", 64)
+    return index.build()
+
+
+def test_network_bounds():
+    address = int(ipaddress.ip_address("10.0.0.130"))
+    bounds = network_bounds(4, address, 25)
+    assert bounds == (address - 2, address + 125)
+
+
+def test_parse_address_drops_zone():
+    assert str(parse_address("fe80::1%Gi0/0")) == "fe80::1"
+
+
+def test_owners(index):
+    owners = index.owners("10.0.0.1")
+    assert [(record[3], record[4]) for record in owners] == [
+        ("rtr-01", "Gi0/0"),
+        ("rtr-03", "Gi0/0"),
+    ]
+    assert index.owners("10.0.0.3") == []
+
+
+def test_owners_with_zone(index):
+    assert len(index.owners("fe80::1%Gi0/0")) == 2
+    assert index.owners("fe80::1") == index.owners("fe80::1%Gi0/0")
+    assert index.containing("fe80::2%Gi0/0") == index.containing("fe80::2")
+
+
+def test_containing_longest_prefix_first(index):
+    prefixes = [record[2] for record in index.containing("10.0.0.200")]
+    assert prefixes == [25, 24, 24, 24]
+    assert index.containing("192.0.2.1") == []
+
+
+def test_duplicates_ignore_link_local(index):
+    duplicates = index.duplicates()
+    assert [address for address, _ in duplicates] == ["10.0.0.1"]
+
+
+def test_overlaps(index):
+    assert index.overlaps() == [("10.0.0.0/24", "10.0.0.128/25")]
+
+
+def test_add_host():
+    index = IPIndex()
+    index.add_host(
+        "rtr-01",
+        {
+            "Gi0/0": {
+                "ipv4": {"192.0.2.1": {"prefix_length": 30}},
+                "ipv6": {"2001:db8::1": {"prefix_length": 64}},
+            },
+            "Lo0": {"ipv4": {"198.51.100.1": {"prefix_length": 32}}},
+        },
+    )
+    index.build()
+    assert len(index.records) == 3
+    assert index.prefix_lengths == {4: [32, 30], 6: [64]}
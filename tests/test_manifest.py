@@ -0,0 +1,77 @@
+"""
+Tests of the per-run content hash manifests.
+"""
+
+# Import Modules
+import json
+import shutil
+from day_one_net_toolkit.manifest import (
+    change_label,
+    compare_manifests,
+    load_manifest,
+    strip_volatile,
+    unified_diff,
+    write_manifest,
+)
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def test_strip_volatile():
+    data = {
+        "uptime": 100,
+        "Et1": {"is_up": True, "last_flapped": 12.5},
+        "peers": [{"address": "10.0.0.1", "age": 3}],
+    }
+    assert strip_volatile(data) == {
+        "Et1": {"is_up": True},
+        "peers": [{"address": "10.0.0.1"}],
+    }
+
+
+def test_compare_manifests():
+    old = {"rtr-01": {"facts/facts": "a", "configs/running": "b"}, "rtr-02": {}}
+    new = {"rtr-01": {"facts/facts": "a", "configs/running": "c"}, "rtr-03": {"x": "d"}}
+    assert compare_manifests(old, new) == [
+        ("rtr-01", "configs/running", "b", "c"),
+        ("rtr-03", "x", None, "d"),
+    ]
+    assert [change_label(None, "d"), change_label("b", None)] == ["ADDED", "REMOVED"]
+
+
+def test_write_manifest(tmp_path):
+    fact_dir, config_dir, manifest_dir = (
+        str(tmp_path / "facts"),
+        str(tmp_path / "configs"),
+        str(tmp_path / "manifests"),
+    )
+    write(tmp_path / "facts/rtr-01/facts.json", json.dumps({"a": 1, "uptime": 5}))
+    write(tmp_path / "facts/rtr-01/environment.json", json.dumps({"cpu": 5}))
+    write(tmp_path / "configs/rtr-01/running.txt", "hostname rtr-01\n")
+    write(tmp_path / "configs/rtr-02/running.txt", "hostname rtr-02\n")
+    first, previous = write_manifest(
+        ["rtr-01", "rtr-02"], manifest_dir, fact_dir, config_dir, workers=2
+    )
+    assert previous is None
+    hosts = load_manifest(first)
+    # Volatile getters are left out of the manifest
+    assert sorted(hosts["rtr-01"]) == ["configs/running", "facts/facts"]
+
+    # A change to a volatile field, or the key order, isn't a change
+    write(tmp_path / "facts/rtr-01/facts.json", json.dumps({"uptime": 9, "a": 1}))
+    write(tmp_path / "configs/rtr-01/running.txt", "hostname rtr-01-new\n")
+    # Date the first manifest in the past, so the second one sorts after it
+    first = shutil.move(first, manifest_dir + "/MANIFEST-2000-01-01-00-00-00.json")
+    second, previous = write_manifest(
+        ["rtr-01"], manifest_dir, fact_dir, config_dir, workers=2
+    )
+    assert previous == first
+    changes = compare_manifests(load_manifest(previous), load_manifest(second))
+    # rtr-02 wasn't part of the run, so it keeps its hashes
+    assert [change[:2] for change in changes] == [("rtr-01", "configs/running")]
+    diff = unified_diff(manifest_dir, changes[0])
+    assert "-hostname rtr-01\n" in diff
+    assert "+hostname rtr-01-new\n" in diff
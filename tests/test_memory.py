@@ -0,0 +1,95 @@
+"""
+Tests of the bounded-memory collection: spilling payloads and the memory budget.
+"""
+
+# Import Modules
+import os
+import threading
+from day_one_net_toolkit import memory
+from day_one_net_toolkit.memory import (
+    MemoryBudget,
+    Spilled,
+    load_spilled,
+    write_payload,
+)
+
+
+def test_write_payload_small(tmp_path):
+    path = str(tmp_path / "facts.json")
+    payload = {"hostname": "rtr-01"}
+    assert write_payload(path, payload, threshold=1000) is payload
+    assert load_spilled(payload) is payload
+    # The temporary file was replaced
+    assert os.listdir(tmp_path) == ["facts.json"]
+
+
+def test_write_payload_spilled(tmp_path):
+    path = str(tmp_path / "facts.json")
+    payload = {"interfaces": ["Ethernet" + str(index) for index in range(100)]}
+    spilled = write_payload(path, payload, threshold=10)
+    assert isinstance(spilled, Spilled)
+    assert spilled.size == os.path.getsize(path)
+    assert load_spilled(spilled) == payload
+
+
+def test_write_payload_text(tmp_path):
+    path = str(tmp_path / "rtr-01.txt")
+    spilled = write_payload(path, "hostname rtr-01\n" * 10, threshold=10)
+    assert load_spilled(spilled) == "hostname rtr-01\n" * 10
+
+
+def test_budget_admits(monkeypatch):
+    monkeypatch.setattr(memory, "current_rss", lambda: 500)
+    budget = MemoryBudget(1000)
+    budget.expected = {"config": 400, "mac_address_table": 300}
+    # One large getter always runs, even above the budget
+    budget.limit = 100
+    assert budget.admits("config")
+    budget.limit = 1000
+    budget.acquire("config")
+    # 500 + 400 running + 300 expected is over the budget
+    assert not budget.admits("mac_address_table")
+    # An unknown getter is expected to be small
+    assert budget.admits("arp_table")
+    budget.release("config", 100)
+    assert budget.admits("mac_address_table")
+    # The largest payload seen is kept as the expected size
+    assert budget.expected["config"] == 400
+    assert budget.running == []
+
+
+def test_budget_waits(monkeypatch):
+    monkeypatch.setattr(memory, "current_rss", lambda: 0)
+    monkeypatch.setattr(memory, "BUDGET_POLL_INTERVAL", 0.01)
+    budget = MemoryBudget(1000)
+    budget.expected = {"config": 600}
+    budget.acquire("config")
+    released = []
+
+    def release():
+        released.append(True)
+        budget.release("config")
+
+    timer = threading.Timer(0.1, release)
+    timer.start()
+    budget.acquire("config")
+    timer.join()
+    assert released
+    assert budget.waits == 1
+    assert budget.running == ["config"]
+
+
+def test_memory_slot(monkeypatch):
+    monkeypatch.setattr(memory, "current_rss", lambda: 0)
+    memory.set_memory_budget(1)
+    try:
+        with memory.memory_slot("config") as slot:
+            assert memory._budget.running == ["config"]
+            slot["size"] = 1234
+        assert memory._budget.expected["config"] == 1234
+        # Small getters aren't limited
+        with memory.memory_slot("facts"):
+            assert memory._budget.running == []
+    finally:
+        memory.set_memory_budget(None)
+    assert memory._budget is None
@@ -0,0 +1,81 @@
+"""
+Tests of the host, getter and config type selection.
+"""
+
+# Import Modules
+from nornir.core import Nornir
+from nornir.core.inventory import Group, Host, Hosts, Inventory, ParentGroups
+from day_one_net_toolkit.plan import (
+    build_plan,
+    filter_inventory,
+    host_selected,
+    select_items,
+)
+
+
+def build_nornir():
+    lab = Group("lab")
+    prod = Group("prod")
+    hosts = {
+        "lab-ios-01": Host("lab-ios-01", platform="ios", groups=ParentGroups([lab])),
+        "lab-junos-01": Host(
+            "lab-junos-01", platform="junos", groups=ParentGroups([lab])
+        ),
+        "prod-ios-01": Host("prod-ios-01", platform="ios", groups=ParentGroups([prod])),
+    }
+    return Nornir(
+        inventory=Inventory(hosts=Hosts(hosts), groups={"lab": lab, "prod": prod})
+    )
+
+
+MATRIX = {
+    "junos": {"getters": ["interfaces", "facts"], "configs": ["running"]},
+    "ios": {"getters": ["facts", "users"], "configs": ["running", "startup"]},
+    "eos": {"getters": ["facts"], "configs": []},
+}
+
+
+def test_select_items():
+    items = ["facts", "interfaces", "optics", "users"]
+    assert select_items(items) == items
+    assert select_items(items, ["users", "facts"]) == ["facts", "users"]
+    assert select_items(items, exclude=["optics"]) == ["facts", "interfaces", "users"]
+    assert select_items(items, ["optics"], ["optics"]) == []
+
+
+def test_host_selected():
+    host = build_nornir().inventory.hosts["lab-ios-01"]
+    assert host_selected(host)
+    assert host_selected(host, hosts=["lab-*"])
+    assert not host_selected(host, hosts=["lab-*"], exclude_hosts=["*-01"])
+    assert host_selected(host, groups=["lab", "prod"])
+    assert not host_selected(host, groups=["prod"])
+    assert host_selected(host, platforms=["ios", "eos"])
+    assert not host_selected(host, platforms=["junos"])
+
+
+def test_filter_inventory():
+    nr = build_nornir()
+    # No selection returns the inventory as it is
+    assert filter_inventory(nr) is nr
+    selected = filter_inventory(nr, groups=["lab"], exclude_hosts=["*junos*"])
+    assert list(selected.inventory.hosts) == ["lab-ios-01"]
+    selected = filter_inventory(nr, platforms=["ios"])
+    assert list(selected.inventory.hosts) == ["lab-ios-01", "prod-ios-01"]
+
+
+def test_build_plan():
+    plan = build_plan(build_nornir(), MATRIX, exclude_configs=["startup"])
+    assert [(entry["host"], entry["platform"]) for entry in plan] == [
+        ("lab-junos-01", "junos"),
+        ("lab-ios-01", "ios"),
+        ("prod-ios-01", "ios"),
+    ]
+    assert plan[1]["configs"] == ["running"]
+    assert plan[1]["getters"] == ["facts", "users"]
+
+
+def test_build_plan_skips_empty_platforms():
+    plan = build_plan(build_nornir(), MATRIX, getters=["users"], configs=["startup"])
+    assert [entry["host"] for entry in plan] == ["lab-ios-01", "prod-ios-01"]
+    assert plan[0]["getters"] == ["users"]
@@ -0,0 +1,58 @@
+"""
+Tests of the per-phase profiler and trace.
+"""
+
+# Import Modules
+import json
+import time
+from day_one_net_toolkit.profiling import Profiler, add_span, span
+
+
+def test_disabled_profiler():
+    profiler = Profiler()
+    profiler.start()
+    profiler.begin("collection")
+    with span("rtr-01", "getter", getter="facts"):
+        pass
+    assert profiler.stop() == []
+
+
+def test_phases_and_trace(tmp_path):
+    profiler = Profiler(str(tmp_path / "profiles"))
+    profiler.start()
+    profiler.begin("collection")
+    start = time.perf_counter()
+    with span("rtr-01", "getter", getter="facts"):
+        time.sleep(0.05)
+    add_span("rtr-01", "host", start)
+    profiler.begin("parsing")
+    time.sleep(0.02)
+    # A phase begun again adds to its earlier time
+    profiler.begin("collection")
+    time.sleep(0.02)
+    phases = {phase: seconds for phase, seconds, _ in profiler.stop()}
+    assert list(phases) == ["collection", "parsing"]
+    assert phases["collection"] >= 0.07
+    assert 0.02 <= phases["parsing"] < 0.07
+    for name in ["collection.prof", "parsing.prof", "collection.folded"]:
+        assert (tmp_path / "profiles" / name).exists()
+    with open(tmp_path / "profiles" / "trace.json") as f:
+        events = json.load(f)["traceEvents"]
+    names = {(event["cat"], event["name"]) for event in events}
+    assert {("getter", "rtr-01"), ("host", "rtr-01"), ("phase", "parsing")} <= names
+
+
+def test_iterate(tmp_path):
+    def results():
+        for i in range(3):
+            # i.e. polling the devices for the next batch
+            time.sleep(0.03)
+            yield i
+
+    profiler = Profiler(str(tmp_path))
+    profiler.start()
+    for _ in profiler.iterate(results(), "collection", "parsing"):
+        time.sleep(0.01)
+    phases = {phase: seconds for phase, seconds, _ in profiler.stop()}
+    assert phases["collection"] >= 0.09
+    assert 0.03 <= phases["parsing"] < 0.09
@@ -0,0 +1,79 @@
+"""
+Tests of the run progress and status file.
+"""
+
+# Import Modules
+import io
+import json
+import time
+from types import SimpleNamespace
+from day_one_net_toolkit.progress import (
+    Progress,
+    failure_class,
+    format_duration,
+)
+
+
+def read_status(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_failure_class():
+    results = [
+        SimpleNamespace(exception=RuntimeError()),
+        SimpleNamespace(exception=ConnectionResetError()),
+    ]
+    assert failure_class(results) == "ConnectionResetError"
+    assert failure_class([SimpleNamespace(exception=None)]) == "Failed"
+
+
+def test_format_duration():
+    assert format_duration(3725.5) == "01:02:05"
+
+
+def test_status_file(tmp_path):
+    status_file = str(tmp_path / "status" / "status.json")
+    progress = Progress(4, status_file=status_file, interval=3600, stream=io.StringIO())
+    progress.open_session()
+    progress.item_done()
+    # The first item is reported straight away, the next ones once the interval passes
+    assert read_status(status_file)["completed"] == 1
+    progress.item_done(failed=True, error="ConnectionException")
+    assert read_status(status_file)["completed"] == 1
+    progress.close_session()
+    progress.finish()
+    status = read_status(status_file)
+    assert status["done"] is True
+    assert (status["completed"], status["succeeded"], status["failed"]) == (2, 1, 1)
+    assert status["in_flight"] == 0
+    assert status["failures"] == {"ConnectionException": 1}
+
+
+def test_format_status():
+    status = {
+        "completed": 3,
+        "planned": 4,
+        "in_flight": 1,
+        "items_per_second": 0.5,
+        "failed": 1,
+        "failures": {"ConnectionException": 1},
+        "eta_seconds": 2.0,
+        "done": False,
+    }
+    assert Progress.format_status(status) == (
+        "PROGRESS : 3/4 items (75.0%) - 1 in flight - 0.50 items/s - 1 failed"
+        " (ConnectionException: 1) - ETA 00:00:02"
+    )
+
+
+def test_status_refreshed_between_items(tmp_path):
+    status_file = str(tmp_path / "status.json")
+    progress = Progress(4, status_file=status_file, interval=0.05, stream=io.StringIO())
+    progress.item_done()
+    progress.open_session()
+    # A long item doesn't complete anything, but the status stays current
+    time.sleep(0.5)
+    assert read_status(status_file)["in_flight"] == 1
+    progress.finish()
+    assert progress.stopped.is_set()
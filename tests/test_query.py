@@ -0,0 +1,126 @@
+"""
+Tests of the read-only query service.
+"""
+
+# Import Modules
+import http.client
+import json
+import os
+import threading
+import pytest
+from day_one_net_toolkit.factstore import save_getter
+from day_one_net_toolkit.query import LRUCache, QueryService, build_server, etag
+
+
+@pytest.fixture
+def service(tmp_path):
+    fact_dir = str(tmp_path / "facts")
+    config_dir = str(tmp_path / "configs")
+    save_getter(fact_dir, "rtr-01", "facts", {"model": "CSR1000V", "vendor": "Cisco"})
+    save_getter(fact_dir, "rtr-01", "users", {"admin": {}})
+    save_getter(fact_dir, "sw-01", "facts", {"model": "vEOS", "vendor": "Arista"})
+    os.makedirs(os.path.join(config_dir, "rtr-01"))
+    with open(os.path.join(config_dir, "rtr-01", "running.txt"), "w") as f:
+        f.write("hostname rtr-01\n")
+    return QueryService(
+        fact_dir=fact_dir,
+        config_dir=config_dir,
+        manifest_dir=str(tmp_path / "manifests"),
+        workers=1,
+    )
+
+
+def test_lru_cache():
+    cache = LRUCache(max_bytes=10)
+    cache.put("a", (b"1234", etag(b"1234")))
+    cache.put("b", (b"1234", etag(b"1234")))
+    assert cache.get("a") is not None
+    # b is the least recently used, so it is evicted first
+    cache.put("c", (b"1234", etag(b"1234")))
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    # Entries larger than the whole cache aren't cached
+    cache.put("d", (b"x" * 11, etag(b"x" * 11)))
+    assert cache.get("d") is None
+    assert cache.stats() == {"entries": 2, "bytes": 8, "hits": 2, "misses": 2}
+
+
+def test_lookup(service):
+    body, _, content_type = service.lookup(["hosts"], {})
+    assert json.loads(body) == ["rtr-01", "sw-01"]
+    assert content_type == "application/json"
+    body, _, _ = service.lookup(["hosts"], {"vendor": ["Arista"]})
+    assert json.loads(body) == ["sw-01"]
+    body, _, _ = service.lookup(["hosts", "rtr-01"], {})
+    assert json.loads(body) == {"getters": ["facts", "users"], "configs": ["running"]}
+    body, _, _ = service.lookup(["indexes", "getter"], {})
+    assert json.loads(body) == {"facts": ["rtr-01", "sw-01"], "users": ["rtr-01"]}
+    body, _, content_type = service.lookup(
+        ["hosts", "rtr-01", "configs", "running"], {}
+    )
+    assert body == b"hostname rtr-01\n"
+    assert content_type.startswith("text/plain")
+    assert service.lookup(["hosts", "..", "configs", "running"], {}) is None
+    assert service.lookup(["hosts", "rtr-02"], {}) is None
+
+
+def test_file_cache(service):
+    path = ["hosts", "rtr-01", "getters", "facts"]
+    first = service.lookup(path, {})
+    assert service.lookup(path, {}) == first
+    assert service.cache.hits == 1
+    # A rewritten file is read again
+    save_getter(service.fact_dir, "rtr-01", "facts", {"model": "CSR1000V-2"})
+    second = service.lookup(path, {})
+    assert json.loads(second[0]) == {"model": "CSR1000V-2"}
+    assert second[1] != first[1]
+
+
+def test_refresh_without_manifest(service, monkeypatch):
+    monkeypatch.setattr("day_one_net_toolkit.query.REFRESH_INTERVAL", 0)
+    first = service.indexes["hosts"]
+    service.refresh(force=False)
+    # Nothing changed on disk, so the indexes are kept
+    assert service.indexes["hosts"] is first
+    # A host saved without a manifest, i.e. by a script, is picked up on the next check
+    save_getter(
+        service.fact_dir, "fw-01", "facts", {"model": "SRX", "vendor": "Juniper"}
+    )
+    service.refresh(force=False)
+    body, _, _ = service.lookup(["hosts"], {"vendor": ["Juniper"]})
+    assert json.loads(body) == ["fw-01"]
+    # A rewritten facts getter updates the indexes too
+    save_getter(
+        service.fact_dir, "sw-01", "facts", {"model": "vEOS", "vendor": "Juniper"}
+    )
+    service.refresh(force=False)
+    body, _, _ = service.lookup(["hosts"], {"vendor": ["Juniper"]})
+    assert json.loads(body) == ["fw-01", "sw-01"]
+
+
+def test_etag_not_modified(service):
+    server = build_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection(*server.server_address)
+        connection.request("GET", "/hosts/rtr-01/getters/facts")
+        response = connection.getresponse()
+        body = response.read()
+        tag = response.getheader("ETag")
+        assert response.status == 200
+        assert tag == etag(body)
+        connection.request(
+            "GET", "/hosts/rtr-01/getters/facts", headers={"If-None-Match": tag}
+        )
+        response = connection.getresponse()
+        assert response.status == 304
+        assert response.read() == b""
+        connection.request("GET", "/hosts/rtr-02")
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 404
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,25 @@
+"""
+Tests that the commands start without importing the slow dependencies.
+"""
+
+# Import Modules
+import subprocess  # nosec
+import sys
+import pytest
+from day_one_net_toolkit.startup import COMMAND_MODULES, SLOW_MODULES
+
+
+@pytest.mark.parametrize("module", COMMAND_MODULES)
+def test_no_slow_imports(module):
+    # Import each command in a fresh interpreter, so earlier tests can't hide an import
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {SLOW_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(  # nosec
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stdout
+    assert output.strip() == ""
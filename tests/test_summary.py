@@ -0,0 +1,57 @@
+"""
+Tests of the summary datasets.
+"""
+
+# Import Modules
+from day_one_net_toolkit.summary import (
+    SummaryCollector,
+    down_interfaces,
+    model_counts,
+    nonstandard_users,
+    summarise,
+)
+
+
+def test_model_counts():
+    rows = model_counts(
+        ["Cisco", "Arista", "Cisco", "Cisco"],
+        ["C9300", "7050", "C9300", "C9300"],
+        ["17.3", "4.28", "17.3", "16.9"],
+    )
+    assert rows == [
+        ["Cisco", "C9300", "17.3", 2],
+        ["Arista", "7050", "4.28", 1],
+        ["Cisco", "C9300", "16.9", 1],
+    ]
+    assert model_counts([], [], []) == []
+
+
+def test_down_interfaces():
+    rows = down_interfaces(
+        ["sw-02", "sw-01", "sw-01", "sw-01"],
+        [True, False, False, True],
+        [True, True, False, True],
+    )
+    # Admin down interfaces aren't counted as down
+    assert rows == [["sw-01", 3, 1, 33.3], ["sw-02", 1, 0, 0.0]]
+
+
+def test_nonstandard_users():
+    rows = nonstandard_users(
+        ["rtr-02", "rtr-01", "rtr-01", "rtr-01"],
+        ["admin", "zoe", "admin", "bob"],
+        standard_users=["admin"],
+    )
+    assert rows == [["rtr-01", 2, "bob, zoe"]]
+
+
+def test_summarise_from_rows():
+    collector = SummaryCollector()
+    collector.write_rows("Facts", [["rtr-01", "Cisco", "C9300", "17.3", "X", 10]])
+    collector.write_rows("Interfaces", [["rtr-01", "Gi0/1", "", False, True]])
+    collector.write_rows("Users", [["rtr-01", "bob", 15, "", []]])
+    collector.write_rows("LLDP", [["rtr-01", "Gi0/1", "sw-01", "Gi0/2"]])
+    summary = summarise(collector)
+    assert summary["Summary_Models"] == [["Cisco", "C9300", "17.3", 1]]
+    assert summary["Summary_Interfaces"] == [["rtr-01", 1, 1, 100.0]]
+    assert summary["Summary_Users"] == [["rtr-01", 1, "bob"]]
@@ -0,0 +1,100 @@
+"""
+Tests of the latency based timeouts and retry backoff.
+"""
+
+# Import Modules
+import random
+from types import SimpleNamespace
+from day_one_net_toolkit.tasks import set_timeout
+from day_one_net_toolkit.timeouts import (
+    DEFAULT_TIMEOUT,
+    MAX_SAMPLES,
+    MAX_TIMEOUT,
+    MIN_SAMPLES,
+    MIN_TIMEOUT,
+    LatencyStore,
+    backoff_delay,
+    is_transient,
+    percentile,
+)
+
+
+def test_percentile():
+    assert percentile(list(range(1, 101)), 50) == 50
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile(list(range(1, 21)), 95) == 19
+    assert percentile(list(range(10, 0, -1)), 95) == 10
+    assert percentile([3.0], 95) == 3.0
+
+
+def test_timeout_inventory_with_few_samples(tmp_path):
+    latency = LatencyStore(str(tmp_path / "latency.json"))
+    for _ in range(MIN_SAMPLES - 1):
+        latency.record("ios", "facts", 5.0)
+    # The connection keeps the timeout of the inventory
+    assert latency.timeout("ios", "facts") is None
+
+
+def test_timeout_clamped(tmp_path):
+    latency = LatencyStore(str(tmp_path / "latency.json"))
+    for _ in range(MIN_SAMPLES):
+        latency.record("ios", "facts", 0.5)
+        latency.record("ios", "config", 20.0)
+        latency.record("junos", "config", 1000.0)
+    assert latency.timeout("ios", "facts") == MIN_TIMEOUT
+    assert latency.timeout("ios", "config") == 60.0
+    assert latency.timeout("junos", "config") == MAX_TIMEOUT
+
+
+def test_latency_store_round_trip(tmp_path):
+    latency_file = str(tmp_path / "cache" / "latency.json")
+    latency = LatencyStore(latency_file)
+    for seconds in range(MAX_SAMPLES + 10):
+        latency.record("ios", "facts", seconds)
+    latency.save()
+    samples = LatencyStore(latency_file).samples["ios/facts"]
+    # Only the most recent samples are kept
+    assert len(samples) == MAX_SAMPLES
+    assert samples[0] == 10
+    assert LatencyStore(latency_file).medians() == {"ios/facts": 109}
+
+
+def fake_task(extras, connected=True):
+    device = SimpleNamespace(read_timeout_override=None)
+    connection = SimpleNamespace(timeout=None, device=device)
+    connections = (
+        {"napalm": SimpleNamespace(connection=connection)} if connected else {}
+    )
+    host = SimpleNamespace(
+        connections=connections,
+        get_connection_parameters=lambda name: SimpleNamespace(extras=extras),
+    )
+    return SimpleNamespace(host=host), connection
+
+
+def test_set_timeout():
+    task, connection = fake_task({"timeout": 120})
+    set_timeout(task, 15.0)
+    assert connection.timeout == connection.device.read_timeout_override == 15.0
+    # An item without enough samples puts back the timeout of the inventory
+    set_timeout(task, None)
+    assert connection.timeout == connection.device.read_timeout_override == 120
+    task, connection = fake_task(None)
+    set_timeout(task, None)
+    assert connection.timeout == DEFAULT_TIMEOUT
+    # A connection which isn't open yet is left to be opened from the inventory
+    task, _ = fake_task({"timeout": 120}, connected=False)
+    set_timeout(task, None)
+    assert task.host.connections == {}
+
+
+def test_backoff_delay():
+    random.seed(1)
+    for attempt in range(1, 10):
+        delay = backoff_delay(attempt, base=2.0, cap=30.0)
+        assert 0 <= delay <= min(30.0, 2.0 * 2 ** (attempt - 1))
+
+
+def test_is_transient():
+    assert is_transient("ConnectionException")
+    assert not is_transient("NotImplementedError")
@@ -0,0 +1,111 @@
+"""
+Tests of the LLDP topology index.
+"""
+
+# Import Modules
+from day_one_net_toolkit.topology import (
+    ASYMMETRIC,
+    HALF_SEEN,
+    SYMMETRIC,
+    TopologyIndex,
+    normalise_fqdn,
+    normalise_hostname,
+    normalise_port,
+)
+
+
+def neighbor(hostname, port):
+    return [{"hostname": hostname, "port": port}]
+
+
+def test_normalise_port():
+    assert normalise_port("Gi0/1") == "gigabitethernet0/1"
+    assert normalise_port("GigabitEthernet0/1") == "gigabitethernet0/1"
+    assert normalise_port("Et1") == "ethernet1"
+    assert normalise_port("Hu0/0/0/1") == "hundredgigabitethernet0/0/0/1"
+    assert normalise_port("HundredGigE0/0/0/1") == "hundredgigabitethernet0/0/0/1"
+    assert normalise_port("Fo1/0/1") == "fortygigabitethernet1/0/1"
+    assert normalise_port("FortyGigE1/0/1") == "fortygigabitethernet1/0/1"
+    assert normalise_port("ge-0/0/0") == "ge-0/0/0"
+
+
+def test_normalise_hostname():
+    assert (
+        normalise_fqdn("LAB-ARISTA-01.lab.dfjt.local.")
+        == "lab-arista-01.lab.dfjt.local"
+    )
+    assert normalise_hostname("LAB-ARISTA-01.lab.dfjt.local.") == "lab-arista-01"
+    assert normalise_hostname("192.0.2.1") == "192.0.2.1"
+
+
+def test_link_states():
+    topology = TopologyIndex()
+    topology.add_host(
+        "sw-01",
+        {
+            "Gi0/1": neighbor("sw-02.lab.local", "GigabitEthernet0/1"),
+            "Gi0/2": neighbor("sw-02", "Gi0/9"),
+            "Gi0/3": neighbor("unmanaged", "port1"),
+        },
+    )
+    topology.add_host(
+        "SW-02",
+        {
+            "GigabitEthernet0/1": neighbor("sw-01", "Gi0/1"),
+            "Gi0/2": neighbor("sw-01", "Gi0/2"),
+        },
+    )
+    links = sorted(topology.links())
+    # The symmetric link is only listed once
+    assert [link for link in links if link[4] == SYMMETRIC] == [
+        (
+            "sw-01",
+            "gigabitethernet0/1",
+            "sw-02.lab.local",
+            "gigabitethernet0/1",
+            SYMMETRIC,
+        )
+    ]
+    assert topology.problem_links() == [
+        (
+            "sw-01",
+            "gigabitethernet0/2",
+            "sw-02.lab.local",
+            "gigabitethernet0/9",
+            ASYMMETRIC,
+        ),
+        ("sw-01", "gigabitethernet0/3", "unmanaged", "port1", HALF_SEEN),
+        (
+            "sw-02.lab.local",
+            "gigabitethernet0/2",
+            "sw-01",
+            "gigabitethernet0/2",
+            ASYMMETRIC,
+        ),
+    ]
+    assert topology.port_neighbors("SW-01", "GigabitEthernet0/3") == [
+        ("unmanaged", "port1")
+    ]
+
+
+def test_fqdn_matched_first():
+    topology = TopologyIndex()
+    topology.add_host(
+        "rtr-01.dc1.local", {"Hu0/0/0/0": neighbor("core-01.dc1.local", "Hu0/0/0/0")}
+    )
+    topology.add_host(
+        "rtr-01.dc2.local", {"Hu0/0/0/0": neighbor("core-01.dc2.local", "Hu0/0/0/0")}
+    )
+    # A name without its domain falls back to the short name
+    topology.add_host(
+        "core-01", {"Hu0/0/0/0": neighbor("rtr-01.dc1.local", "HundredGigE0/0/0/0")}
+    )
+    assert "core-01.dc1.local" in topology.collected
+    # Hosts with the same short name in different domains are kept apart
+    port = "hundredgigabitethernet0/0/0/0"
+    assert topology.port_neighbors("RTR-01.dc2.local.", "HundredGigE0/0/0/0") == [
+        ("core-01.dc2.local", port)
+    ]
+    assert topology.problem_links() == [
+        ("rtr-01.dc2.local", port, "core-01.dc2.local", port, HALF_SEEN)
+    ]